@@ -0,0 +1,122 @@
+"""Compare inlined literals with parameterized sp_executesql statements.
+
+Runs the same statement shape N times with different values, once with the
+value inlined (a new ad-hoc plan per value) and once through ``prepare``
+(one reusable plan).  Against a live server it reports wall time, the
+number of SQL compilations and the plans added to the plan cache; the
+counters need VIEW SERVER STATE and are skipped without it.
+
+    MSSQL_SERVER=... MSSQL_USER=... MSSQL_PASSWORD=... MSSQL_DATABASE=... \\
+        python benchmarks/bench_params.py --table innovator.PART --column item_number
+
+``--offline`` only measures the client-side cost of ``prepare`` with a cold
+and a warm template cache and needs no database.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mssql_mcp_server.statements import _compile, prepare  # noqa: E402
+
+COMPILATIONS_QUERY = """
+    SELECT cntr_value FROM sys.dm_os_performance_counters
+    WHERE counter_name = 'SQL Compilations/sec'
+"""
+
+PLANS_QUERY = """
+    SELECT COUNT(*) FROM sys.dm_exec_cached_plans cp
+    CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) t
+    WHERE t.text LIKE %s
+"""
+
+
+def _scalar(cursor, query, params=None):
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchone()[0]
+    except Exception:
+        return None
+
+
+def _run(conn, statements):
+    cursor = conn.cursor()
+    before = _scalar(cursor, COMPILATIONS_QUERY)
+    started = time.perf_counter()
+    for sql, args in statements:
+        cursor.execute(sql, args)
+        cursor.fetchall()
+    elapsed = time.perf_counter() - started
+    after = _scalar(cursor, COMPILATIONS_QUERY)
+    compilations = after - before if before is not None and after is not None else None
+    return elapsed, compilations
+
+
+def live(args):
+    import pymssql
+
+    conn = pymssql.connect(
+        server=os.environ["MSSQL_SERVER"],
+        user=os.getenv("MSSQL_USER") or os.getenv("MSSQL_USERNAME"),
+        password=os.environ["MSSQL_PASSWORD"],
+        database=os.environ["MSSQL_DATABASE"],
+        autocommit=True,
+    )
+    values = [f"bench-{uuid.uuid4().hex[:12]}" for _ in range(args.iterations)]
+    # A unique marker keeps both runs out of each other's cached plans
+    marker = uuid.uuid4().hex[:8]
+    template = f"SELECT /*{{tag}}-{marker}*/ TOP 1 * FROM {args.table} WHERE {args.column} = {{value}}"
+
+    inline = [(template.format(tag="inline", value="'" + v.replace("'", "''") + "'"), None) for v in values]
+    param = [prepare(template.format(tag="param", value="?"), [v]) for v in values]
+
+    cursor = conn.cursor()
+    for label, statements in (("inline literals", inline), ("sp_executesql", param)):
+        elapsed, compilations = _run(conn, statements)
+        tag = "inline" if label == "inline literals" else "param"
+        # "[/]" keeps this lookup from matching its own query text
+        plans = _scalar(cursor, PLANS_QUERY, (f"%[/]*{tag}-{marker}*/%",))
+        print(f"{label:16} {elapsed * 1000 / len(statements):8.2f} ms/query"
+              f"  compilations={compilations if compilations is not None else 'n/a'}"
+              f"  cached_plans={plans if plans is not None else 'n/a'}")
+    conn.close()
+
+
+def offline(args):
+    query = "SELECT name, state FROM innovator.PART WHERE item_number = ? AND is_current = ?"
+    values = [(f"P-{i}", 1) for i in range(args.iterations)]
+
+    started = time.perf_counter()
+    for value in values:
+        _compile.cache_clear()
+        prepare(query, list(value))
+    cold = time.perf_counter() - started
+
+    _compile.cache_clear()
+    started = time.perf_counter()
+    for value in values:
+        prepare(query, list(value))
+    warm = time.perf_counter() - started
+
+    print(f"prepare, cold template cache {cold * 1e6 / len(values):8.2f} us/call")
+    print(f"prepare, warm template cache {warm * 1e6 / len(values):8.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--table", default="innovator.PART")
+    parser.add_argument("--column", default="item_number")
+    parser.add_argument("--offline", action="store_true", help="measure client-side cost only")
+    args = parser.parse_args()
+    if args.offline:
+        offline(args)
+    else:
+        live(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Micro-benchmark: result serialization throughput.
+
+Renders a synthetic 100k-row result (strings, integers, floats, datetimes,
+decimals, UUIDs and binary values, with some NULLs) through the legacy
+``",".join(map(safe_str, row))`` path and through each writer in
+``mssql_mcp_server.serialization``, a batch at a time like ``read_page``.
+
+    python benchmarks/bench_serialization.py [--rows 100000] [--batch 200]
+"""
+import argparse
+import datetime
+import decimal
+import io
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from mssql_mcp_server.serialization import FORMATS, get_writer  # noqa: E402
+
+COLUMNS = ["id", "item_number", "name", "cost", "weight", "created_on", "config_id", "thumbnail", "is_current"]
+
+
+def make_rows(count, seed=42):
+    rnd = random.Random(seed)
+    base = datetime.datetime(2020, 1, 1)
+    rows = []
+    for i in range(count):
+        rows.append((
+            i,
+            f"P-{i:08d}",
+            rnd.choice(["Connector, 4 pin", "Cable assembly", 'Housing "black"', "Terminal"]),
+            decimal.Decimal(rnd.randint(0, 10**6)) / 100,
+            rnd.random() * 100 if i % 7 else None,
+            base + datetime.timedelta(minutes=i),
+            uuid.UUID(int=rnd.getrandbits(128)),
+            bytes(rnd.getrandbits(8) for _ in range(8)) if i % 5 == 0 else None,
+            bool(i % 2),
+        ))
+    return rows
+
+
+def legacy(rows, batch):
+    """The pre-serialization-layer path: per-cell str/encode/decode and INFO log."""
+    logger = logging.getLogger("bench.legacy")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(io.StringIO()))
+
+    def safe_str(val):
+        logger.info(val)
+        return str(val).encode('utf-8', errors='ignore').decode('utf-8') if val is not None else ''
+
+    result = [",".join(map(safe_str, row)) for row in rows]
+    return "\n".join([",".join(COLUMNS)] + result)
+
+
+def writer_path(fmt):
+    def run(rows, batch):
+        writer = get_writer(fmt, COLUMNS)
+        chunks = [writer.format_rows(rows[i:i + batch]) for i in range(0, len(rows), batch)]
+        return writer.render("".join(chunks))
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    candidates = [("legacy safe_str", legacy)] + [(fmt, writer_path(fmt)) for fmt in FORMATS]
+    baseline = None
+    print(f"{args.rows} rows, batch {args.batch}, best of {args.repeat}")
+    for label, fn in candidates:
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            text = fn(rows, args.batch)
+            best = min(best, time.perf_counter() - started)
+        size = len(text.encode("utf-8"))
+        baseline = baseline or best
+        print(f"{label:16} {best * 1000:8.1f} ms  {args.rows / best / 1000:8.1f} k rows/s"
+              f"  {size / best / 2**20:7.1f} MiB/s  {size / 2**20:6.1f} MiB  x{baseline / best:4.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Load benchmark of the MCP handlers against a fake pymssql.
+
+Replaces ``pymssql`` with the deterministic in-process fake in
+``fake_pymssql.py`` and drives ``list_resources``, ``read_resource`` and
+``call_tool`` from concurrent clients with a seeded mix of requests
+(table pages with keyset continuation, schema reads, SELECTs, fetch_more
+and batches).  Reports p50/p99 latency per handler, throughput and peak
+RSS, and can store the report as a baseline or compare against one:
+
+    python benchmarks/bench_server.py --save benchmarks/baseline.json
+    python benchmarks/bench_server.py --compare benchmarks/baseline.json
+
+``--compare`` exits with status 1 when a latency, the throughput or the
+peak RSS is worse than the baseline by more than ``--tolerance`` (twice
+that for p99, and latencies must also move by ``--min-delta-ms``).
+Baselines are only comparable on the same machine and settings.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+import fake_pymssql  # noqa: E402
+
+# Everything importing pymssql from here on gets the fake
+sys.modules["pymssql"] = fake_pymssql
+
+# Weights of each request kind in the generated workload
+MIX = {
+    "list_resources": 5,
+    "read_data": 25,
+    "read_schema": 10,
+    "execute_sql": 40,
+    "fetch_more": 10,
+    "execute_sql_batch": 10,
+}
+
+
+def configure_server(args):
+    """Point the server at the fake driver with the benchmark's settings."""
+    os.environ.update({
+        "MSSQL_SERVER": "fake",
+        "MSSQL_USER": "bench",
+        "MSSQL_PASSWORD": "bench",
+        "MSSQL_DATABASE": "bench",
+        # Open result cursors pin connections, so the pool needs room for both
+        "MSSQL_POOL_MAX_SIZE": str(args.concurrency + args.open_cursors),
+        "MSSQL_MAX_CONCURRENT_QUERIES": str(args.concurrency),
+        "MSSQL_QUERY_QUEUE_SIZE": str(args.clients * 8),
+        "MSSQL_MAX_OPEN_CURSORS": str(args.open_cursors),
+        "MSSQL_RESULT_CACHE_BYTES": str(args.cache_bytes),
+    })
+    fake_pymssql.configure(tables=args.tables, rows=args.rows, latency=args.latency,
+                           row_latency=args.row_latency)
+    from mssql_mcp_server import server
+    server.pymssql = fake_pymssql
+    return server
+
+
+def make_workload(count, seed, tables):
+    """Return a reproducible list of ``(kind, argument)`` requests."""
+    rnd = random.Random(seed)
+    kinds = list(MIX)
+    weights = [MIX[kind] for kind in kinds]
+    workload = []
+    for _ in range(count):
+        kind = rnd.choices(kinds, weights)[0]
+        table = rnd.choice(tables)
+        if kind == "read_data":
+            columns = rnd.choice([None, "item_number,name", "id,state,cost"])
+            query = {"limit": rnd.choice([50, 100, 200])}
+            if columns:
+                query["columns"] = columns
+            arg = (f"mssql://{table}/data?" + "&".join(f"{k}={v}" for k, v in query.items()),
+                   rnd.randint(0, 3))
+        elif kind == "read_schema":
+            arg = f"mssql://{table}/schema"
+        elif kind in ("execute_sql", "fetch_more"):
+            arg = {
+                "query": f"SELECT TOP {rnd.choice([10, 100, 1000])} id, item_number, name, cost, modified_on "
+                         f"FROM innovator.{table} WHERE state = ?",
+                "params": [rnd.choice(["Preliminary", "In Review", "Released"])],
+                "max_rows": rnd.choice([50, 200]),
+            }
+        elif kind == "execute_sql_batch":
+            arg = {
+                "queries": [
+                    {"query": f"SELECT TOP 5 id, name FROM innovator.{rnd.choice(tables)} WHERE item_number = ?",
+                     "params": [f"P-{rnd.randrange(10_000):06d}"]}
+                    for _ in range(rnd.randint(3, 10))
+                ],
+                "mode": rnd.choice(["parallel", "single"]),
+            }
+        else:
+            arg = None
+        workload.append((kind, arg))
+    return workload
+
+
+async def perform(server, kind, arg):
+    """Run one request; returns False when the handler reported an error."""
+    if kind == "list_resources":
+        return bool(await server.list_resources())
+    if kind == "read_data":
+        uri, follow = arg
+        text = await server.read_resource(uri)
+        # Walk a few pages by following the keyset continuation
+        for _ in range(follow):
+            if "\n\n" not in text:
+                break
+            note = json.loads(text.rsplit("\n\n", 1)[1])
+            text = await server.read_resource(note["next"])
+        return True
+    if kind == "read_schema":
+        return bool(await server.read_resource(arg))
+    if kind == "execute_sql_batch":
+        result = json.loads((await server.call_tool("execute_sql_batch", arg))[0].text)
+        return result["failed"] == 0
+    contents = await server.call_tool("execute_sql", arg)
+    if contents[0].text.startswith("Error"):
+        return False
+    if kind == "fetch_more" and len(contents) > 1:
+        cursor = json.loads(contents[-1].text).get("cursor")
+        if cursor:
+            contents = await server.call_tool("fetch_more", {"cursor": cursor})
+            return not contents[0].text.startswith("Error")
+    return True
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (which must be sorted)."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(q * len(values) + 0.5)) - 1))]
+
+
+def peak_rss_mib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+async def run(args):
+    server = configure_server(args)
+    workload = make_workload(args.requests, args.seed, fake_pymssql.table_names())
+    latencies = {kind: [] for kind in MIX}
+    errors = {kind: 0 for kind in MIX}
+
+    # Warm up the pool and schema catalog outside the measurement
+    await server.list_resources()
+
+    queue = asyncio.Queue()
+    for item in workload:
+        queue.put_nowait(item)
+
+    async def client():
+        clock = time.perf_counter
+        while not queue.empty():
+            kind, arg = queue.get_nowait()
+            started = clock()
+            try:
+                ok = await perform(server, kind, arg)
+            except Exception:
+                ok = False
+            latencies[kind].append(clock() - started)
+            if not ok:
+                errors[kind] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+    elapsed = time.perf_counter() - started
+
+    server.get_result_registry().close_all()
+    server.get_executor().shutdown()
+    server.get_pool().close()
+
+    everything = sorted(value for values in latencies.values() for value in values)
+    report = {
+        "settings": {
+            "requests": args.requests, "clients": args.clients, "concurrency": args.concurrency,
+            "open_cursors": args.open_cursors,
+            "latency": args.latency, "row_latency": args.row_latency, "rows": args.rows,
+            "tables": args.tables, "cache_bytes": args.cache_bytes, "seed": args.seed,
+        },
+        "overall": {
+            "requests": len(everything),
+            "errors": sum(errors.values()),
+            "seconds": round(elapsed, 3),
+            "throughput": round(len(everything) / elapsed, 1),
+            "p50_ms": round(percentile(everything, 0.5) * 1000, 2),
+            "p99_ms": round(percentile(everything, 0.99) * 1000, 2),
+        },
+        "handlers": {},
+        "peak_rss_mib": peak_rss_mib(),
+    }
+    for kind, values in latencies.items():
+        values.sort()
+        if values:
+            report["handlers"][kind] = {
+                "requests": len(values),
+                "errors": errors[kind],
+                "p50_ms": round(percentile(values, 0.5) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            }
+    return report
+
+
+def print_report(report):
+    overall = report["overall"]
+    print(f"{overall['requests']} requests in {overall['seconds']}s from {report['settings']['clients']} clients: "
+          f"{overall['throughput']} req/s, p50 {overall['p50_ms']} ms, p99 {overall['p99_ms']} ms, "
+          f"{overall['errors']} errors, peak RSS {report['peak_rss_mib']} MiB")
+    for kind, stats in report["handlers"].items():
+        print(f"  {kind:18} {stats['requests']:6} req  p50 {stats['p50_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+              f"  {stats['errors']} errors")
+
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    """Print the change against ``baseline``; returns the list of regressions.
+
+    Latencies only count as regressions when they also moved by more than
+    ``min_delta_ms``, and p99 gets twice the tolerance: both are noisy.
+    """
+    regressions = []
+
+    def check(label, current, previous, higher_is_worse=True, allowed=tolerance, floor=0.0):
+        if current is None or not previous:
+            return
+        change = (current - previous) / previous
+        worse = change > allowed if higher_is_worse else change < -allowed
+        worse = worse and abs(current - previous) > floor
+        print(f"  {label:32} {previous:10.2f} -> {current:10.2f}  {change:+7.1%}{'  REGRESSION' if worse else ''}")
+        if worse:
+            regressions.append(label)
+
+    if baseline.get("settings") != report["settings"]:
+        print("warning: baseline was recorded with different settings")
+    print(f"Compared with baseline (tolerance {tolerance:.0%}):")
+    check("throughput (req/s)", report["overall"]["throughput"], baseline["overall"]["throughput"], False)
+    check("overall p50 (ms)", report["overall"]["p50_ms"], baseline["overall"]["p50_ms"], floor=min_delta_ms)
+    check("overall p99 (ms)", report["overall"]["p99_ms"], baseline["overall"]["p99_ms"],
+          allowed=tolerance * 2, floor=min_delta_ms)
+    for kind, stats in report["handlers"].items():
+        previous = baseline["handlers"].get(kind)
+        if previous:
+            check(f"{kind} p50 (ms)", stats["p50_ms"], previous["p50_ms"], floor=min_delta_ms)
+            check(f"{kind} p99 (ms)", stats["p99_ms"], previous["p99_ms"], allowed=tolerance * 2, floor=min_delta_ms)
+    check("peak RSS (MiB)", report["peak_rss_mib"], baseline.get("peak_rss_mib"))
+    if report["overall"]["errors"] > baseline["overall"]["errors"]:
+        print(f"  errors: {baseline['overall']['errors']} -> {report['overall']['errors']}  REGRESSION")
+        regressions.append("errors")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent MCP callers")
+    parser.add_argument("--concurrency", type=int, default=8, help="MSSQL_MAX_CONCURRENT_QUERIES")
+    parser.add_argument("--open-cursors", type=int, help="MSSQL_MAX_OPEN_CURSORS (default: --clients)")
+    parser.add_argument("--latency", type=float, default=0.002, help="fake server seconds per statement")
+    parser.add_argument("--row-latency", type=float, default=0.0, help="fake server seconds per row")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows per fake table")
+    parser.add_argument("--tables", type=int, default=20)
+    parser.add_argument("--cache-bytes", type=int, default=0, help="MSSQL_RESULT_CACHE_BYTES")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", metavar="PATH", help="write the report as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="ignore latency changes smaller than this")
+    parser.add_argument("--verbose", action="store_true", help="show server warnings and errors")
+    args = parser.parse_args()
+    # Enough cursors that clients do not evict each other's before fetch_more
+    args.open_cursors = args.open_cursors or args.clients
+    if not args.verbose:
+        logging.getLogger("mssql_mcp_server").setLevel(logging.CRITICAL)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance, args.min_delta_ms):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""Deterministic in-process stand-in for the ``pymssql`` module.
+
+Serves a generated Aras-like schema (``innovator.TABLE_00`` ...) with rows
+computed from their index, so every run sees the same data without a
+database.  It understands just enough of what the server sends:
+
+* the schema catalog queries (``sys.objects``, ``INFORMATION_SCHEMA``),
+* ``SELECT [TOP n] ... FROM <table>`` including keyset continuations
+  (``> CAST(@p1 AS ...)``) and ``sp_executesql`` wrappers,
+* batches joined with ``;\\n`` (one result set each, via ``nextset``),
+* ``SET SHOWPLAN_XML ON/OFF`` (returns a small estimated plan).
+
+Every statement sleeps ``latency`` seconds plus ``row_latency`` per row
+fetched, interruptible by ``cancel()`` like a real server round trip; so
+does each of the two statements a rollback sends without autocommit.
+Call :func:`configure` before connecting.
+"""
+import datetime
+import decimal
+import re
+import threading
+
+COLUMNS = [
+    ("id", "char", 32),
+    ("item_number", "nvarchar", 64),
+    ("name", "nvarchar", 128),
+    ("state", "nvarchar", 32),
+    ("cost", "decimal", None),
+    ("modified_on", "datetime", None),
+    ("is_current", "char", 1),
+]
+
+_settings = {"tables": 20, "rows": 10_000, "latency": 0.002, "row_latency": 0.0}
+
+_TOP_RE = re.compile(r"\bTOP\s*\(?\s*(\d+)", re.IGNORECASE)
+_FROM_RE = re.compile(r"\bFROM\s+(?:\[?innovator\]?\.)?\[?(TABLE_\d+)\]?", re.IGNORECASE)
+_SELECT_RE = re.compile(r"SELECT\s+(?:TOP\s*\(?\s*\d+\s*\)?\s+)?(.*?)\s+FROM\b", re.IGNORECASE | re.DOTALL)
+
+_STAMP = datetime.datetime(2024, 1, 1)
+_PLAN = (
+    '<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan">'
+    '<BatchSequence><Batch><Statements><StmtSimple StatementEstRows="{rows}" '
+    'StatementSubTreeCost="{cost}"/></Statements></Batch></BatchSequence></ShowPlanXML>'
+)
+
+
+class Error(Exception):
+    pass
+
+
+class OperationalError(Error):
+    pass
+
+
+def configure(**settings):
+    """Set ``tables``, ``rows`` (per table), ``latency`` and ``row_latency``."""
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise TypeError(f"Unknown settings: {', '.join(sorted(unknown))}")
+    _settings.update(settings)
+
+
+def table_names():
+    return [f"TABLE_{i:02d}" for i in range(_settings["tables"])]
+
+
+def row_id(index):
+    return f"{index:032X}"
+
+
+def _row(index, columns):
+    values = {
+        "id": row_id(index),
+        "item_number": f"P-{index:06d}",
+        "name": f"Part {index} " + "abcdefghij"[index % 10] * (index % 17),
+        "state": ("Preliminary", "In Review", "Released")[index % 3],
+        "cost": decimal.Decimal(index * 37 % 100_000) / 100,
+        "modified_on": _STAMP + datetime.timedelta(minutes=index),
+        "is_current": "1",
+    }
+    return tuple(values[name] for name in columns)
+
+
+def _catalog(query):
+    """Return ``(columns, rows)`` for a catalog query, or None."""
+    tables = table_names()
+    if "sys.objects" in query:
+        return ["count", "modified"], [(len(tables) * 2, _STAMP)]
+    if "c.COLUMN_NAME" in query:
+        return [], [
+            ("innovator", table, name, data_type, length, 18 if data_type == "decimal" else None,
+             4 if data_type == "decimal" else None, "NO" if name == "id" else "YES")
+            for table in tables for name, data_type, length in COLUMNS
+        ]
+    if "'PRIMARY KEY'" in query:
+        return [], [("innovator", table, "id") for table in tables]
+    if "sys.foreign_key_columns" in query:
+        return [], []
+    if "INFORMATION_SCHEMA.TABLES" in query:
+        return ["TABLE_SCHEMA", "TABLE_NAME"], [("innovator", table) for table in tables]
+    return None
+
+
+def _unwrap(query, params):
+    """Return the inner statement and bound values of an sp_executesql call."""
+    if not query.startswith("EXEC sp_executesql N'"):
+        return query, ()
+    end = query.index("', N'")
+    return query[len("EXEC sp_executesql N'"):end].replace("''", "'"), tuple(params or ())
+
+
+def _select(statement, values):
+    """Return ``(columns, row_count, rows)`` for a data query."""
+    match = _FROM_RE.search(statement)
+    if match is None:
+        return ["value"], 1, iter([(1,)])
+    names = [name for name, _, _ in COLUMNS]
+    projection = _SELECT_RE.search(statement)
+    columns = names
+    if projection and projection.group(1).strip() != "*":
+        wanted = [part.strip().strip("[]").split(".")[-1].strip("[]").lower()
+                  for part in projection.group(1).split(",")]
+        columns = [name for name in wanted if name in names] or names
+    start = 0
+    if "> CAST(@p1" in statement:
+        start = int(values[0], 16) + 1 if values else 0
+    top = _TOP_RE.search(statement)
+    count = max(0, _settings["rows"] - start)
+    if top:
+        count = min(count, int(top.group(1)))
+    return columns, count, (_row(i, columns) for i in range(start, start + count))
+
+
+class Cursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.description = None
+        self._rows = iter(())
+        self._sets = []
+
+    def execute(self, query, params=None):
+        conn = self.connection
+        if conn.closed:
+            raise OperationalError("connection is closed")
+        if query.startswith("SET SHOWPLAN_XML"):
+            conn.showplan = query.endswith("ON")
+            self._load([], iter(()))
+            return
+        conn.wait(_settings["latency"])
+        result = _catalog(query)
+        if result is not None:
+            self._sets = []
+            self._load(result[0], iter(result[1]))
+            return
+        self._sets = []
+        for part in query.split(";\n"):
+            statement, values = _unwrap(part, params)
+            columns, count, rows = _select(statement, values)
+            if conn.showplan:
+                columns, rows = ["plan"], iter([(_PLAN.format(rows=count, cost=count / 1000),)])
+            self._sets.append((columns, rows))
+        self._load(*self._sets.pop(0))
+
+    def _load(self, columns, rows):
+        self.description = [(name, 1, None, None, None, None, None) for name in columns] or None
+        self._rows = rows
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=1):
+        rows = [row for _, row in zip(range(size), self._rows)]
+        if rows and _settings["row_latency"]:
+            self.connection.wait(_settings["row_latency"] * len(rows))
+        return rows
+
+    def fetchall(self):
+        return self.fetchmany(2**31)
+
+    def nextset(self):
+        if not self._sets:
+            return None
+        self._load(*self._sets.pop(0))
+        return True
+
+    def close(self):
+        self._rows = iter(())
+        self._sets = []
+
+
+class Connection:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        self.showplan = False
+        self._lock = threading.Lock()
+        self._busy = False
+        self._cancel = threading.Event()
+        # pymssql exposes cancel() on the underlying _mssql connection
+        self._conn = self
+
+    def wait(self, seconds):
+        """Spend ``seconds`` "on the server"; a cancel() ends the wait with an error."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._busy = True
+        try:
+            cancelled = self._cancel.wait(seconds)
+        finally:
+            with self._lock:
+                self._busy = False
+                self._cancel.clear()
+        if cancelled:
+            raise OperationalError("statement cancelled")
+
+    def cancel(self):
+        # Like an attention packet, a cancel with nothing running is a no-op
+        with self._lock:
+            if self._busy:
+                self._cancel.set()
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if self.closed:
+            raise OperationalError("connection is closed")
+        # pymssql sends ROLLBACK TRAN then BEGIN TRAN unless autocommit is on
+        if not self.kwargs.get("autocommit"):
+            self.wait(2 * _settings["latency"])
+
+    def close(self):
+        self.closed = True
+
+
+def connect(**kwargs):
+    return Connection(**kwargs)
@@ -0,0 +1,166 @@
+"""Keyset-paged table browsing for ``mssql://<table>/data`` resources.
+
+Options are passed in the URI query string::
+
+    mssql://PART/data?columns=id,item_number&limit=50&current=1&after=<token>
+
+* ``columns`` - comma-separated projection (primary key columns are always
+  included so the next page can be addressed).
+* ``limit`` - page size.
+* ``current`` - ``1`` keeps only rows with ``is_current = 1`` (Aras items).
+* ``after`` - continuation token returned with the previous page.
+
+Pages are ordered by the table's primary key and continue with a
+``WHERE key > last_key`` seek instead of ``OFFSET``, so reading page 1000
+costs the same as reading page 1.  The key comes from the schema catalog.
+"""
+import base64
+import binascii
+import json
+import urllib.parse
+
+
+class BrowseOptions:
+    """Parsed options of a table data URI."""
+
+    __slots__ = ("columns", "limit", "after", "current")
+
+    def __init__(self, columns=None, limit=None, after=None, current=False):
+        self.columns = columns
+        self.limit = limit
+        self.after = after
+        self.current = current
+
+
+def parse_data_uri(uri):
+    """Split ``mssql://<table>/data?...`` into ``(table, BrowseOptions)``."""
+    parsed = urllib.parse.urlsplit(uri)
+    table = parsed.netloc
+    query = urllib.parse.parse_qs(parsed.query)
+
+    def option(name):
+        values = query.get(name)
+        return values[-1] if values else None
+
+    columns = option("columns")
+    limit = option("limit")
+    try:
+        limit = int(limit) if limit else None
+    except ValueError:
+        raise ValueError(f"Invalid limit: {limit}")
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+    return table, BrowseOptions(
+        columns=[c.strip() for c in columns.split(",") if c.strip()] if columns else None,
+        limit=limit,
+        after=option("after"),
+        current=option("current") in ("1", "true"),
+    )
+
+
+def data_uri(table, options, after=None):
+    """Build the data URI for ``table`` with ``options``, continuing ``after``."""
+    query = {}
+    if options.columns:
+        query["columns"] = ",".join(options.columns)
+    if options.limit:
+        query["limit"] = options.limit
+    if options.current:
+        query["current"] = 1
+    if after:
+        query["after"] = after
+    uri = f"mssql://{table}/data"
+    return f"{uri}?{urllib.parse.urlencode(query, safe=',')}" if query else uri
+
+
+def _key_default(value):
+    # ISO 8601 keeps every fractional digit; str() would give a form CAST rejects
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def encode_key(values):
+    """Return an opaque continuation token for the key ``values`` of a row."""
+    raw = json.dumps(list(values), default=_key_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_key(token, size):
+    """Return the key values encoded in ``token``; it must hold ``size`` values."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid continuation token")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid continuation token")
+    return values
+
+
+def _quote(name):
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def _bind(column_type):
+    """Placeholder for a key value compared with a column of ``column_type``."""
+    if column_type is None:
+        return "?"
+    if column_type in ("datetime", "smalldatetime"):
+        # These do not accept more than three fractional digits; datetime2
+        # parses the full ISO value and the outer cast matches the column
+        return f"CAST(CAST(? AS datetime2) AS {column_type})"
+    return f"CAST(? AS {column_type})"
+
+
+def build_query(table, options, limit):
+    """Return ``(sql, params, selected, key)`` reading one page of ``table``.
+
+    ``table`` is the catalog metadata.  ``sql`` selects ``limit + 1`` rows so
+    the caller can tell whether another page exists; ``selected`` are the
+    column names in select order and ``key`` the primary key columns.
+    """
+    by_name = {column["name"].lower(): column["name"] for column in table["columns"]}
+    types = {column["name"]: column["type"] for column in table["columns"]}
+    if options.columns:
+        selected = []
+        for name in options.columns:
+            column = by_name.get(name.strip("[]").lower())
+            if column is None:
+                raise ValueError(f"Unknown column {name} in {table['schema']}.{table['name']}")
+            if column not in selected:
+                selected.append(column)
+    else:
+        selected = [column["name"] for column in table["columns"]]
+    key = list(table["primary_key"])
+    selected.extend(column for column in key if column not in selected)
+
+    conditions = []
+    params = []
+    if options.current:
+        if "is_current" not in by_name:
+            raise ValueError(f"{table['schema']}.{table['name']} has no is_current column")
+        conditions.append(f"{_quote(by_name['is_current'])} = 1")
+    if options.after:
+        if not key:
+            raise ValueError(f"{table['schema']}.{table['name']} has no primary key to continue from")
+        values = decode_key(options.after, len(key))
+        # Casting to the column type avoids an implicit conversion of the
+        # column (e.g. char vs nvarchar), which would turn the seek into a scan
+        bound = {column: _bind(types.get(column)) for column in key}
+        # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... - a range seek on the key index
+        terms = []
+        for i, column in enumerate(key):
+            parts = [f"{_quote(prefix)} = {bound[prefix]}" for prefix in key[:i]]
+            parts.append(f"{_quote(column)} > {bound[column]}")
+            params.extend(values[:i + 1])
+            terms.append(" AND ".join(parts))
+        conditions.append(terms[0] if len(terms) == 1 else "(" + " OR ".join(f"({t})" for t in terms) + ")")
+
+    sql = (
+        f"SELECT TOP {int(limit) + 1} {', '.join(_quote(c) for c in selected)}"
+        f" FROM {_quote(table['schema'])}.{_quote(table['name'])}"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if key:
+        sql += " ORDER BY " + ", ".join(_quote(c) for c in key)
+    return sql, params, selected, key
@@ -0,0 +1,136 @@
+"""Result cache for repeated SELECT queries.
+
+Entries are keyed on the normalized query text (plus anything else that
+changes the rendered output), bounded by total size in bytes with LRU
+eviction, and expire after a per-entry TTL.  Each entry remembers the
+tables its query reads so it can be dropped when one of them changes.
+"""
+import collections
+import re
+import threading
+import time
+
+from .statements import split_literals
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TABLE_RE = re.compile(
+    r"\b(?:FROM|JOIN)\s+((?:\[[^\]]+\]|[\w#@$]+)(?:\s*\.\s*(?:\[[^\]]+\]|[\w#@$]+))*)",
+    re.IGNORECASE,
+)
+
+
+def normalize_query(query):
+    """Collapse whitespace and case outside of literals so equivalent queries share a key."""
+    parts = split_literals(query.strip().rstrip(";").strip())
+    for i in range(0, len(parts), 2):
+        # Even indexes are outside quotes, brackets and comments
+        parts[i] = _WHITESPACE_RE.sub(" ", parts[i]).upper()
+    return "".join(parts)
+
+
+def referenced_tables(query):
+    """Return the lower-cased bare names of tables read by ``query``."""
+    tables = set()
+    for match in _TABLE_RE.finditer(query):
+        name = re.split(r"\s*\.\s*", match.group(1))[-1]
+        tables.add(name.strip("[]").lower())
+    return tables
+
+
+class _Entry:
+    __slots__ = ("value", "size", "tables", "expires_at")
+
+    def __init__(self, value, size, tables, expires_at):
+        self.value = value
+        self.size = size
+        self.tables = tables
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """Byte-bounded LRU cache with per-entry TTL and per-table invalidation."""
+
+    def __init__(self, max_bytes, ttl=60.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._by_table = collections.defaultdict(set)
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def put(self, key, value, size, tables=(), ttl=None):
+        """Store ``value`` (``size`` bytes) if it fits; returns True when stored."""
+        ttl = self.ttl if ttl is None else ttl
+        if size > self.max_bytes or ttl <= 0:
+            return False
+        tables = frozenset(t.lower() for t in tables)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self._bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+            self._entries[key] = _Entry(value, size, tables, time.monotonic() + ttl)
+            self._bytes += size
+            for table in tables:
+                self._by_table[table].add(key)
+            self._stats["stores"] += 1
+        return True
+
+    def invalidate_tables(self, tables):
+        """Drop every entry that reads any of ``tables``; returns the count dropped."""
+        dropped = 0
+        with self._lock:
+            for table in tables:
+                for key in list(self._by_table.get(table.lower(), ())):
+                    self._remove(key)
+                    dropped += 1
+            self._stats["invalidations"] += dropped
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats.update(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                ttl=self.ttl,
+                hit_ratio=round(stats["hits"] / lookups, 4) if lookups else None,
+            )
+        return stats
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
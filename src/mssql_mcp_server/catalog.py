@@ -0,0 +1,245 @@
+"""Cached schema catalog.
+
+Tables, columns, primary keys and foreign keys are introspected from
+``INFORMATION_SCHEMA`` and ``sys.*`` once and kept in memory.  After
+``ttl`` seconds a single cheap query over ``sys.objects`` checks whether any
+DDL happened; the full introspection only runs again when it did.  An
+optional on-disk snapshot lets a fresh process serve the catalog without
+introspecting at all.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("mssql_mcp_server.catalog")
+
+DDL_STAMP_QUERY = """
+    SELECT COUNT(*), MAX(modify_date)
+    FROM sys.objects
+    WHERE is_ms_shipped = 0 AND type IN ('U', 'V', 'PK', 'F')
+"""
+
+TABLES_QUERY = """
+    SELECT TABLE_SCHEMA, TABLE_NAME
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_TYPE = 'BASE TABLE'
+    ORDER BY TABLE_SCHEMA, TABLE_NAME
+"""
+
+COLUMNS_QUERY = """
+    SELECT c.TABLE_SCHEMA, c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE,
+           c.CHARACTER_MAXIMUM_LENGTH, c.NUMERIC_PRECISION, c.NUMERIC_SCALE, c.IS_NULLABLE
+    FROM INFORMATION_SCHEMA.COLUMNS c
+    JOIN INFORMATION_SCHEMA.TABLES t
+      ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+    WHERE t.TABLE_TYPE = 'BASE TABLE'
+    ORDER BY c.TABLE_SCHEMA, c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+PRIMARY_KEYS_QUERY = """
+    SELECT kcu.TABLE_SCHEMA, kcu.TABLE_NAME, kcu.COLUMN_NAME
+    FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+    JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
+      ON kcu.CONSTRAINT_SCHEMA = tc.CONSTRAINT_SCHEMA AND kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+    WHERE tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+    ORDER BY kcu.TABLE_SCHEMA, kcu.TABLE_NAME, kcu.ORDINAL_POSITION
+"""
+
+FOREIGN_KEYS_QUERY = """
+    SELECT ps.name, pt.name, pc.name, rs.name, rt.name, rc.name, fk.name
+    FROM sys.foreign_key_columns fkc
+    JOIN sys.foreign_keys fk ON fk.object_id = fkc.constraint_object_id
+    JOIN sys.tables pt ON pt.object_id = fkc.parent_object_id
+    JOIN sys.schemas ps ON ps.schema_id = pt.schema_id
+    JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+    JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+    JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+    JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+    ORDER BY ps.name, pt.name, fk.name, fkc.constraint_column_id
+"""
+
+
+class UnknownTableError(ValueError):
+    """Raised when a table is not present in the catalog."""
+
+
+def _type_name(data_type, max_length, precision, scale):
+    if max_length is not None:
+        return f"{data_type}({'max' if max_length == -1 else max_length})"
+    if data_type in ("decimal", "numeric") and precision is not None:
+        return f"{data_type}({precision},{scale or 0})"
+    return data_type
+
+
+def _rows(conn, query):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class SchemaCatalog:
+    """In-memory cache of table metadata with TTL and DDL-change invalidation.
+
+    Methods taking ``conn`` block on the network and must run in a worker
+    thread; the read-only accessors never touch the database.
+    """
+
+    def __init__(self, ttl=300.0, snapshot_path=None):
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        self._tables = None
+        self._index = {}
+        self._stamp = None
+        self._checked_at = 0.0
+        self._listeners = []
+        self._stats = {"loads": 0, "stamp_checks": 0, "snapshot_loads": 0}
+
+    # -- freshness --------------------------------------------------------
+
+    def needs_refresh(self):
+        """Return True if the catalog is empty or its TTL has run out."""
+        return self._tables is None or time.monotonic() - self._checked_at >= self.ttl
+
+    def refresh(self, conn, force=False):
+        """Make sure the catalog is current, re-introspecting only after DDL."""
+        with self._lock:
+            if not force and not self.needs_refresh():
+                return
+            if self._tables is None and not force:
+                self._load_snapshot()
+            stamp = self._read_stamp(conn)
+            if force or self._tables is None or stamp != self._stamp:
+                self._load(conn, stamp)
+            self._checked_at = time.monotonic()
+
+    def add_listener(self, callback):
+        """Call ``callback(tables)`` with the lower-cased bare names of tables
+        whose definition changed (or that were added or dropped) on reload."""
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """Force a full re-introspection on the next refresh."""
+        with self._lock:
+            self._checked_at = 0.0
+            self._stamp = None
+
+    # -- accessors --------------------------------------------------------
+
+    def table_names(self):
+        """Return ``schema.table`` names for every base table."""
+        return list(self._tables or ())
+
+    def tables(self):
+        """Return the metadata of every base table."""
+        return list((self._tables or {}).values())
+
+    def describe(self, table):
+        """Return the metadata for ``table`` (``name`` or ``schema.name``)."""
+        key = self._index.get(table.strip("[]").lower())
+        if key is None:
+            raise UnknownTableError(f"Unknown table: {table}")
+        return self._tables[key]
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats.update(tables=len(self._tables or ()), stamp=self._stamp)
+        return stats
+
+    # -- internals --------------------------------------------------------
+
+    def _read_stamp(self, conn):
+        self._stats["stamp_checks"] += 1
+        count, modified = _rows(conn, DDL_STAMP_QUERY)[0]
+        return [count, modified.isoformat() if hasattr(modified, "isoformat") else modified]
+
+    def _load(self, conn, stamp):
+        started = time.monotonic()
+        tables = {}
+        for schema, name in _rows(conn, TABLES_QUERY):
+            tables[f"{schema}.{name}"] = {
+                "schema": schema,
+                "name": name,
+                "columns": [],
+                "primary_key": [],
+                "foreign_keys": [],
+            }
+        for schema, name, column, data_type, max_length, precision, scale, nullable in _rows(conn, COLUMNS_QUERY):
+            table = tables.get(f"{schema}.{name}")
+            if table is not None:
+                table["columns"].append({
+                    "name": column,
+                    "type": _type_name(data_type, max_length, precision, scale),
+                    "nullable": nullable == "YES",
+                })
+        for schema, name, column in _rows(conn, PRIMARY_KEYS_QUERY):
+            table = tables.get(f"{schema}.{name}")
+            if table is not None:
+                table["primary_key"].append(column)
+        for schema, name, column, ref_schema, ref_name, ref_column, constraint in _rows(conn, FOREIGN_KEYS_QUERY):
+            table = tables.get(f"{schema}.{name}")
+            if table is not None:
+                table["foreign_keys"].append({
+                    "name": constraint,
+                    "column": column,
+                    "references": f"{ref_schema}.{ref_name}",
+                    "referenced_column": ref_column,
+                })
+        previous = self._tables
+        self._install(tables, stamp)
+        self._stats["loads"] += 1
+        logger.info("Loaded schema catalog: %d tables in %.2fs", len(tables), time.monotonic() - started)
+        self._save_snapshot()
+        if previous is not None:
+            changed = {
+                key.split(".", 1)[-1].lower()
+                for key in previous.keys() | tables.keys()
+                if previous.get(key) != tables.get(key)
+            }
+            if changed:
+                self._notify(changed)
+
+    def _notify(self, changed):
+        for callback in self._listeners:
+            try:
+                callback(changed)
+            except Exception as e:
+                logger.warning("Schema change listener failed: %s", e)
+
+    def _install(self, tables, stamp):
+        index = {}
+        for key, table in tables.items():
+            # Bare names resolve to the first schema that defines them
+            index.setdefault(table["name"].lower(), key)
+            index[key.lower()] = key
+        self._tables = tables
+        self._index = index
+        self._stamp = stamp
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._install(snapshot["tables"], snapshot["stamp"])
+            self._stats["snapshot_loads"] += 1
+            logger.info("Loaded schema snapshot from %s", self.snapshot_path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable schema snapshot %s: %s", self.snapshot_path, e)
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"stamp": self._stamp, "tables": self._tables}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning("Failed to write schema snapshot %s: %s", self.snapshot_path, e)
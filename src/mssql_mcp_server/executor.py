@@ -0,0 +1,227 @@
+"""Run blocking database work off the asyncio event loop.
+
+pymssql calls block the calling thread for the full server round trip, so
+every driver call is pushed onto a dedicated thread pool.  The number of
+queries running at once is capped, a bounded number may queue behind them,
+and anything beyond that is rejected straight away instead of piling up.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("mssql_mcp_server.executor")
+
+
+class QueryQueueFullError(RuntimeError):
+    """Raised when the query queue is full and a new query cannot be accepted."""
+
+
+class QueryCancelledError(RuntimeError):
+    """Raised inside a worker when its request was cancelled before it started."""
+
+
+class QueryTimeoutError(RuntimeError):
+    """Raised when a query did not finish within its statement timeout."""
+
+
+def cancel_connection(conn):
+    """Abort the statement currently running on ``conn``.
+
+    pymssql exposes the attention/cancel call on the underlying ``_mssql``
+    connection; other DB-API drivers may offer ``cancel`` directly.
+    """
+    target = getattr(conn, "_conn", conn)
+    cancel = getattr(target, "cancel", None)
+    if cancel is None:
+        return False
+    try:
+        cancel()
+        return True
+    except Exception as e:
+        logger.warning("Failed to cancel running statement: %s", e)
+        return False
+
+
+class _Ticket:
+    """Tracks the connection a request is using so it can be cancelled."""
+
+    __slots__ = ("conn", "cancelled", "submitted_at", "_lock")
+
+    def __init__(self):
+        self.conn = None
+        self.cancelled = False
+        self.submitted_at = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def attach(self, conn):
+        with self._lock:
+            if self.cancelled:
+                raise QueryCancelledError("Query was cancelled before it started")
+            self.conn = conn
+
+    def detach(self):
+        with self._lock:
+            self.conn = None
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            conn = self.conn
+        if conn is not None:
+            cancel_connection(conn)
+
+
+class QueryExecutor:
+    """Bounded thread pool that runs work functions on pooled connections.
+
+    ``max_concurrency`` queries run at once; up to ``max_queue`` more wait for
+    a worker.  Further submissions raise :class:`QueryQueueFullError`.
+    When ``metrics`` is given, time spent queued and checking out a
+    connection is recorded there.
+    """
+
+    def __init__(self, pool, max_concurrency=4, max_queue=32, metrics=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.pool = pool
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.metrics = metrics
+        self._threads = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="mssql-query"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0, "timed_out": 0}
+
+    async def run(self, work, *args, timeout=None):
+        """Run ``work(conn, *args)`` on a pooled connection in a worker thread.
+
+        If the awaiting task is cancelled (e.g. the MCP client gave up) or
+        ``timeout`` seconds pass, a queued request is dropped and a running
+        statement is cancelled on the server.
+        """
+        return await self._submit(self._invoke, work, args, timeout)
+
+    async def run_pinned(self, work, *args, timeout=None):
+        """Like :meth:`run`, but ``work`` may keep its connection checked out.
+
+        ``work`` returns ``(value, keep)``; when ``keep`` is true the
+        connection is not returned to the pool and ``work`` is responsible
+        for releasing it later.
+        """
+        return await self._submit(self._invoke_pinned, work, args, timeout)
+
+    async def run_call(self, fn, *args, conn=None, timeout=None):
+        """Run a blocking ``fn(*args)`` in a worker thread without a checkout.
+
+        Used for driver calls on connections the caller already holds; pass
+        that connection as ``conn`` so cancellation can reach it.
+        """
+        return await self._submit(self._call, functools.partial(fn, *args), conn, timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            running = min(self._pending, self.max_concurrency)
+            stats.update(
+                running=running,
+                queued=self._pending - running,
+                max_concurrency=self.max_concurrency,
+                max_queue=self.max_queue,
+            )
+        return stats
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+
+    # -- internals --------------------------------------------------------
+
+    async def _submit(self, target, fn, args, timeout=None):
+        with self._lock:
+            if self._pending >= self.max_concurrency + self.max_queue:
+                self._stats["rejected"] += 1
+                raise QueryQueueFullError(
+                    f"Server busy: {self._pending} queries running or queued, try again later"
+                )
+            self._pending += 1
+            self._stats["submitted"] += 1
+        ticket = _Ticket()
+        # Carry context variables (e.g. the request id used in logs) into the worker
+        context = contextvars.copy_context()
+        future = self._threads.submit(context.run, target, ticket, fn, args)
+        future.add_done_callback(functools.partial(self._done, ticket))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.CancelledError:
+            ticket.cancel()
+            raise
+        except asyncio.TimeoutError:
+            # Abort the statement on the server so the connection frees up promptly
+            ticket.cancel()
+            with self._lock:
+                self._stats["timed_out"] += 1
+            raise QueryTimeoutError(f"Query exceeded the statement timeout of {timeout:g}s and was cancelled")
+
+    def _invoke(self, ticket, work, args):
+        started = self._started(ticket)
+        with self.pool.connection() as conn:
+            self._connected(started)
+            ticket.attach(conn)
+            try:
+                return work(conn, *args)
+            finally:
+                ticket.detach()
+
+    def _invoke_pinned(self, ticket, work, args):
+        started = self._started(ticket)
+        conn = self.pool.acquire()
+        self._connected(started)
+        try:
+            ticket.attach(conn)
+            try:
+                value, keep = work(conn, *args)
+            finally:
+                ticket.detach()
+        except BaseException:
+            self.pool.release(conn, suspect=True)
+            raise
+        if not keep:
+            self.pool.release(conn)
+        return value
+
+    def _started(self, ticket):
+        now = time.perf_counter()
+        if self.metrics is not None:
+            self.metrics.observe("queue", now - ticket.submitted_at)
+        return now
+
+    def _connected(self, started):
+        if self.metrics is not None:
+            self.metrics.observe("connect", time.perf_counter() - started)
+
+    @staticmethod
+    def _call(ticket, fn, conn):
+        if conn is None:
+            if ticket.cancelled:
+                raise QueryCancelledError("Query was cancelled before it started")
+            return fn()
+        ticket.attach(conn)
+        try:
+            return fn()
+        finally:
+            ticket.detach()
+
+    def _done(self, ticket, future):
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or ticket.cancelled:
+                self._stats["cancelled"] += 1
+            elif future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
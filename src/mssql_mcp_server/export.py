@@ -0,0 +1,355 @@
+"""Large results exported to spill files.
+
+An export streams a whole SELECT result to a CSV or JSON Lines file in the
+export directory a batch at a time, so neither the server nor the client
+holds it in memory.  The client gets a handle and a summary back, then
+pages through the rows or searches them with memory-mapped reads of the
+file; nothing is re-queried.
+
+The byte offset of every ``index_step``-th record is kept, so a slice
+starting anywhere only scans the block it starts in.  Records are one line
+each unless a CSV field contains a line break; such exports are marked
+``multiline`` and their blocks are parsed with :mod:`csv` when sliced.
+"""
+import array
+import bisect
+import collections
+import csv
+import io
+import logging
+import mmap
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+
+from .serialization import get_writer
+
+logger = logging.getLogger("mssql_mcp_server.export")
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+class UnknownExportError(ValueError):
+    """Raised for an export handle that does not exist or has expired."""
+
+
+class Export:
+    """A finished spill file and what is known about its contents."""
+
+    __slots__ = ("handle", "path", "format", "columns", "rows", "bytes", "data_start",
+                 "index", "index_step", "multiline", "truncated", "seconds", "created_at")
+
+    def __init__(self, handle, path, fmt, columns, index_step):
+        self.handle = handle
+        self.path = path
+        self.format = fmt
+        self.columns = columns
+        self.rows = 0
+        self.bytes = 0
+        self.data_start = 0
+        self.index = array.array("Q")
+        self.index_step = index_step
+        self.multiline = False
+        self.truncated = False
+        self.seconds = 0.0
+        self.created_at = time.monotonic()
+
+    def summary(self):
+        return {
+            "handle": self.handle,
+            "format": self.format,
+            "columns": self.columns,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "truncated": self.truncated,
+            "seconds": round(self.seconds, 3),
+        }
+
+    def header(self):
+        return get_writer(self.format, self.columns).header() if self.format == "csv" else ""
+
+
+class ExportStore:
+    """Spill files in one directory, addressable by handle.
+
+    At most ``max_files`` exports are kept (oldest removed first) and each
+    expires ``ttl`` seconds after it was written; expired files are deleted
+    by :meth:`expire`, which runs before every write and read.  An export stops, marked
+    ``truncated``, once its file reaches ``max_bytes``.  Without a
+    ``directory`` a private temporary one is created and removed on
+    :meth:`close_all`.
+    """
+
+    def __init__(self, directory=None, max_bytes=1 << 30, max_files=20, ttl=3600.0, index_step=1000):
+        self._owns_directory = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="mssql-mcp-export-")
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.ttl = ttl
+        self.index_step = index_step
+        self._lock = threading.Lock()
+        self._exports = collections.OrderedDict()
+        self._stats = {"exports": 0, "rows": 0, "bytes": 0, "truncated": 0, "slices": 0, "searches": 0, "expired": 0}
+
+    def write(self, cursor, fmt="csv", batch_size=1000):
+        """Stream the rows of an executed ``cursor`` to a new spill file.
+
+        Blocks on the network and must run in a worker thread.  Returns the
+        :class:`Export`; when it is ``truncated`` rows are left unread.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}. Expected one of: {', '.join(EXPORT_FORMATS)}")
+        # Free the disk held by expired exports before adding another
+        self.expire()
+        started = time.perf_counter()
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        handle = secrets.token_urlsafe(9)
+        export = Export(handle, os.path.join(self.directory, f"{handle}.{fmt}"), fmt, columns, self.index_step)
+        writer = get_writer(fmt, columns)
+        step = self.index_step
+        try:
+            with open(export.path, "wb") as f:
+                size = f.write(export.header().encode("utf-8"))
+                export.data_start = size
+                rows = 0
+                while not export.truncated:
+                    batch = cursor.fetchmany(batch_size)
+                    if not batch:
+                        break
+                    i = 0
+                    # Split batches at index boundaries so every step-th record's offset is exact
+                    while i < len(batch):
+                        chunk = batch[i:i + step - rows % step]
+                        data = writer.format_rows(chunk).encode("utf-8")
+                        if size + len(data) > self.max_bytes:
+                            export.truncated = True
+                            break
+                        if rows % step == 0:
+                            export.index.append(size)
+                        if not export.multiline and data.count(b"\n") != len(chunk):
+                            export.multiline = True
+                        size += f.write(data)
+                        rows += len(chunk)
+                        i += len(chunk)
+        except BaseException:
+            _remove_file(export.path)
+            raise
+        export.rows = rows
+        export.bytes = size
+        export.seconds = time.perf_counter() - started
+        self._add(export)
+        logger.info("Exported %d rows (%d bytes) to %s%s", rows, size, export.path,
+                    " (truncated)" if export.truncated else "")
+        return export
+
+    def get(self, handle):
+        """Return the export for ``handle``."""
+        self.expire()
+        with self._lock:
+            export = self._exports.get(handle)
+        if export is None:
+            raise UnknownExportError(f"Unknown or expired export: {handle}")
+        return export
+
+    def read_rows(self, handle, offset=0, limit=100, max_bytes=None):
+        """Return ``(text, rows_returned)`` for rows ``offset`` onward.
+
+        ``text`` has no header.  At least one row is returned if any remain.
+        """
+        export = self.get(handle)
+        self._count("slices")
+        count = max(0, min(limit, export.rows - offset))
+        if offset < 0 or not count:
+            return "", 0
+        with _mapped(export.path) as mm:
+            if export.multiline:
+                return self._parsed_rows(mm, export, offset, count, max_bytes)
+            start = _seek_record(mm, export, offset)
+            end = start
+            returned = 0
+            while returned < count:
+                next_end = mm.find(b"\n", end) + 1
+                if returned and max_bytes and next_end - start > max_bytes:
+                    break
+                end = next_end
+                returned += 1
+            return mm[start:end].decode("utf-8"), returned
+
+    def search(self, handle, pattern, offset=0, limit=100):
+        """Return ``(matches, next_offset)`` for records matching regex ``pattern``.
+
+        Matches are ``(row, text)`` for rows ``offset`` onward; ``next_offset``
+        is the row to continue from, or None when the file was searched to
+        the end.
+        """
+        export = self.get(handle)
+        self._count("searches")
+        try:
+            regex = re.compile(pattern.encode("utf-8"))
+        except re.error as e:
+            raise ValueError(f"Invalid search pattern: {e}")
+        matches = []
+        if offset >= export.rows:
+            return matches, None
+        with _mapped(export.path) as mm:
+            if export.multiline:
+                return self._search_parsed(mm, export, regex, offset, limit)
+            pos = _seek_record(mm, export, offset)
+            while True:
+                found = regex.search(mm, pos, export.bytes)
+                if found is None:
+                    return matches, None
+                line_start = mm.rfind(b"\n", 0, found.start()) + 1
+                line_end = mm.find(b"\n", found.start())
+                row = _row_at(mm, export, line_start)
+                matches.append((row, mm[line_start:line_end].decode("utf-8")))
+                pos = line_end + 1
+                if len(matches) >= limit:
+                    return matches, (row + 1 if row + 1 < export.rows else None)
+
+    def expire(self):
+        """Delete exports older than ``ttl``; returns how many were removed."""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            handles = [h for h, export in self._exports.items() if export.created_at < cutoff]
+            expired = [self._exports.pop(h) for h in handles]
+            self._stats["expired"] += len(expired)
+        for export in expired:
+            _remove_file(export.path)
+        return len(expired)
+
+    def remove(self, handle):
+        """Delete an export; returns True if it existed."""
+        with self._lock:
+            export = self._exports.pop(handle, None)
+        if export is None:
+            return False
+        _remove_file(export.path)
+        return True
+
+    def close_all(self):
+        with self._lock:
+            exports = list(self._exports.values())
+            self._exports.clear()
+        for export in exports:
+            _remove_file(export.path)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                files=len(self._exports),
+                disk_bytes=sum(export.bytes for export in self._exports.values()),
+                directory=self.directory,
+            )
+        return stats
+
+    # -- internals --------------------------------------------------------
+
+    def _add(self, export):
+        with self._lock:
+            self._exports[export.handle] = export
+            evicted = []
+            while len(self._exports) > self.max_files:
+                evicted.append(self._exports.popitem(last=False)[1])
+            self._stats["exports"] += 1
+            self._stats["rows"] += export.rows
+            self._stats["bytes"] += export.bytes
+            if export.truncated:
+                self._stats["truncated"] += 1
+        for old in evicted:
+            _remove_file(old.path)
+
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _parsed_records(self, mm, export, offset):
+        """Yield ``(row, values)`` from ``offset`` on, parsing a block at a time."""
+        step = export.index_step
+        block = offset // step
+        row = block * step
+        while block < len(export.index):
+            stop = export.index[block + 1] if block + 1 < len(export.index) else export.bytes
+            text = mm[export.index[block]:stop].decode("utf-8")
+            for values in csv.reader(io.StringIO(text, newline="")):
+                if row >= offset:
+                    yield row, values
+                row += 1
+            block += 1
+
+    def _parsed_rows(self, mm, export, offset, count, max_bytes):
+        writer = get_writer("csv", export.columns)
+        parts = []
+        size = 0
+        for row, values in self._parsed_records(mm, export, offset):
+            text = writer.format_rows([values])
+            if parts and max_bytes and size + len(text) > max_bytes:
+                break
+            parts.append(text)
+            size += len(text)
+            if len(parts) >= count:
+                break
+        return "".join(parts), len(parts)
+
+    def _search_parsed(self, mm, export, regex, offset, limit):
+        writer = get_writer("csv", export.columns)
+        matches = []
+        for row, values in self._parsed_records(mm, export, offset):
+            text = writer.format_rows([values])[:-1]
+            if regex.search(text.encode("utf-8")):
+                matches.append((row, text))
+                if len(matches) >= limit:
+                    return matches, (row + 1 if row + 1 < export.rows else None)
+        return matches, None
+
+
+class _mapped:
+    """Read-only memory map of a file, closed with the file on exit."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self._map
+
+    def __exit__(self, *exc):
+        self._map.close()
+        self._file.close()
+
+
+def _seek_record(mm, export, row):
+    """Byte offset of ``row`` in a one-record-per-line export."""
+    block = row // export.index_step
+    pos = export.index[block]
+    for _ in range(row - block * export.index_step):
+        pos = mm.find(b"\n", pos) + 1
+    return pos
+
+
+def _row_at(mm, export, pos):
+    """Row number of the line starting at ``pos`` in a one-record-per-line export."""
+    block = bisect.bisect_right(export.index, pos) - 1
+    return block * export.index_step + mm[export.index[block]:pos].count(b"\n")
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("Could not remove export file %s: %s", path, e)
@@ -0,0 +1,140 @@
+"""Pre-execution cost guard based on estimated query plans.
+
+Before a query runs, its estimated plan is fetched with
+``SET SHOWPLAN_XML ON`` (compiled, not executed).  Queries whose estimate
+exceeds the configured row count get a ``TOP`` limit added when that can
+be done safely, otherwise they are rejected; queries whose estimated cost
+is still above the cost threshold are rejected with the estimate, so the
+caller can add filters or join conditions.
+"""
+import re
+import threading
+import xml.etree.ElementTree as ET
+
+from .statements import prepare, split_literals
+
+SHOWPLAN_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+_SELECT_RE = re.compile(r"^\s*SELECT\s+(?:(?:DISTINCT|ALL)\s+)?", re.IGNORECASE)
+# Constructs where a leading TOP would not limit the whole result (or is already there)
+_NO_TOP_RE = re.compile(r"\b(?:TOP|OFFSET|UNION|INTERSECT|EXCEPT|INTO|FOR)\b", re.IGNORECASE)
+
+
+class QueryRejectedError(ValueError):
+    """Raised when a query's estimated plan exceeds the guard's thresholds."""
+
+
+class PlanEstimate:
+    """Estimated rows and subtree cost of the most expensive statement in a plan."""
+
+    __slots__ = ("rows", "cost")
+
+    def __init__(self, rows, cost):
+        self.rows = rows
+        self.cost = cost
+
+    def __repr__(self):
+        return f"PlanEstimate(rows={self.rows:g}, cost={self.cost:g})"
+
+
+def parse_plan(plan_xml):
+    """Return the :class:`PlanEstimate` of a ``SHOWPLAN_XML`` document."""
+    root = ET.fromstring(plan_xml)
+    rows = 0.0
+    cost = 0.0
+    for statement in root.iter(f"{SHOWPLAN_NS}StmtSimple"):
+        rows = max(rows, float(statement.get("StatementEstRows", 0)))
+        cost = max(cost, float(statement.get("StatementSubTreeCost", 0)))
+    return PlanEstimate(rows, cost)
+
+
+def estimate(conn, query, params=None):
+    """Compile ``query`` on ``conn`` without running it and return its estimate."""
+    cursor = conn.cursor()
+    cursor.execute("SET SHOWPLAN_XML ON")
+    try:
+        cursor.execute(*prepare(query, params))
+        plans = [row[0] for row in cursor.fetchall()]
+        while cursor.nextset():
+            plans.extend(row[0] for row in cursor.fetchall())
+    finally:
+        try:
+            cursor.execute("SET SHOWPLAN_XML OFF")
+            cursor.close()
+        except Exception:
+            # A session left in showplan mode would return plans instead of
+            # rows; closing it makes the pool discard it on release
+            conn.close()
+            raise
+    estimates = [parse_plan(plan) for plan in plans if plan]
+    return PlanEstimate(
+        max((e.rows for e in estimates), default=0.0),
+        max((e.cost for e in estimates), default=0.0),
+    )
+
+
+def with_top(query, limit):
+    """Return ``query`` with ``TOP (limit)`` added, or None if that is unsafe."""
+    match = _SELECT_RE.match(query)
+    if match is None:
+        return None
+    code = " ".join(split_literals(query)[::2])
+    if _NO_TOP_RE.search(code):
+        return None
+    return f"{query[:match.end()]}TOP ({int(limit)}) {query[match.end():]}"
+
+
+class QueryGuard:
+    """Checks queries against estimated row and cost thresholds.
+
+    A threshold of 0 disables that check.  With ``add_top`` a query estimated
+    to return more than ``max_rows`` rows is limited to ``max_rows`` instead
+    of being rejected.
+    """
+
+    def __init__(self, max_rows=0, max_cost=0.0, add_top=True):
+        self.max_rows = max_rows
+        self.max_cost = max_cost
+        self.add_top = add_top
+        self._lock = threading.Lock()
+        self._stats = {"checked": 0, "limited": 0, "rejected": 0}
+
+    def review(self, conn, query, params=None, check_rows=True):
+        """Return ``(query, limit)`` to run; ``limit`` is the TOP added, if any.
+
+        Raises :class:`QueryRejectedError` when the query is over budget.
+        With ``check_rows`` false only the cost is checked.  Blocks on the
+        network and must run in a worker thread.
+        """
+        self._count("checked")
+        plan = estimate(conn, query, params)
+        limit = None
+        if check_rows and self.max_rows and plan.rows > self.max_rows:
+            limited = with_top(query, self.max_rows) if self.add_top else None
+            if limited is None:
+                self._count("rejected")
+                raise QueryRejectedError(
+                    f"Query rejected: an estimated {plan.rows:,.0f} rows exceeds the limit of "
+                    f"{self.max_rows:,}. Add filters or a TOP clause."
+                )
+            query, limit = limited, self.max_rows
+            plan = estimate(conn, query, params)
+        if self.max_cost and plan.cost > self.max_cost:
+            self._count("rejected")
+            raise QueryRejectedError(
+                f"Query rejected: estimated cost {plan.cost:,.1f} exceeds the limit of {self.max_cost:,.1f} "
+                f"(about {plan.rows:,.0f} rows). Check join conditions and add filters."
+            )
+        if limit is not None:
+            self._count("limited")
+        return query, limit
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update(max_rows=self.max_rows, max_cost=self.max_cost, add_top=self.add_top)
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
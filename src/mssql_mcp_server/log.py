@@ -0,0 +1,107 @@
+"""Logging setup for the server.
+
+Log records go through a queue and are written to stderr by a background
+thread, so a slow or blocked stderr never stalls request handling.  Every
+record carries the correlation id of the MCP request that produced it.
+Query text and result payloads are truncated, and query logging can be
+sampled so busy servers do not spend their time formatting log lines.
+"""
+import contextvars
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+_request_id = contextvars.ContextVar("mssql_request_id", default="-")
+_request_counter = itertools.count(1)
+
+_settings = {"sample_rate": 1.0, "max_chars": 500}
+_listener = None
+
+
+def get_log_config():
+    """Get logging settings from environment variables."""
+    return {
+        "level": os.getenv("MSSQL_LOG_LEVEL", "INFO").upper(),
+        "sample_rate": float(os.getenv("MSSQL_LOG_SAMPLE_RATE", "1.0")),
+        "max_chars": int(os.getenv("MSSQL_LOG_MAX_CHARS", "500")),
+    }
+
+
+class _RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+def configure_logging(config=None):
+    """Install the queued stderr handler on the root logger (once, at startup)."""
+    global _listener
+    config = config or get_log_config()
+    _settings["sample_rate"] = config["sample_rate"]
+    _settings["max_chars"] = config["max_chars"]
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # The request id has to be captured in the calling thread/task
+    queue_handler.addFilter(_RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(config["level"])
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def new_request_id():
+    """Assign a fresh correlation id to the current task and return it."""
+    request_id = f"r{next(_request_counter):06d}"
+    _request_id.set(request_id)
+    return request_id
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+def sampled():
+    """Return True for the configured fraction of calls."""
+    rate = _settings["sample_rate"]
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+class truncated:
+    """Lazily truncated ``str()`` of a value, for use as a logging argument.
+
+    Nothing is formatted unless the record is actually emitted.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit=None):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        text = str(self.value)
+        limit = self.limit or _settings["max_chars"]
+        if len(text) <= limit:
+            return text
+        return f"{text[:limit]}... ({len(text) - limit} more chars)"
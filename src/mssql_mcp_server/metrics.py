@@ -0,0 +1,210 @@
+"""Latency and throughput instrumentation.
+
+Time spent serving a query is split into phases (waiting for a worker,
+checking out a connection, estimating the plan when the cost guard is
+on, executing on the server, fetching rows and serializing them).  Each phase feeds a fixed-bucket histogram; counters
+track rows, bytes and errors by exception class, and the slowest
+query shapes (literals replaced by ``?``) are kept in a small bounded
+table.  Everything is
+recorded per call or per fetched batch, never per row, so it can stay on
+in production.
+"""
+import bisect
+import os
+import re
+import threading
+
+from .statements import split_literals
+
+# Upper bounds in seconds; the last bucket catches everything above
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PHASES = ("queue", "connect", "estimate", "execute", "fetch", "serialize", "total")
+
+_QUERY_TEXT_LIMIT = 200
+
+_NUMBER_RE = re.compile(r"\b0x[0-9A-F]*\b|\b\d+(?:\.\d*)?(?:E[-+]?\d+)?\b", re.IGNORECASE)
+# The N prefix of a Unicode string literal
+_NATIONAL_RE = re.compile(r"(?<![\w@#$])N$")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def query_shape(query):
+    """Return ``query`` with case and whitespace folded and literals replaced by ``?``.
+
+    Runs of one statement with different values share a shape; comments
+    are dropped and quoted names kept.
+    """
+    parts = split_literals(query.strip().rstrip(";").strip())
+    shape = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            shape.append(_NUMBER_RE.sub("?", part.upper()))
+        elif part.startswith("'"):
+            shape[-1] = _NATIONAL_RE.sub("", shape[-1])
+            shape.append("?")
+        elif part.startswith(("--", "/*")):
+            shape.append(" ")
+        else:
+            shape.append(part)
+    return _WHITESPACE_RE.sub(" ", "".join(shape)).strip()
+
+
+class Histogram:
+    """Counts of observations per latency bucket, plus sum and max."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Estimate the ``q`` quantile as the upper bound of its bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": round(self.max, 6),
+        }
+
+
+class _QueryStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class Metrics:
+    """Thread-safe registry of phase histograms, counters and slow query shapes."""
+
+    def __init__(self, top_queries=10):
+        self.top_queries = top_queries
+        self._lock = threading.Lock()
+        self._phases = {phase: Histogram() for phase in PHASES}
+        self._counters = {"queries": 0, "pages": 0, "rows": 0, "bytes": 0, "cache_hits": 0}
+        self._errors = {}
+        self._queries = {}
+
+    def observe(self, phase, seconds):
+        """Record ``seconds`` spent in ``phase``."""
+        with self._lock:
+            histogram = self._phases.get(phase)
+            if histogram is None:
+                histogram = self._phases[phase] = Histogram()
+            histogram.observe(seconds)
+
+    def observe_page(self, page):
+        """Record fetch/serialize time and row/byte counts of a result page."""
+        with self._lock:
+            self._phases["fetch"].observe(page.fetch_seconds)
+            self._phases["serialize"].observe(page.format_seconds)
+            self._counters["pages"] += 1
+            self._counters["rows"] += page.row_count
+            self._counters["bytes"] += page.byte_count
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def error(self, exc):
+        """Count a failure under its exception class name."""
+        name = type(exc).__name__
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+    def record_query(self, query, seconds):
+        """Record the end-to-end time of one query for the slowest-queries table."""
+        key = query_shape(query)
+        with self._lock:
+            self._counters["queries"] += 1
+            self._phases["total"].observe(seconds)
+            stats = self._queries.get(key)
+            if stats is None:
+                if len(self._queries) >= self.top_queries * 4:
+                    self._prune()
+                stats = self._queries[key] = _QueryStats()
+            stats.count += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+
+    def snapshot(self):
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                "phases": {name: h.summary() for name, h in self._phases.items()},
+                "counters": dict(self._counters),
+                "errors": dict(self._errors),
+                "slowest_queries": [
+                    {
+                        "query": key[:_QUERY_TEXT_LIMIT],
+                        "count": stats.count,
+                        "max_seconds": round(stats.max, 6),
+                        "mean_seconds": round(stats.total / stats.count, 6),
+                    }
+                    for key, stats in self._slowest()
+                ],
+            }
+
+    def prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = ["# TYPE mssql_mcp_phase_seconds histogram"]
+        with self._lock:
+            for phase, histogram in self._phases.items():
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'mssql_mcp_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'mssql_mcp_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+                lines.append(f'mssql_mcp_phase_seconds_sum{{phase="{phase}"}} {histogram.sum}')
+                lines.append(f'mssql_mcp_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+            for name, value in self._counters.items():
+                lines.append(f"# TYPE mssql_mcp_{name}_total counter")
+                lines.append(f"mssql_mcp_{name}_total {value}")
+            lines.append("# TYPE mssql_mcp_errors_total counter")
+            for name, value in sorted(self._errors.items()):
+                lines.append(f'mssql_mcp_errors_total{{class="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Atomically write :meth:`prometheus` output to ``path``."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    # -- internals --------------------------------------------------------
+
+    def _slowest(self):
+        ranked = sorted(self._queries.items(), key=lambda item: item[1].max, reverse=True)
+        return ranked[:self.top_queries]
+
+    def _prune(self):
+        self._queries = dict(self._slowest())
@@ -0,0 +1,256 @@
+"""Connection pool shared by every MCP entry point.
+
+Opening a pymssql connection costs a full TDS login handshake, so instead of
+connecting per call the server keeps a small set of warm connections around
+and hands them out on demand.
+"""
+import collections
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("mssql_mcp_server.pool")
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection became available within the acquire timeout."""
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "created_at", "last_used", "suspect")
+
+    def __init__(self, conn):
+        now = time.monotonic()
+        self.conn = conn
+        self.created_at = now
+        self.last_used = now
+        self.suspect = False
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections.
+
+    ``connect`` is a zero-argument callable returning a new connection, e.g.
+    ``functools.partial(pymssql.connect, **config)``.  Idle connections above
+    ``min_size`` are closed after ``idle_timeout`` seconds.  A connection that
+    sat idle longer than ``health_check_interval`` seconds (or whose last use
+    raised an error) is pinged before being handed out and transparently
+    replaced if the session turned out to be broken.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300.0,
+                 acquire_timeout=30.0, health_check_interval=30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = collections.deque()
+        self._in_use = {}
+        self._size = 0
+        self._closed = False
+        self._stats = {
+            "hits": 0,
+            "creations": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "discarded": 0,
+            "idle_closed": 0,
+        }
+
+    # -- public API -------------------------------------------------------
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of a ``with`` block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, suspect=True)
+            raise
+        else:
+            self.release(conn)
+
+    def acquire(self, timeout=None):
+        """Check out a connection, creating or waiting for one if needed."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self._checkout(deadline)
+            if entry is None:
+                entry = self._create()
+            elif not self._is_healthy(entry):
+                self._discard(entry, reason="health_check_failures")
+                continue
+            entry.suspect = False
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+            return entry.conn
+
+    def release(self, conn, suspect=False, broken=False):
+        """Return a connection to the pool.
+
+        ``suspect`` forces a health check on the next checkout; ``broken``
+        closes the connection immediately.
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            logger.warning("Releasing a connection that is not checked out")
+            return
+        if not broken:
+            try:
+                # Never leave an open implicit transaction on a shared session
+                conn.rollback()
+            except Exception as e:
+                logger.warning("Rollback on release failed, discarding connection: %s", e)
+                broken = True
+        if broken or self._closed:
+            self._discard(entry, reason="discarded")
+            return
+        entry.last_used = time.monotonic()
+        entry.suspect = suspect
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def prefill(self):
+        """Open connections until ``min_size`` are available."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._new_entry()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def close(self):
+        """Close idle connections; in-use ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), collections.deque()
+            self._cond.notify_all()
+        for entry in idle:
+            self._discard(entry, reason=None)
+
+    def stats(self):
+        """Return a snapshot of pool counters."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                min_size=self.min_size,
+                max_size=self.max_size,
+            )
+        return stats
+
+    # -- internals --------------------------------------------------------
+
+    def _checkout(self, deadline):
+        """Pop an idle entry, or reserve a slot for a new one (returns None)."""
+        waited = False
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                expired = self._prune_idle_locked()
+                if expired:
+                    break
+                if self._idle:
+                    self._stats["hits"] += 1
+                    return self._idle.pop()
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"Timed out waiting for a database connection (max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+        # Close expired idle connections outside the lock, then retry
+        for entry in expired:
+            self._close_quietly(entry.conn)
+        return self._checkout(deadline)
+
+    def _prune_idle_locked(self):
+        if not self.idle_timeout:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        # Oldest idle connections sit at the left end of the deque
+        while self._idle and self._size > self.min_size and self._idle[0].last_used < cutoff:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+            self._stats["idle_closed"] += 1
+        return expired
+
+    def _create(self):
+        try:
+            entry = self._new_entry()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        return entry
+
+    def _new_entry(self):
+        conn = self._connect()
+        with self._cond:
+            self._stats["creations"] += 1
+        return _PooledConnection(conn)
+
+    def _is_healthy(self, entry):
+        if not entry.suspect and time.monotonic() - entry.last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = entry.conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.warning("Pooled connection failed health check, reconnecting: %s", e)
+            return False
+
+    def _discard(self, entry, reason):
+        self._close_quietly(entry.conn)
+        with self._cond:
+            self._size -= 1
+            if reason:
+                self._stats[reason] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,287 @@
+"""Streaming, paginated result sets.
+
+A SELECT is read with ``fetchmany`` in small batches until a row or byte
+limit is reached.  If rows remain, the cursor stays open on its (pinned)
+connection and is registered under a continuation token so the next page
+can be fetched later without re-running the query.
+"""
+import collections
+import logging
+import secrets
+import threading
+import time
+
+from .executor import cancel_connection
+
+logger = logging.getLogger("mssql_mcp_server.results")
+
+
+class UnknownCursorError(ValueError):
+    """Raised for a continuation token that does not exist or has expired."""
+
+
+class Page:
+    """One page of a result set, rendered by the result's writer.
+
+    ``fetch_seconds`` and ``format_seconds`` are the time spent in the driver
+    and in the writer while reading the page.
+    """
+
+    __slots__ = ("writer", "body", "row_count", "byte_count", "has_more", "fetch_seconds", "format_seconds")
+
+    def __init__(self, writer, body, row_count, byte_count, has_more, fetch_seconds=0.0, format_seconds=0.0):
+        self.writer = writer
+        self.body = body
+        self.row_count = row_count
+        self.byte_count = byte_count
+        self.has_more = has_more
+        self.fetch_seconds = fetch_seconds
+        self.format_seconds = format_seconds
+
+    @property
+    def columns(self):
+        return self.writer.columns
+
+    @property
+    def text(self):
+        return self.writer.render(self.body)
+
+
+def read_page(cursor, writer, max_rows, max_bytes, batch_size=200, pending=None):
+    """Read up to ``max_rows`` rows / ``max_bytes`` rendered bytes from ``cursor``.
+
+    Rows are rendered a batch at a time by ``writer``.  ``pending`` is a deque
+    of rows fetched earlier but not yet returned; it is drained first and
+    refilled with any rows read past the limit, so no row is lost between
+    pages.  At least one row is always returned if available.
+    """
+    if pending is None:
+        pending = collections.deque()
+    chunks = []
+    row_count = 0
+    byte_count = 0
+    exhausted = False
+    # Timed per batch, not per row
+    clock = time.perf_counter
+    fetch_seconds = 0.0
+    format_seconds = 0.0
+    while row_count < max_rows:
+        wanted = max_rows - row_count
+        if pending:
+            batch = [pending.popleft() for _ in range(min(wanted, len(pending)))]
+        else:
+            started = clock()
+            batch = cursor.fetchmany(min(batch_size, wanted))
+            fetch_seconds += clock() - started
+            if not batch:
+                exhausted = True
+                break
+        started = clock()
+        text = writer.format_rows(batch)
+        size = len(text.encode("utf-8"))
+        format_seconds += clock() - started
+        if byte_count + size <= max_bytes:
+            chunks.append(text)
+            byte_count += size
+            row_count += len(batch)
+            continue
+        # The batch overflows the page: take rows one by one up to the limit
+        started = clock()
+        for i, row in enumerate(batch):
+            text = writer.format_rows([row])
+            size = len(text.encode("utf-8"))
+            if row_count and byte_count + size > max_bytes:
+                pending.extendleft(reversed(batch[i:]))
+                break
+            chunks.append(text)
+            byte_count += size
+            row_count += 1
+        format_seconds += clock() - started
+        break
+    if not exhausted and not pending:
+        # Peek one row ahead so callers know whether another page exists
+        started = clock()
+        row = cursor.fetchone()
+        fetch_seconds += clock() - started
+        if row is None:
+            exhausted = True
+        else:
+            pending.append(row)
+    return Page(writer, "".join(chunks), row_count, byte_count, not exhausted, fetch_seconds, format_seconds)
+
+
+class _OpenResult:
+    __slots__ = ("token", "conn", "cursor", "writer", "pending", "last_used", "rows_sent", "closed", "lock", "owner")
+
+    def __init__(self, token, conn, cursor, writer, pending, rows_sent, owner=None):
+        self.token = token
+        self.owner = owner
+        self.conn = conn
+        self.cursor = cursor
+        self.writer = writer
+        self.pending = pending
+        self.rows_sent = rows_sent
+        self.last_used = time.monotonic()
+        self.closed = False
+        # Held while reading and while closing, so a result is never closed mid-fetch
+        self.lock = threading.Lock()
+
+
+class ResultCursorRegistry:
+    """Open result sets addressable by continuation token.
+
+    Each open result pins one pooled connection, so at most ``max_open`` are
+    kept.  Results belong to an owner (the client's MCP session); registering
+    past the limit closes the least recently used result of the owner holding
+    the most, the registering owner's own on a tie, so one client's queries
+    cannot close another's cursors while that client holds no more.  Results
+    not touched for ``idle_timeout`` seconds are closed by :meth:`expire_idle`,
+    which the server also runs periodically.  All methods block on the
+    network and must run in a worker thread.
+    """
+
+    def __init__(self, pool, max_open=4, idle_timeout=120.0):
+        self.pool = pool
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._open = collections.OrderedDict()
+
+    def register(self, conn, cursor, writer, pending, rows_sent, owner=None):
+        """Keep ``cursor`` open for ``owner`` and return its continuation token."""
+        token = secrets.token_urlsafe(12)
+        evicted = self._expired()
+        with self._lock:
+            self._open[token] = _OpenResult(token, conn, cursor, writer, pending, rows_sent, owner)
+            while len(self._open) > self.max_open:
+                evicted.append(self._open.pop(self._victim(owner, token)))
+        for result in evicted:
+            self._close_result(result)
+        return token
+
+    def fetch_page(self, token, max_rows, max_bytes, batch_size=200):
+        """Return the next page for ``token``; the cursor is closed once exhausted."""
+        self.expire_idle()
+        with self._lock:
+            result = self._open.get(token)
+            if result is None:
+                raise UnknownCursorError(f"Unknown or expired cursor: {token}")
+            self._open.move_to_end(token)
+        with result.lock:
+            if result.closed:
+                # Evicted or expired between the lookup and taking the lock
+                raise UnknownCursorError(f"Unknown or expired cursor: {token}")
+            try:
+                page = read_page(result.cursor, result.writer, max_rows, max_bytes,
+                                 batch_size, result.pending)
+            except BaseException:
+                self._forget(token)
+                self._release(result, suspect=True)
+                raise
+            result.rows_sent += page.row_count
+            result.last_used = time.monotonic()
+            if not page.has_more:
+                self._forget(token)
+                self._release(result, exhausted=True)
+        return page, result.rows_sent
+
+    def connection_for(self, token):
+        """Return the connection pinned by ``token`` (for cancellation)."""
+        with self._lock:
+            result = self._open.get(token)
+        return result.conn if result else None
+
+    def close(self, token):
+        """Close the result set for ``token`` if it is still open."""
+        result = self._forget(token)
+        if result is not None:
+            self._close_result(result)
+            return True
+        return False
+
+    def expire_idle(self):
+        """Close results not touched for ``idle_timeout`` seconds; returns how many."""
+        expired = self._expired()
+        for result in expired:
+            self._close_result(result)
+        return len(expired)
+
+    def close_all(self):
+        with self._lock:
+            results = list(self._open.values())
+            self._open.clear()
+        for result in results:
+            self._close_result(result)
+
+    def open_count(self):
+        with self._lock:
+            return len(self._open)
+
+    def capacity_for(self, owner=None):
+        """How many results ``owner`` can register before one of them is closed.
+
+        Registering may close ``owner``'s results from before; this counts
+        the new ones that would all stay open together.
+        """
+        with self._lock:
+            counts = collections.Counter(result.owner for result in self._open.values())
+        older = counts[owner]
+        total = sum(counts.values())
+        capacity = 0
+        while capacity < self.max_open:
+            counts[owner] += 1
+            total += 1
+            if total > self.max_open:
+                # Mirrors _victim: the newest result is never the one closed
+                holders = {o: n for o, n in counts.items() if n and (o != owner or n > 1)}
+                most = max(holders.values())
+                if holders.get(owner) == most:
+                    if not older:
+                        break
+                    older -= 1
+                    counts[owner] -= 1
+                else:
+                    counts[next(o for o, n in holders.items() if n == most)] -= 1
+                total -= 1
+            capacity += 1
+        return capacity
+
+    # -- internals --------------------------------------------------------
+
+    def _forget(self, token):
+        with self._lock:
+            return self._open.pop(token, None)
+
+    def _victim(self, owner, newest):
+        """Token of the result to close, never ``newest``; ``_lock`` must be held."""
+        counts = collections.Counter(result.owner for result in self._open.values())
+        candidates = [(token, result.owner) for token, result in self._open.items() if token != newest]
+        most = max(counts[o] for _, o in candidates)
+        for token, o in candidates:
+            if o == owner and counts[o] == most:
+                return token
+        return next(token for token, o in candidates if counts[o] == most)
+
+    def _expired(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            tokens = [t for t, r in self._open.items() if r.last_used < cutoff]
+            return [self._open.pop(t) for t in tokens]
+
+    def _close_result(self, result, exhausted=False, suspect=False):
+        with result.lock:
+            self._release(result, exhausted, suspect)
+
+    def _release(self, result, exhausted=False, suspect=False):
+        """Close ``result`` and return its connection once; ``result.lock`` must be held."""
+        if result.closed:
+            return
+        result.closed = True
+        if not exhausted and not cancel_connection(result.conn):
+            # Rows may still be streaming; make sure the session is checked before reuse
+            suspect = True
+        try:
+            result.cursor.close()
+        except Exception:
+            pass
+        self.pool.release(result.conn, suspect=suspect)
@@ -0,0 +1,205 @@
+"""Result set serialization.
+
+Rows are rendered in batches by a per-result writer:
+
+* ``csv`` - RFC 4180 quoting (values containing commas, quotes or line
+  breaks are quoted), one record per line, header first.
+* ``jsonl`` - one JSON object per row; repeated or unnamed columns get
+  unique keys (``id_2``, ``col3``).
+* ``columnar`` - a JSON document stating column names and types once,
+  followed by rows as arrays.
+
+Writers pick per-column conversions from the first non-null values they
+see, so the common case (strings and numbers) goes straight to the C
+implementations of :mod:`csv` and :mod:`json` without per-cell Python work.
+"""
+import csv
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+
+def _hex(value):
+    return "0x" + bytes(value).hex()
+
+
+# Conversions for values the json module cannot encode natively
+_JSON_CONVERTERS = {
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: datetime.time.isoformat,
+    decimal.Decimal: str,
+    uuid.UUID: str,
+    bytes: _hex,
+    bytearray: _hex,
+    memoryview: _hex,
+}
+
+# csv calls str() on non-string values, which is fine for everything but binary
+_CSV_CONVERTERS = {
+    bytes: _hex,
+    bytearray: _hex,
+    memoryview: _hex,
+}
+
+_TYPE_NAMES = {
+    str: "string",
+    int: "integer",
+    float: "float",
+    bool: "boolean",
+    decimal.Decimal: "decimal",
+    datetime.datetime: "datetime",
+    datetime.date: "date",
+    datetime.time: "time",
+    uuid.UUID: "uuid",
+    bytes: "binary",
+    bytearray: "binary",
+    memoryview: "binary",
+}
+
+
+def _json_default(value):
+    converter = _JSON_CONVERTERS.get(type(value))
+    return converter(value) if converter is not None else str(value)
+
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_json_default).encode
+
+
+class RowWriter:
+    """Base class: renders batches of rows for one result set."""
+
+    format = None
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.types = [None] * len(self.columns)
+        self._untyped = len(self.columns)
+
+    def format_rows(self, rows):
+        """Return the text for ``rows``; records are newline-terminated."""
+        raise NotImplementedError
+
+    def render(self, body):
+        """Wrap the concatenated output of :meth:`format_rows` into a document."""
+        raise NotImplementedError
+
+    def _learn_types(self, rows):
+        for row in rows:
+            for i, value in enumerate(row):
+                if value is not None and self.types[i] is None:
+                    self.types[i] = type(value)
+                    self._untyped -= 1
+            if not self._untyped:
+                break
+        self._on_types_learned()
+
+    def _on_types_learned(self):
+        pass
+
+
+class CsvWriter(RowWriter):
+    format = "csv"
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n")
+        self._convert = ()
+
+    def _on_types_learned(self):
+        self._convert = tuple(
+            (i, _CSV_CONVERTERS[t]) for i, t in enumerate(self.types) if t in _CSV_CONVERTERS
+        )
+
+    def format_rows(self, rows):
+        if self._untyped:
+            self._learn_types(rows)
+        if self._convert:
+            rows = [self._converted(row) for row in rows]
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerows(rows)
+        return self._buffer.getvalue()
+
+    def _converted(self, row):
+        row = list(row)
+        for i, converter in self._convert:
+            if row[i] is not None:
+                row[i] = converter(row[i])
+        return row
+
+    def header(self):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(self.columns)
+        return self._buffer.getvalue()
+
+    def render(self, body):
+        text = self.header() + body
+        # Drop the final record terminator to keep the output compact
+        return text[:-1] if text.endswith("\n") else text
+
+
+def _unique_keys(columns):
+    """Return object keys for ``columns``: unnamed ones become ``colN`` (1-based)
+    and repeats get a ``_2``, ``_3``... suffix, so no value is lost."""
+    taken = set(name for name in columns if name)
+    keys = []
+    seen = set()
+    for i, name in enumerate(columns, 1):
+        key = name or f"col{i}"
+        if key in seen or (not name and key in taken):
+            base, n = key, 2
+            while f"{base}_{n}" in taken or f"{base}_{n}" in seen:
+                n += 1
+            key = f"{base}_{n}"
+        seen.add(key)
+        keys.append(key)
+    return keys
+
+
+class JsonLinesWriter(RowWriter):
+    format = "jsonl"
+
+    def __init__(self, columns):
+        super().__init__(columns)
+        self._keys = _unique_keys(self.columns)
+
+    def format_rows(self, rows):
+        columns = self._keys
+        return "".join([_encode(dict(zip(columns, row))) + "\n" for row in rows])
+
+    def render(self, body):
+        return body[:-1] if body.endswith("\n") else body
+
+
+class ColumnarWriter(RowWriter):
+    format = "columnar"
+
+    def format_rows(self, rows):
+        if self._untyped:
+            self._learn_types(rows)
+        return "".join([_encode(row) + ",\n" for row in rows])
+
+    def render(self, body):
+        columns = [
+            {"name": name, "type": _TYPE_NAMES.get(type_, "string" if type_ is not None else None)}
+            for name, type_ in zip(self.columns, self.types)
+        ]
+        return '{"columns":' + _encode(columns) + ',"rows":[\n' + body[:-2] + "]}"
+
+
+_WRITERS = {writer.format: writer for writer in (CsvWriter, JsonLinesWriter, ColumnarWriter)}
+
+
+def get_writer(fmt, columns):
+    """Return a writer for ``fmt`` (``csv``, ``jsonl`` or ``columnar``)."""
+    try:
+        return _WRITERS[fmt or "csv"](columns)
+    except KeyError:
+        raise ValueError(f"Unknown output format: {fmt}. Expected one of: {', '.join(FORMATS)}")
@@ -1,36 +1,63 @@
 import asyncio
+import collections
+import contextlib
+import functools
+import json
 import logging
 import os
+import re
+import threading
+import time
+import urllib.parse
 import pymssql
 from mcp.server import Server
-from mcp.types import Resource, Tool, TextContent
+from mcp.types import Resource, ResourceTemplate, Tool, TextContent
 from pydantic import AnyUrl
 import sys
+from .browse import build_query, data_uri, encode_key, parse_data_uri
+from .cache import ResultCache, normalize_query, referenced_tables
+from .catalog import SchemaCatalog
+from .executor import QueryExecutor, cancel_connection
+from .export import EXPORT_FORMATS, ExportStore
+from .guard import QueryGuard
+from .log import configure_logging, new_request_id, sampled, shutdown_logging, truncated
+from .metrics import Metrics
+from .pool import ConnectionPool
+from .results import ResultCursorRegistry, read_page
+from .serialization import FORMATS, get_writer
+from .statements import prepare, split_literals, template_cache_info
+from .stats import column_statistics, table_sizes
+from .transport import TRANSPORTS, ClientBusyError, ClientLimiter, serve_http
 # Set system encoding to UTF-8
 if sys.platform.startswith('win'):
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
-# Configure logging
-log_file = 'mssql_mcp_server.log'
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        #logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()  # 保持控制台輸出
-    ]
-)
+# Logging is configured once in main() (see log.py)
 logger = logging.getLogger("mssql_mcp_server")
 
+# Only a plain table listing gets the "Tables_in_<db>" answer; any other query
+# that mentions INFORMATION_SCHEMA.TABLES is paged and guarded like the rest
+_TABLE_LISTING_RE = re.compile(
+    r"^\s*SELECT\s+(?:\[?TABLE_SCHEMA\]?\s*,\s*)?\[?TABLE_NAME\]?\s+FROM\s+INFORMATION_SCHEMA\.TABLES"
+    r"(?:\s+WHERE\s+\[?TABLE_TYPE\]?\s*=\s*'BASE TABLE')?"
+    r"(?:\s+ORDER\s+BY\s+[\w\[\],\s]+?)?\s*;?\s*$",
+    re.IGNORECASE,
+)
+
+# Statements that return no result set, which single-mode batches cannot match to a query
+_NO_RESULT_SET_RE = re.compile(
+    r"\bINTO\b|^\s*SELECT\s+(?:(?:DISTINCT|ALL)\s+)?"
+    r"(?:TOP\s*(?:\([^)]*\)|\d+)(?:\s+PERCENT)?(?:\s+WITH\s+TIES)?\s+)?@\w+\s*[-+*/%&|^]?=",
+    re.IGNORECASE,
+)
+
+# Settings are read from the environment once and cached for the process lifetime
+@functools.lru_cache(maxsize=None)
 def get_db_config():
     """Get database configuration from environment variables."""
-    # 檢查並記錄環境變數
-    logger.info(f"環境變數: MSSQL_SERVER={os.getenv('MSSQL_SERVER')}, MSSQL_USER={os.getenv('MSSQL_USER')}, MSSQL_DATABASE={os.getenv('MSSQL_DATABASE')}")
-    
     # 同時檢查 MSSQL_USERNAME (可能是 .env 檔案中使用的名稱)
     username = os.getenv("MSSQL_USER") or os.getenv("MSSQL_USERNAME", "reader")
-    logger.info(f"使用者名稱變數: MSSQL_USERNAME={os.getenv('MSSQL_USERNAME')}")
     
     config = {
         "server": os.getenv("MSSQL_SERVER", "10.1.6.61"),
@@ -39,7 +66,7 @@ def get_db_config():
         "database": os.getenv("MSSQL_DATABASE", "JPC_PLM")
     }
     
-    logger.info(f"使用的資料庫設定: {config['server']}/{config['database']} as {config['user']}")
+    logger.info("使用的資料庫設定: %s/%s as %s", config["server"], config["database"], config["user"])
     
     if not all([config["server"], config["user"], config["password"], config["database"]]):
         logger.error("Missing required database configuration. Please check environment variables:")
@@ -48,37 +75,426 @@ def get_db_config():
     
     return config
 
+@functools.lru_cache(maxsize=None)
+def get_pool_config():
+    """Get connection pool settings from environment variables."""
+    return {
+        "min_size": int(os.getenv("MSSQL_POOL_MIN_SIZE", "1")),
+        "max_size": int(os.getenv("MSSQL_POOL_MAX_SIZE", "10")),
+        "idle_timeout": float(os.getenv("MSSQL_POOL_IDLE_TIMEOUT", "300")),
+        "acquire_timeout": float(os.getenv("MSSQL_POOL_ACQUIRE_TIMEOUT", "30")),
+        "health_check_interval": float(os.getenv("MSSQL_POOL_HEALTH_CHECK_INTERVAL", "30")),
+    }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = get_db_config()
+                # Only SELECTs run, so no transaction is needed; with autocommit
+                # the rollback on every release is a no-op instead of two round trips
+                _pool = ConnectionPool(
+                    functools.partial(pymssql.connect, autocommit=True, **config),
+                    **get_pool_config()
+                )
+    return _pool
+
+@functools.lru_cache(maxsize=None)
+def get_executor_config():
+    """Get query concurrency settings from environment variables."""
+    return {
+        "max_concurrency": int(os.getenv("MSSQL_MAX_CONCURRENT_QUERIES", "4")),
+        "max_queue": int(os.getenv("MSSQL_QUERY_QUEUE_SIZE", "32")),
+    }
+
+_executor = None
+
+def get_executor():
+    """Return the process-wide query executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        pool = get_pool()
+        metrics = get_metrics()
+        with _pool_lock:
+            if _executor is None:
+                _executor = QueryExecutor(pool, metrics=metrics, **get_executor_config())
+    return _executor
+
+@functools.lru_cache(maxsize=None)
+def get_transport_config():
+    """Get transport and per-client limit settings from environment variables."""
+    transport = os.getenv("MSSQL_MCP_TRANSPORT", "stdio").lower()
+    if transport not in TRANSPORTS:
+        raise ValueError(f"MSSQL_MCP_TRANSPORT must be one of {', '.join(TRANSPORTS)}, got {transport}")
+    return {
+        "transport": transport,
+        "host": os.getenv("MSSQL_MCP_HOST", "127.0.0.1"),
+        "port": int(os.getenv("MSSQL_MCP_PORT", "8000")),
+        "client_max_concurrency": int(os.getenv("MSSQL_CLIENT_MAX_CONCURRENCY", "2")),
+        "client_max_queue": int(os.getenv("MSSQL_CLIENT_QUEUE_SIZE", "8")),
+    }
+
+_client_limiter = None
+
+def get_client_limiter():
+    """Return the per-client request limiter, or None over stdio or when disabled."""
+    global _client_limiter
+    if _client_limiter is None:
+        settings = get_transport_config()
+        if settings["transport"] == "stdio" or settings["client_max_concurrency"] <= 0:
+            return None
+        with _pool_lock:
+            if _client_limiter is None:
+                _client_limiter = ClientLimiter(settings["client_max_concurrency"], settings["client_max_queue"])
+    return _client_limiter
+
+def _current_session():
+    """Return the MCP session of the request being served, or None outside one."""
+    try:
+        return app.request_context.session
+    except LookupError:
+        return None
+
+def _client_slot():
+    """Hold a request slot of the calling MCP session (a no-op when unlimited)."""
+    limiter = get_client_limiter()
+    if limiter is None:
+        return contextlib.nullcontext()
+    return limiter.slot(_current_session())
+
+@functools.lru_cache(maxsize=None)
+def get_metrics_config():
+    """Get instrumentation settings from environment variables."""
+    return {
+        "top_queries": int(os.getenv("MSSQL_METRICS_TOP_QUERIES", "10")),
+        "prometheus_file": os.getenv("MSSQL_METRICS_FILE") or None,
+        "prometheus_interval": float(os.getenv("MSSQL_METRICS_INTERVAL", "15")),
+    }
+
+_metrics = None
+
+def get_metrics():
+    """Return the process-wide latency/throughput metrics."""
+    global _metrics
+    if _metrics is None:
+        with _pool_lock:
+            if _metrics is None:
+                _metrics = Metrics(top_queries=get_metrics_config()["top_queries"])
+    return _metrics
+
+async def _write_metrics_periodically(path, interval):
+    """Dump metrics in Prometheus text format to ``path`` every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            get_metrics().write_prometheus(path)
+        except OSError as e:
+            logger.warning("Failed to write metrics file %s: %s", path, e)
+
+@functools.lru_cache(maxsize=None)
+def get_result_config():
+    """Get result paging limits from environment variables."""
+    return {
+        "max_rows": int(os.getenv("MSSQL_MAX_ROWS", "500")),
+        "max_bytes": int(os.getenv("MSSQL_MAX_RESULT_BYTES", "1000000")),
+        "batch_size": int(os.getenv("MSSQL_FETCH_BATCH_SIZE", "200")),
+        "max_open_cursors": int(os.getenv("MSSQL_MAX_OPEN_CURSORS", "4")),
+        "cursor_idle_timeout": float(os.getenv("MSSQL_CURSOR_IDLE_TIMEOUT", "120")),
+        "format": os.getenv("MSSQL_OUTPUT_FORMAT", "csv"),
+        "browse_page_size": int(os.getenv("MSSQL_BROWSE_PAGE_SIZE", "100")),
+    }
+
+_result_registry = None
+
+def get_result_registry():
+    """Return the registry of open, paginated result sets."""
+    global _result_registry
+    if _result_registry is None:
+        pool = get_pool()
+        settings = get_result_config()
+        with _pool_lock:
+            if _result_registry is None:
+                _result_registry = ResultCursorRegistry(
+                    pool,
+                    max_open=settings["max_open_cursors"],
+                    idle_timeout=settings["cursor_idle_timeout"],
+                )
+    return _result_registry
+
+async def _expire_idle_periodically(interval):
+    """Close idle continuation cursors and delete expired exports every ``interval`` seconds.
+
+    A cursor nobody fetches from again would otherwise keep its connection,
+    and the server its half-read result, until the next call reached the
+    registry; an expired export would keep its disk space.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            closed = await get_executor().run_call(get_result_registry().expire_idle)
+        except Exception as e:
+            logger.warning("Failed to close idle cursors: %s", e)
+        else:
+            if closed:
+                logger.info("Closed %d idle cursor(s)", closed)
+        if _export_store is not None:
+            try:
+                removed = await get_executor().run_call(_export_store.expire)
+            except Exception as e:
+                logger.warning("Failed to delete expired exports: %s", e)
+            else:
+                if removed:
+                    logger.info("Deleted %d expired export(s)", removed)
+
+def _page_limits(arguments):
+    """Resolve per-call row/byte limits, capped by the server-wide maximums."""
+    settings = get_result_config()
+    max_rows = min(int(arguments.get("max_rows") or settings["max_rows"]), settings["max_rows"])
+    max_bytes = min(int(arguments.get("max_bytes") or settings["max_bytes"]), settings["max_bytes"])
+    return max(max_rows, 1), max(max_bytes, 1), settings["batch_size"]
+
+@functools.lru_cache(maxsize=None)
+def get_catalog_config():
+    """Get schema catalog settings from environment variables."""
+    return {
+        "ttl": float(os.getenv("MSSQL_SCHEMA_TTL", "300")),
+        "snapshot_path": os.getenv("MSSQL_SCHEMA_SNAPSHOT") or None,
+    }
+
+_catalog = None
+
+def get_catalog():
+    """Return the process-wide schema catalog."""
+    global _catalog
+    if _catalog is None:
+        with _pool_lock:
+            if _catalog is None:
+                _catalog = SchemaCatalog(**get_catalog_config())
+                # Drop cached results for tables whose definition changed
+                _catalog.add_listener(_invalidate_cached_tables)
+    return _catalog
+
+@functools.lru_cache(maxsize=None)
+def get_result_cache_config():
+    """Get result cache settings from environment variables."""
+    return {
+        "max_bytes": int(os.getenv("MSSQL_RESULT_CACHE_BYTES", "0")),
+        "ttl": float(os.getenv("MSSQL_RESULT_CACHE_TTL", "60")),
+    }
+
+_result_cache = None
+
+def get_result_cache():
+    """Return the query result cache, or None when caching is disabled."""
+    global _result_cache
+    if _result_cache is None:
+        settings = get_result_cache_config()
+        if settings["max_bytes"] <= 0:
+            return None
+        with _pool_lock:
+            if _result_cache is None:
+                _result_cache = ResultCache(**settings)
+    return _result_cache
+
+@functools.lru_cache(maxsize=None)
+def get_stats_config():
+    """Get table/column statistics cache settings from environment variables."""
+    return {
+        "max_bytes": int(os.getenv("MSSQL_STATS_CACHE_BYTES", str(4 * 1024 * 1024))),
+        "ttl": float(os.getenv("MSSQL_STATS_TTL", "300")),
+    }
+
+_stats_cache = None
+
+def get_stats_cache():
+    """Return the cache of statistics tool answers (a ResultCache, like query results)."""
+    global _stats_cache
+    if _stats_cache is None:
+        with _pool_lock:
+            if _stats_cache is None:
+                _stats_cache = ResultCache(**get_stats_config())
+    return _stats_cache
+
+@functools.lru_cache(maxsize=None)
+def get_guard_config():
+    """Get cost guard and statement timeout settings from environment variables."""
+    return {
+        "max_rows": int(os.getenv("MSSQL_GUARD_MAX_ROWS", "0")),
+        "max_cost": float(os.getenv("MSSQL_GUARD_MAX_COST", "0")),
+        "add_top": os.getenv("MSSQL_GUARD_ADD_TOP", "true").lower() in ("1", "true", "yes"),
+        "statement_timeout": float(os.getenv("MSSQL_STATEMENT_TIMEOUT", "120")),
+    }
+
+_query_guard = None
+
+def get_query_guard():
+    """Return the estimated-plan cost guard, or None when no threshold is set."""
+    global _query_guard
+    if _query_guard is None:
+        settings = get_guard_config()
+        if not settings["max_rows"] and not settings["max_cost"]:
+            return None
+        with _pool_lock:
+            if _query_guard is None:
+                _query_guard = QueryGuard(settings["max_rows"], settings["max_cost"], settings["add_top"])
+    return _query_guard
+
+def _statement_timeout(arguments=None, limit=None):
+    """Resolve the per-call statement timeout, capped by the server-wide setting (or ``limit``)."""
+    if limit is None:
+        limit = get_guard_config()["statement_timeout"]
+    limit = limit or None
+    requested = (arguments or {}).get("timeout")
+    if requested:
+        return min(float(requested), limit) if limit else float(requested)
+    return limit
+
+@functools.lru_cache(maxsize=None)
+def get_export_config():
+    """Get spill file export settings from environment variables."""
+    return {
+        "directory": os.getenv("MSSQL_EXPORT_DIR") or None,
+        "max_bytes": int(os.getenv("MSSQL_EXPORT_MAX_BYTES", str(1024 * 1024 * 1024))),
+        "max_files": int(os.getenv("MSSQL_EXPORT_MAX_FILES", "20")),
+        "ttl": float(os.getenv("MSSQL_EXPORT_TTL", "3600")),
+        "timeout": float(os.getenv("MSSQL_EXPORT_TIMEOUT", "1800")),
+    }
+
+_export_store = None
+
+def get_export_store():
+    """Return the store of exported spill files, creating its directory on first use."""
+    global _export_store
+    if _export_store is None:
+        settings = dict(get_export_config())
+        del settings["timeout"]
+        with _pool_lock:
+            if _export_store is None:
+                _export_store = ExportStore(**settings)
+    return _export_store
+
+def _invalidate_cached_tables(tables):
+    cache = get_result_cache()
+    if cache is not None:
+        dropped = cache.invalidate_tables(tables)
+        logger.info("Schema change in %s invalidated %d cached results", sorted(tables), dropped)
+    get_stats_cache().invalidate_tables(tables)
+
+async def _fresh_catalog():
+    """Return the schema catalog, refreshing it off-loop if its TTL ran out."""
+    catalog = get_catalog()
+    if catalog.needs_refresh():
+        await get_executor().run(catalog.refresh)
+    return catalog
+
+_aras_itemtypes = None
+
+def _load_aras_itemtypes():
+    """Return the packaged Aras ItemType descriptions as JSON text."""
+    global _aras_itemtypes
+    if _aras_itemtypes is None:
+        path = os.path.join(os.path.dirname(__file__), "aras_itemtypes.json")
+        with open(path, encoding="utf-8") as f:
+            _aras_itemtypes = json.dumps(json.load(f), ensure_ascii=False, separators=(",", ":"))
+    return _aras_itemtypes
+
+def _fetch_rows(conn, query, params=None):
+    """Run a query and return its column names and all rows."""
+    metrics = get_metrics()
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    cursor.execute(*prepare(query, params))
+    executed = time.perf_counter()
+    metrics.observe("execute", executed - started)
+    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+    rows = cursor.fetchall()
+    metrics.observe("fetch", time.perf_counter() - executed)
+    cursor.close()
+    return columns, rows
+
+def _discard_cursor(conn, cursor):
+    """Abandon a partly read result and release its connection."""
+    suspect = not cancel_connection(conn)
+    try:
+        cursor.close()
+    except Exception:
+        pass
+    get_pool().release(conn, suspect=suspect)
+
+def _execute_page(conn, query, params, fmt, max_rows, max_bytes, batch_size, guard=None, cursor_budget=None,
+                  owner=None):
+    """Run a query and read its first page.
+
+    Returns ``((page, token, limit), keep)``; when rows remain the cursor is
+    left open on ``conn`` and registered under ``token`` for ``owner`` (the
+    calling client's session).  ``limit`` is the TOP added by ``guard``, if
+    any.  With a ``cursor_budget`` semaphore a cursor is only kept while it
+    has slots left; otherwise the remaining rows are discarded and
+    ``token`` is None.
+    """
+    metrics = get_metrics()
+    limit = None
+    if guard is not None:
+        started = time.perf_counter()
+        query, limit = guard.review(conn, query, params)
+        metrics.observe("estimate", time.perf_counter() - started)
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    cursor.execute(*prepare(query, params))
+    metrics.observe("execute", time.perf_counter() - started)
+    columns = [desc[0] for desc in cursor.description] if cursor.description else []
+    writer = get_writer(fmt, columns)
+    pending = collections.deque()
+    page = read_page(cursor, writer, max_rows, max_bytes, batch_size, pending)
+    metrics.observe_page(page)
+    if not page.has_more:
+        cursor.close()
+        return (page, None, limit), False
+    if cursor_budget is not None and not cursor_budget.acquire(blocking=False):
+        _discard_cursor(conn, cursor)
+        return (page, None, limit), True
+    token = get_result_registry().register(conn, cursor, writer, pending, page.row_count, owner)
+    return (page, token, limit), True
+
+def _page_contents(page, token, rows_sent):
+    """Render a page plus a continuation note when rows remain."""
+    contents = [TextContent(type="text", text=page.text)]
+    if token:
+        contents.append(TextContent(type="text", text=json.dumps({
+            "cursor": token,
+            "rows_returned": rows_sent,
+            "has_more": True,
+            "next": "Call fetch_more with this cursor to get the next page",
+        })))
+    return contents
+
 # Initialize server
 app = Server("mssql_mcp_server")
 
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     """Aras System List SQL Server tables as resources."""
-    config = get_db_config()
+    new_request_id()
     try:
-        conn = pymssql.connect(**config)
-        cursor = conn.cursor()
-        # Query to get user tables from the current database
-        cursor.execute("""
-            SELECT TABLE_NAME 
-            FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_TYPE = 'BASE TABLE'
-        """)
-        tables = cursor.fetchall()
-        logger.info(f"Found tables: {tables}")
+        catalog = await _fresh_catalog()
+        tables = catalog.tables()
+        logger.debug("Found %d tables", len(tables))
         
         resources = []
         for table in tables:
             resources.append(
                 Resource(
-                    uri=f"mssql://{table[0]}/data",
-                    name=f"Table: {table[0]}",
+                    uri=f"mssql://{table['name']}/data",
+                    name=f"Table: {table['name']}",
                     mimeType="text/plain",
-                    description=f"Data in table: {table[0]}"
+                    description=f"Data in table: {table['schema']}.{table['name']}"
                 )
             )
-        cursor.close()
-        conn.close()
 
         # Add additional string resources for query information
         resources.append(
@@ -90,18 +506,13 @@ async def list_resources() -> list[Resource]:
             )
         )
         
-        # Add detailed schema information as a separate resource
-        # Store the schema as a properly escaped JSON string
-        schema_info = """
-        {"itemtypes":[{"name":"CAD","label":"CAD Document","label_zt":"工程圖","properties":[{"name":"authoring_tool","label":"Authoring Tool","label_zt":"編輯工具","data_type":"list","reference_itemname":"Authoring Tools"},{"name":"authoring_tool_version","label":"Authoring Tool Version","label_zt":"編輯工具版本","data_type":"string","reference_itemname":null},{"name":"bcs_autonumber","label":"Number","label_zt":"正式圖號","data_type":"string","reference_itemname":null},{"name":"bcs_isrestricted","label":"Project Restricted","label_zt":"專案專屬","data_type":"boolean","reference_itemname":null},{"name":"bcs_ref_current_state_label","label":"State","label_zt":"系統狀態","data_type":"foreign","reference_itemname":null},{"name":"classification","label":"Type","label_zt":"工程圖類別","data_type":"string","reference_itemname":null},{"name":"cn_created_name","label":"Agile Creator","label_zt":"Agile建立者","data_type":"string","reference_itemname":null},{"name":"cn_cust","label":"Customer","label_zt":"客戶","data_type":"item","reference_itemname":"Customer"},{"name":"cn_dev_phase","label":"Development Phasent Phase","label_zt":"開發階段","data_type":"list","reference_itemname":"CAD_Development Phase"},{"name":"cn_drawing_version","label":"Drawing Version","label_zt":"圖紙版本","data_type":"string","reference_itemname":null},{"name":"cn_factory","label":"Factory","label_zt":"廠區","data_type":"list","reference_itemname":"Part_Factory"},{"name":"cn_iso","label":"ISO Number","label_zt":"ISO 編號","data_type":"string","reference_itemname":null},{"name":"cn_lifecycle","label":"Lifecycle Phase","label_zt":"Lifecycle Phase","data_type":"list","reference_itemname":"Doc_LifecyclePhase"},{"name":"cn_old_project","label":"Old Project","label_zt":"舊專案代號","data_type":"item","reference_itemname":"Old Project"},{"name":"cn_project_number","label":"Project Number","label_zt":"專案代號","data_type":"foreign","reference_itemname":null},{"name":"cn_revision","label":"Revision","label_zt":"工程圖版本","data_type":"string","reference_itemname":null},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"description","label":"Description","label_zt":"描述","data_type":"text","reference_itemname":null},{"name":"effective_date","label":"Effective Date","label_zt":"生效日期","data_type":"date","reference_itemname":null},{"name":"has_change_pending","label":"Changes","label_zt":"變更中","data_type":"boolean","reference_itemname":null},{"name":"is_standard","label":"Standard","label_zt":"標準件","data_type":"boolean","reference_itemname":null},{"name":"is_template","label":"Template","label_zt":"範本","data_type":"boolean","reference_itemname":null},{"name":"item_number","label":"Document Number","label_zt":"編號","data_type":"string","reference_itemname":null},{"name":"jpc_chkbom_gc","label":"Copy (2) of Check BOM GC-HF Error","label_zt":"檢查BOM是否GC-HF異常","data_type":"boolean","reference_itemname":null},{"name":"jpc_epb_pn","label":"EPB P/N","label_zt":"EPB P/N","data_type":"string","reference_itemname":null},{"name":"jpc_is_out_part","label":"Is outsourcing drawing","label_zt":"此為外購料號圖面","data_type":"boolean","reference_itemname":null},{"name":"jpc_part","label":"Related Part","label_zt":"零組件料號","data_type":"item","reference_itemname":"Part"},{"name":"jpc_part2","label":"Where used part","label_zt":"用於料號(排程更新)","data_type":"text","reference_itemname":null},{"name":"major_rev","label":"Revision","label_zt":"系統版本","data_type":"string","reference_itemname":null},{"name":"managed_by_id","label":"Designated User","label_zt":"管理者","data_type":"item","reference_itemname":"Identity"},{"name":"modified_by_id","label":"Modified By","label_zt":"修改人員","data_type":"item","reference_itemname":"User"},{"name":"modified_on","label":"Last Modified","label_zt":"修改日期","data_type":"date","reference_itemname":null},{"name":"name","label":"Name","label_zt":"名稱","data_type":"string","reference_itemname":null},{"name":"native_file","label":"Native File","label_zt":"原始檔案","data_type":"item","reference_itemname":"File"},{"name":"owned_by_id","label":"Owned By","label_zt":"設計繪圖者","data_type":"item","reference_itemname":"Identity"},{"name":"project","label":"Project","label_zt":"專案","data_type":"item","reference_itemname":"Project"},{"name":"release_date","label":"Release Date","label_zt":"發行日期","data_type":"date","reference_itemname":null},{"name":"state","label":"State","label_zt":"狀態","data_type":"string","reference_itemname":null},{"name":"team_id","label":"Team","label_zt":"團隊","data_type":"item","reference_itemname":"Team"},{"name":"thumbnail","label":"Thumbnail","label_zt":"縮圖","data_type":"image","reference_itemname":null},{"name":"viewable_file","label":"Viewable File","label_zt":"預覧檔案","data_type":"item","reference_itemname":"File"}]},{"name":"Customer","label":"Customer","label_zt":"客戶","properties":[{"name":"contact_name","label":"Contact Name","label_zt":"聯絡人","data_type":"string","reference_itemname":null},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"description","label":"Description","label_zt":"Description","data_type":"string","reference_itemname":null},{"name":"jpc_acc_industry_type","label":"Customer Industry Type","label_zt":"公司行業大類","data_type":"list","reference_itemname":"CompanyIndustryType"},{"name":"jpc_crm_id","label":"CRM_ID","label_zt":"CRM_ID","data_type":"string","reference_itemname":null},{"name":"jpc_erp_id","label":"ERP_ID","label_zt":"ERP_ID","data_type":"string","reference_itemname":null},{"name":"jpc_industry_2type","label":"Industry - type","label_zt":"行業-中分類","data_type":"list","reference_itemname":"jpc_industry_type"},{"name":"jpc_is_keyaccount","label":"KeyAccount","label_zt":"KeyAccount","data_type":"boolean","reference_itemname":null},{"name":"jpc_org_id","label":"ORG_ID","label_zt":"ORG_ID","data_type":"string","reference_itemname":null},{"name":"jpc_record","label":"CRM Record","label_zt":"CRM紀錄者","data_type":"string","reference_itemname":null},{"name":"jpc_source_type","label":"Source Type","label_zt":"公司來源","data_type":"list","reference_itemname":"Customer SourceType"},{"name":"main_phone","label":"Main Phone","label_zt":"電話","data_type":"string","reference_itemname":null},{"name":"managed_by_id","label":"Managed By","label_zt":"管理者","data_type":"item","reference_itemname":"Identity"},{"name":"modified_by_id","label":"Modified By","label_zt":"修改人員","data_type":"item","reference_itemname":"User"},{"name":"modified_on","label":"Modified On","label_zt":"修改日期","data_type":"date","reference_itemname":null},{"name":"name","label":"Name","label_zt":"客戶名稱","data_type":"string","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"擁有者","data_type":"item","reference_itemname":"Identity"},{"name":"sf_acc_id","label":"","label_zt":"sf_acc_id","data_type":"string","reference_itemname":null},{"name":"state","label":"State","label_zt":"狀態","data_type":"string","reference_itemname":null},{"name":"team_id","label":"Team","label_zt":"團隊","data_type":"item","reference_itemname":"Team"},{"name":"web_site","label":"Web Site","label_zt":"Web Site","data_type":"string","reference_itemname":null}]},{"name":"Document","label":"Document-JPC Internal","label_zt":"JPC-內部文件","properties":[{"name":"authoring_tool","label":"Authoring Tool","label_zt":"編輯軟體","data_type":"list","reference_itemname":"Authoring Tools"},{"name":"bcs_autonumber","label":"Number","label_zt":"正式文號","data_type":"string","reference_itemname":null},{"name":"bcs_ref_current_state_label","label":"State","label_zt":"系統狀態","data_type":"foreign","reference_itemname":null},{"name":"classification","label":"Type","label_zt":"文件類別","data_type":"string","reference_itemname":null},{"name":"cn__facility_location","label":"Facility Location","label_zt":"設備-存放地點","data_type":"string","reference_itemname":null},{"name":"cn__facility_mainten_cycle","label":"Facility Mainten Cycle","label_zt":"設備-保養週期","data_type":"list","reference_itemname":"Doc_Facility_Mainten_Cycle"},{"name":"cn__facility_mainten_dept","label":"Facility Mainten Dept","label_zt":"設備-保養單位","data_type":"string","reference_itemname":null},{"name":"cn__facility_mainten_lasttime","label":"Facility Mainten Lasttime","label_zt":"設備-上次保養日期","data_type":"date","reference_itemname":null},{"name":"cn__facility_mainten_nexttime","label":"Facility Mainten Nexttime","label_zt":"設備-下次保養日期","data_type":"date","reference_itemname":null},{"name":"cn__facility_mainten_other","label":"Facility Mainten Cycle Other (day)","label_zt":"其他週期(天)","data_type":"integer","reference_itemname":null},{"name":"cn__facility_model_number","label":"Facility Model Number","label_zt":"設備型號","data_type":"string","reference_itemname":null},{"name":"cn__facility_owner","label":"Facility Owner","label_zt":"生產設備 - 保管人","data_type":"item","reference_itemname":"Identity"},{"name":"cn__facility_owner_name","label":"Owner Name","label_zt":"生產設備 - 舊保管人","data_type":"string","reference_itemname":null},{"name":"cn__facility_type","label":"Facility Type","label_zt":"設備類別","data_type":"list","reference_itemname":"Doc_Facility_Type"},{"name":"cn_assets_number","label":"Assets Number","label_zt":"資產編號","data_type":"string","reference_itemname":null},{"name":"cn_factory","label":"Factory","label_zt":"廠區","data_type":"list","reference_itemname":"OPart_Factory"},{"name":"cn_green_product_expired_date","label":"Green Product Testing Report Expire Date","label_zt":"測試報告到期日期","data_type":"date","reference_itemname":null},{"name":"cn_green_product_expired_year","label":"Green Product Testing Report Vaild Year","label_zt":"測試報告有效年","data_type":"list","reference_itemname":"Doc_GPReportPeriod"},{"name":"cn_green_product_test_date","label":"Green Product Testing Report Date","label_zt":"測試報告日期","data_type":"date","reference_itemname":null},{"name":"cn_green_product_test_number","label":"Green Product TestingReport Number","label_zt":"測試報告編號","data_type":"string","reference_itemname":null},{"name":"cn_green_product_type","label":"Green Product Testing Report Type","label_zt":"測試報告類別","data_type":"list","reference_itemname":"Doc_GPReportCategory"},{"name":"cn_instrument_acquire_date","label":"Instrument Acquire Date","label_zt":"取得日期","data_type":"date","reference_itemname":null},{"name":"cn_instrument_check_cycle","label":"Instrument Check Cycle","label_zt":"校驗週期","data_type":"list","reference_itemname":"Doc_Instrument_Check_Cycle"},{"name":"cn_instrument_check_lasttime","label":"Instrument Check LastTime","label_zt":"上次校驗日期","data_type":"date","reference_itemname":null},{"name":"cn_instrument_check_nexttime","label":"Instrument Check NextTime","label_zt":"下次校驗日期","data_type":"date","reference_itemname":null},{"name":"cn_instrument_correction_type","label":"Instrument Correction Type","label_zt":"校正類別","data_type":"list","reference_itemname":"Doc_Instrument_Correction_Type"},{"name":"cn_instrument_dept","label":"Instrument Department","label_zt":"校驗單位","data_type":"string","reference_itemname":null},{"name":"cn_instrument_number","label":"Instrument Number","label_zt":"儀器編號","data_type":"string","reference_itemname":null},{"name":"cn_instrument_owner","label":"Instrument Owner","label_zt":"儀校-保管人","data_type":"item","reference_itemname":"Identity"},{"name":"cn_instrument_owner_name","label":"Instrument Owner Name","label_zt":"儀校-舊保管人","data_type":"string","reference_itemname":null},{"name":"cn_instrument_specific","label":"Instrument Specific","label_zt":"儀器規格","data_type":"string","reference_itemname":null},{"name":"cn_instrument_type","label":"Instrument Type","label_zt":"儀器類別","data_type":"list","reference_itemname":"Doc_Instrument_Type"},{"name":"cn_instrument_used_dept","label":"Instrument Used Department","label_zt":"儀校-使用單位","data_type":"string","reference_itemname":null},{"name":"cn_iso_doc_type","label":"ISO Doc Type","label_zt":"ISO文件類型","data_type":"list","reference_itemname":"Doc_ISO_Doc_Type"},{"name":"cn_iso_next_dly_date","label":"Next Dly Date","label_zt":"到期日期","data_type":"date","reference_itemname":null},{"name":"cn_iso_number","label":"ISO Number","label_zt":"ISO編號","data_type":"string","reference_itemname":null},{"name":"cn_iso_own_dept","label":"ISO Owned Department","label_zt":"ISO-制定部門","data_type":"string","reference_itemname":null},{"name":"cn_iso_owner","label":"ISO Owner","label_zt":"ISO-制定人","data_type":"item","reference_itemname":"Identity"},{"name":"cn_iso_owner_name","label":"ISO Owner Name","label_zt":"ISO-制定人名稱","data_type":"string","reference_itemname":null},{"name":"cn_iso_system","label":"ISO System","label_zt":"ISO體系","data_type":"list","reference_itemname":"Doc_ISO_System"},{"name":"cn_lifecycle","label":"Lifecycle Phase","label_zt":"Lifecycle Phase","data_type":"list","reference_itemname":"Doc_LifecyclePhase"},{"name":"cn_old_project","label":"Old Project","label_zt":"舊專案代號","data_type":"item","reference_itemname":"Old Project"},{"name":"cn_order_number","label":"Order Number","label_zt":"訂單號碼","data_type":"string","reference_itemname":null},{"name":"cn_owned_by_name","label":"Old Owned Name","label_zt":"Agile 建立者","data_type":"string","reference_itemname":null},{"name":"cn_patent_announce","label":"Announce Type","label_zt":"公告大類","data_type":"list","reference_itemname":"Part_AnnouncementType"},{"name":"cn_patent_announce_date","label":"Patent Announce Date","label_zt":"專利公告日","data_type":"date","reference_itemname":null},{"name":"cn_patent_asset_date","label":"Patent Asset Date","label_zt":"專利申請日","data_type":"date","reference_itemname":null},{"name":"cn_patent_asset_number","label":"Patent Asset Number","label_zt":"專利-申請號","data_type":"string","reference_itemname":null},{"name":"cn_patent_country","label":"Patent Country","label_zt":"專利國家","data_type":"list","reference_itemname":"cn_doc_patent_country"},{"name":"cn_patent_invalidation_date","label":"Patent Invalidation","label_zt":"專利-失效日期","data_type":"date","reference_itemname":null},{"name":"cn_patent_office","label":"Patent Office","label_zt":"專利事務所","data_type":"string","reference_itemname":null},{"name":"cn_patent_office_number","label":"Patent Office Number","label_zt":"專利事務所案號","data_type":"string","reference_itemname":null},{"name":"cn_patent_owner","label":"Patent Owner","label_zt":"專利發明人","data_type":"text","reference_itemname":null},{"name":"cn_patent_preview_file","label":"Patent preview","label_zt":"專利-預覽檔案","data_type":"item","reference_itemname":"File"},{"name":"cn_patent_product_state","label":"Patent Product State","label_zt":"專利-產品階段","data_type":"list","reference_itemname":"cn_doc_patent_part_state"},{"name":"cn_patent_productline","label":"ProductLine","label_zt":"專利-應用領域","data_type":"string","reference_itemname":null},{"name":"cn_patent_register_number","label":"Patent Register Number","label_zt":"註冊號/專利號","data_type":"string","reference_itemname":null},{"name":"cn_patent_state","label":"Patent State","label_zt":"專利狀態","data_type":"list","reference_itemname":"cn_doc_patent_state"},{"name":"cn_patent_type","label":"Patent Type","label_zt":"專利類型","data_type":"list","reference_itemname":"cn_doc_patent_type"},{"name":"cn_product_line","label":"Product Line(s)","label_zt":"Product Line(s)","data_type":"list","reference_itemname":"Doc_Item_Product_Selection_List"},{"name":"cn_revision","label":"Revision","label_zt":"文件版本","data_type":"string","reference_itemname":null},{"name":"cn_sony_doc_owner","label":"Sony Doc Owner","label_zt":"Sony-制定人","data_type":"item","reference_itemname":"Identity"},{"name":"cn_sony_doc_owner_name","label":"Sony Doc Owner","label_zt":"Sony-制定人名稱","data_type":"string","reference_itemname":null},{"name":"cn_sony_doc_owndept","label":"Sony Doc Owner Dept","label_zt":"Sony-制定部門","data_type":"string","reference_itemname":null},{"name":"cn_sony_doctype","label":"Sony Doc Type","label_zt":"Sony-文件類型","data_type":"list","reference_itemname":"Doc_Sony_Doc_Type"},{"name":"cn_vendor","label":"Vendor","label_zt":"供應商","data_type":"item","reference_itemname":"Vendor"},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"customer","label":"Customer","label_zt":"客戶名稱","data_type":"item","reference_itemname":"Customer"},{"name":"description","label":"Description","label_zt":"說明","data_type":"string","reference_itemname":null},{"name":"effective_date_2","label":"Effective Date","label_zt":"生效日期","data_type":"date","reference_itemname":null},{"name":"has_change_pending","label":"Changes","label_zt":"變更中","data_type":"boolean","reference_itemname":null},{"name":"has_files","label":"Files","label_zt":"附加附檔","data_type":"boolean","reference_itemname":null},{"name":"item_number","label":"Document Number","label_zt":"文件編號","data_type":"string","reference_itemname":null},{"name":"jpc_part","label":"Part","label_zt":"零組件料號","data_type":"item","reference_itemname":"Part"},{"name":"major_rev","label":"Revision","label_zt":"系統版本","data_type":"string","reference_itemname":null},{"name":"managed_by_id","label":"Managed By","label_zt":"管理者","data_type":"item","reference_itemname":"Identity"},{"name":"modified_by_id","label":"Modified By","label_zt":"修改人員","data_type":"item","reference_itemname":"User"},{"name":"modified_on","label":"Modified On","label_zt":"修改日期","data_type":"date","reference_itemname":null},{"name":"name","label":"Name","label_zt":"名稱","data_type":"string","reference_itemname":null},{"name":"owned_by_id","label":"Assigned Creator","label_zt":"編輯者","data_type":"item","reference_itemname":"Identity"},{"name":"project","label":"Project","label_zt":"專案","data_type":"item","reference_itemname":"Project"},{"name":"release_date","label":"Effective Date","label_zt":"發行日期","data_type":"date","reference_itemname":null},{"name":"state","label":"State","label_zt":"系統狀態","data_type":"string","reference_itemname":null},{"name":"team_id","label":"Team","label_zt":"團隊","data_type":"item","reference_itemname":"Team"},{"name":"thumbnail","label":"Thumbnail","label_zt":"縮圖","data_type":"image","reference_itemname":null}]},{"name":"ECN","label":"ECN","label_zt":"ECN-工程變更","properties":[{"name":"basis","label":"Basis","label_zt":"Basis","data_type":"list","reference_itemname":"Change Basis"},{"name":"change_reason","label":"Change Reason","label_zt":"變更原因","data_type":"text","reference_itemname":null},{"name":"classification","label":"ECN Type","label_zt":"ECN類別","data_type":"string","reference_itemname":null},{"name":"cn_change_category","label":"Change Category","label_zt":"Change Category","data_type":"list","reference_itemname":"Change Category"},{"name":"cn_change_cost","label":"Estimate Change Total Cost","label_zt":"估計變更總成本","data_type":"text","reference_itemname":null},{"name":"cn_change_suggest","label":"Change Suggest","label_zt":"變更時效建議","data_type":"list","reference_itemname":"Change Suggest"},{"name":"cn_change_suggest_comment","label":"Change Suggest Comment","label_zt":"變更時效補充說明","data_type":"text","reference_itemname":null},{"name":"cn_check","label":"Check","label_zt":"Check","data_type":"item","reference_itemname":"Identity"},{"name":"cn_meterial_stock_solution","label":"Meterial Stock Solution","label_zt":"庫存材料轉用處理方案說明","data_type":"text","reference_itemname":null},{"name":"cn_product_line","label":"Product Line(s)","label_zt":"Product Line(s)","data_type":"mv_list","reference_itemname":null},{"name":"cn_risk_assessment","label":"Risk Assessment","label_zt":"變更風險評估","data_type":"string","reference_itemname":null},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"customer_approval","label":"Customer Approval Required","label_zt":"需客戶確認","data_type":"boolean","reference_itemname":null},{"name":"description","label":"Description","label_zt":"變更內容","data_type":"text","reference_itemname":null},{"name":"effectivity_date","label":"Effectivity Date","label_zt":"生效日期","data_type":"date","reference_itemname":null},{"name":"implementation_plan","label":"Implementation Plan","label_zt":"執行計畫","data_type":"text","reference_itemname":null},{"name":"item_number","label":"ECN Number","label_zt":"ECN編號","data_type":"sequence","reference_itemname":null},{"name":"jpc_assigned_prodline","label":"TP-HF Dept","label_zt":"台北高頻產品部門","data_type":"list","reference_itemname":"JPC_TP_HF_Dept"},{"name":"jpc_ecn_follow","label":"ECN Follow","label_zt":"ECN跟進表","data_type":"string","reference_itemname":null},{"name":"jpc_error_message","label":"","label_zt":"系統錯誤","data_type":"text","reference_itemname":null},{"name":"jpc_file_import","label":"","label_zt":"在製/在途/在庫","data_type":"item","reference_itemname":"File"},{"name":"jpc_islock_ecn_affitem","label":"Lock ECN Affected Item","label_zt":"變更中鎖住 ECN料號","data_type":"boolean","reference_itemname":null},{"name":"jpc_required_file","label":"ECN Required Files","label_zt":"ECN 必要文件","data_type":"mv_list","reference_itemname":null},{"name":"jpc_trans_finished","label":"","label_zt":"是否已拋轉","data_type":"integer","reference_itemname":null},{"name":"major_rev","label":"Revision","label_zt":"版本","data_type":"string","reference_itemname":null},{"name":"managed_by_id","label":"Managed By","label_zt":"管理者","data_type":"item","reference_itemname":"Identity"},{"name":"modified_by_id","label":"Modified By","label_zt":"修改人員","data_type":"item","reference_itemname":"User"},{"name":"modified_on","label":"Modified On","label_zt":"修改日期","data_type":"date","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"提報人員","data_type":"item","reference_itemname":"Identity"},{"name":"priority","label":"Priority","label_zt":"級別","data_type":"list","reference_itemname":"Change Priorities"},{"name":"release_date","label":"Release Date","label_zt":"發行日期","data_type":"date","reference_itemname":null},{"name":"special_instructions","label":"Special Instructions","label_zt":"注意事項","data_type":"text","reference_itemname":null},{"name":"state","label":"Status","label_zt":"狀態","data_type":"string","reference_itemname":null},{"name":"team_id","label":"Team","label_zt":"團隊","data_type":"item","reference_itemname":"Team"},{"name":"title","label":"Title","label_zt":"主題內容","data_type":"string","reference_itemname":null}]},{"name":"ECR","label":"ECR","label_zt":"ECR變更通知單","properties":[{"name":"basis","label":"Basis","label_zt":"Basis","data_type":"list","reference_itemname":"Change Basis"},{"name":"change_type","label":"Change Type","label_zt":"變更類型","data_type":"list","reference_itemname":"Change Types"},{"name":"classification","label":"ECN Initial","label_zt":"ECN發行單位","data_type":"string","reference_itemname":null},{"name":"cn_change_category","label":"Change Category","label_zt":"Change Category","data_type":"list","reference_itemname":"Change Category"},{"name":"cn_change_reason","label":"Reason for Change","label_zt":"變更原因","data_type":"text","reference_itemname":null},{"name":"cn_change_suggest","label":"Change Suggest","label_zt":"變更時效建議","data_type":"list","reference_itemname":"Change Suggest"},{"name":"cn_description","label":"Change Description","label_zt":"變更說明","data_type":"text","reference_itemname":null},{"name":"cn_ecn_creator","label":"ECN Creator","label_zt":"ECN 建單者","data_type":"foreign","reference_itemname":null},{"name":"cn_ecn_info","label":"","label_zt":"ECN總結","data_type":"string","reference_itemname":null},{"name":"cn_ecn_number","label":"ECN Number","label_zt":"ECN編號","data_type":"item","reference_itemname":"ECN"},{"name":"cn_ecn_released_date","label":"ECN Released Date","label_zt":"ECN 結案完成日","data_type":"foreign","reference_itemname":null},{"name":"cn_is_modification","label":"Is Modification","label_zt":"是否需要修模","data_type":"list","reference_itemname":"Yes/No Cost List"},{"name":"cn_is_noti_customer","label":"Is Notification Customer","label_zt":"是否需要通知客人","data_type":"list","reference_itemname":"Yes/No Cost List"},{"name":"cn_is_verification","label":"Is Verification","label_zt":"是否驗證","data_type":"list","reference_itemname":"Yes/No Cost List"},{"name":"cn_product_line","label":"Product Line(s)","label_zt":"Product Line(s)","data_type":"list","reference_itemname":"Product Line"},{"name":"cn_reason_code","label":"Reason Code","label_zt":"申請原因代碼","data_type":"list","reference_itemname":"Reason Code"},{"name":"cn_resqu_user_dept","label":"Request Dept","label_zt":"需求單位","data_type":"foreign","reference_itemname":null},{"name":"cn_risk_assessment","label":"Risk Assessment","label_zt":"變更風險評估","data_type":"string","reference_itemname":null},{"name":"created_by_id","label":"Creator","label_zt":"建立人員","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"ecr_comments","label":"ECR Comments","label_zt":"結論","data_type":"text","reference_itemname":null},{"name":"fast_track","label":"Fast Track","label_zt":"快速變更","data_type":"boolean","reference_itemname":null},{"name":"item_number","label":"ECR Number","label_zt":"ECR 編號","data_type":"sequence","reference_itemname":null},{"name":"jpc_assigned_prodline","label":"TP-HF Dept","label_zt":"台北高頻產品部門","data_type":"list","reference_itemname":"JPC_TP_HF_Dept"},{"name":"jpc_chk_vn_part_result","label":"VN Part Result","label_zt":"VN料號確認結果","data_type":"boolean","reference_itemname":null},{"name":"jpc_message","label":"System Message-Customer Parts","label_zt":"系統通知-客戶料號變更","data_type":"text","reference_itemname":null},{"name":"jpc_message_vn_part","label":"System Noti - VN Part Change","label_zt":"系統通知-VN料號變更","data_type":"text","reference_itemname":null},{"name":"jpc_owner_dept","label":"Owner Dept","label_zt":"發起部門","data_type":"item","reference_itemname":"Identity"},{"name":"jpc_sales_manager","label":"Sales Manager","label_zt":"業務主管","data_type":"item","reference_itemname":"Identity"},{"name":"priority","label":"Priority","label_zt":"優先順序","data_type":"list","reference_itemname":"Change Priorities"},{"name":"release_date","label":"Release Date","label_zt":"ECR發行日期","data_type":"date","reference_itemname":null},{"name":"requested_by","label":"Requested By","label_zt":"需求人員","data_type":"item","reference_itemname":"Identity"},{"name":"source","label":"Source","label_zt":"需求來源","data_type":"list","reference_itemname":"Change Sources"},{"name":"state","label":"Status","label_zt":"狀態","data_type":"string","reference_itemname":null},{"name":"title","label":"Title","label_zt":"標題","data_type":"string","reference_itemname":null}]},{"name":"Express DCO","label":"EN","label_zt":"EN工程通知單","properties":[{"name":"bcs_ref_current_state_label","label":"State","label_zt":"狀態","data_type":"foreign","reference_itemname":null},{"name":"change_reason","label":"Reason for Change","label_zt":"變更原因","data_type":"text","reference_itemname":null},{"name":"classification","label":"Classification","label_zt":"類別","data_type":"string","reference_itemname":null},{"name":"cn_actual_creator","label":"Actual Creator","label_zt":"實際申請者","data_type":"item","reference_itemname":"Identity"},{"name":"cn_change_category","label":"Change Category","label_zt":"Change Category","data_type":"list","reference_itemname":"Change Category"},{"name":"cn_factory","label":"Factory","label_zt":"廠區","data_type":"list","reference_itemname":"Part_Factory"},{"name":"cn_meterial_stock_check","label":"Meterial Stock is not affected","label_zt":"庫存不受影響","data_type":"boolean","reference_itemname":null},{"name":"cn_meterial_stock_solution","label":"Meterial Stock Solution","label_zt":"庫存材料轉用處理方案說明","data_type":"text","reference_itemname":null},{"name":"cn_old_project_number","label":"Old Project","label_zt":"舊專案代號","data_type":"string","reference_itemname":null},{"name":"cn_project_number","label":"Project Number","label_zt":"專案代號","data_type":"foreign","reference_itemname":null},{"name":"cn_rd_dept_head","label":"RD Dept. Head","label_zt":"RD Dept. Head","data_type":"item","reference_itemname":"Identity"},{"name":"cn_reason_code","label":"Reason Code","label_zt":"變更原因代碼","data_type":"list","reference_itemname":"Reason Code"},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"description","label":"Change Description","label_zt":"描述","data_type":"text","reference_itemname":null},{"name":"item_number","label":"Number","label_zt":"EN 編號","data_type":"sequence","reference_itemname":null},{"name":"jpc_hasvnpart","label":"Check VN","label_zt":"檢查VN料號","data_type":"boolean","reference_itemname":null},{"name":"jpc_message_vn_part","label":"Check VN part number","label_zt":"VN料號","data_type":"text","reference_itemname":null},{"name":"jpc_other_factory_noti","label":"Notifty Other Factory","label_zt":"其他廠區通知","data_type":"list","reference_itemname":"Part_Factory"},{"name":"jpc_trans_finished","label":"","label_zt":"是否已拋轉","data_type":"integer","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"發起者","data_type":"item","reference_itemname":"Identity"},{"name":"priority","label":"Priority","label_zt":"緊急程度","data_type":"list","reference_itemname":"Express Change Priorities"},{"name":"project","label":"Project","label_zt":"專案","data_type":"item","reference_itemname":"Project"},{"name":"rd_dept_manager","label":"RD Dept. Manager","label_zt":"RD Dept. Manager","data_type":"item","reference_itemname":"Identity"},{"name":"release_date","label":"Release Date","label_zt":"生效日期","data_type":"date","reference_itemname":null},{"name":"state","label":"Status","label_zt":"表單狀態","data_type":"string","reference_itemname":null},{"name":"title","label":"Title","label_zt":"主旨","data_type":"text","reference_itemname":null}]},{"name":"JPC RFQ","label":"RFQ/S/D","label_zt":"RFQ/S/D","properties":[{"name":"classification","label":"Classification","label_zt":"類別","data_type":"string","reference_itemname":null},{"name":"cn_factory","label":"Factory","label_zt":"負責廠別","data_type":"list","reference_itemname":"Part_Factory"},{"name":"created_by_id","label":"Creator","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Create Date","label_zt":"申請日期","data_type":"date","reference_itemname":null},{"name":"item_number","label":"RFQ/S/D Number","label_zt":"RFQ/S/D 編號","data_type":"string","reference_itemname":null},{"name":"jpc_cad","label":"Report - CAD","label_zt":"工作回報-圖號","data_type":"item","reference_itemname":"CAD"},{"name":"jpc_cost","label":"Report - Cost","label_zt":"工作回報-成本","data_type":"item","reference_itemname":"File"},{"name":"jpc_cost_unit","label":"RFQ-Unit Cost (USD)","label_zt":"RFQ單價成本(USD)","data_type":"float","reference_itemname":null},{"name":"jpc_cust_part","label":"Report-Customer Part","label_zt":"工作回報-客戶料號","data_type":"string","reference_itemname":null},{"name":"jpc_customer","label":"Customer","label_zt":"客戶","data_type":"foreign","reference_itemname":null},{"name":"jpc_epb_part","label":"Report-EPB P/N","label_zt":"工作回報-EPB料號","data_type":"string","reference_itemname":null},{"name":"jpc_expect_date","label":"Expect Finished Date","label_zt":"預計完成日期","data_type":"date","reference_itemname":null},{"name":"jpc_has_file","label":"Has file?","label_zt":"是否有附件","data_type":"boolean","reference_itemname":null},{"name":"jpc_hours","label":"Hours","label_zt":"總工時","data_type":"float","reference_itemname":null},{"name":"jpc_is_action_todo","label":"Is Todo","label_zt":"是否執行","data_type":"boolean","reference_itemname":null},{"name":"jpc_is_purchase","label":"Is outsouring or planning","label_zt":"是否(外購/評估中)不建立料號","data_type":"boolean","reference_itemname":null},{"name":"jpc_part","label":"Report-Part","label_zt":"工作回報-料號","data_type":"item","reference_itemname":"Part"},{"name":"jpc_part_link_cad","label":"Has Part link CAD","label_zt":"是否料號連結圖面","data_type":"boolean","reference_itemname":null},{"name":"jpc_proj_id","label":"Project","label_zt":"專案代號","data_type":"item","reference_itemname":"Project"},{"name":"jpc_proj_state","label":"Is MP?","label_zt":"是否專案量產","data_type":"list","reference_itemname":"RFQSD_Proj_Link"},{"name":"jpc_require_date","label":"*Required Date End","label_zt":"*需求到期日(必填)","data_type":"date","reference_itemname":null},{"name":"jpc_rfq_note","label":"*RFQ Name","label_zt":"*產品料號(必填)","data_type":"string","reference_itemname":null},{"name":"jpc_rfq_note2","label":"*Product Description","label_zt":"*規格描述(必填)","data_type":"string","reference_itemname":null},{"name":"jpc_standard_env","label":"*Standard Enviroment","label_zt":"*環保要求(必填)","data_type":"list","reference_itemname":"Part_StandardEnviroment"},{"name":"jpc_state_label","label":"Form State","label_zt":"表單狀態","data_type":"foreign","reference_itemname":null},{"name":"managed_by_id","label":"Manager","label_zt":"工程主管","data_type":"item","reference_itemname":"Identity"},{"name":"owned_by_id","label":"Owner","label_zt":"負責工程師","data_type":"item","reference_itemname":"Identity"},{"name":"state","label":"State","label_zt":"狀態","data_type":"string","reference_itemname":null}]},{"name":"Part","label":"Part","label_zt":"零組件","properties":[{"name":"bcs_autonumber","label":"Number","label_zt":"正式料號","data_type":"string","reference_itemname":null},{"name":"bcs_ref_current_state_label","label":"State","label_zt":"狀態","data_type":"foreign","reference_itemname":null},{"name":"classification","label":"Classification","label_zt":"料件子類別","data_type":"string","reference_itemname":null},{"name":"cn_announcement_type","label":"Announcement Type","label_zt":"公告大類","data_type":"list","reference_itemname":"Part_AnnouncementType"},{"name":"cn_awg","label":"Awg","label_zt":"AWG(可複選)","data_type":"mv_list","reference_itemname":null},{"name":"cn_cable_be_used","label":"Cable Be Used","label_zt":"用途","data_type":"list","reference_itemname":"Part_Cablebeused"},{"name":"cn_cable_type","label":"Cable Type","label_zt":"Cable Type(可複選)","data_type":"mv_list","reference_itemname":null},{"name":"cn_color","label":"Color","label_zt":"Color","data_type":"list","reference_itemname":"Part_Color"},{"name":"cn_component_type","label":"Component Type","label_zt":"料件類型(製造/外包/虛擬/採購)","data_type":"list","reference_itemname":"Part_ComponentsTypes"},{"name":"cn_factory","label":"Factory","label_zt":"建立廠別","data_type":"list","reference_itemname":"Part_Factory"},{"name":"cn_labor_standard_cost","label":"Labor Standard Cost(USD)","label_zt":"人工標準成本(USD)","data_type":"float","reference_itemname":null},{"name":"cn_lifecycle","label":"Lifecycle Phase","label_zt":"Lifecycle Phase","data_type":"list","reference_itemname":"Part_LifecyclePhase"},{"name":"cn_material_standard_cost","label":"Material Standard Cost(USD)","label_zt":"材料標準成本(USD)","data_type":"float","reference_itemname":null},{"name":"cn_manufacture_standard_cost","label":"Manufacture Standard Cost(USD)","label_zt":"製費標準成本(USD)","data_type":"float","reference_itemname":null},{"name":"cn_old_part_number","label":"Old Part Number","label_zt":"舊料號","data_type":"string","reference_itemname":null},{"name":"cn_old_project_id","label":"Old Project Code","label_zt":"舊專案代號","data_type":"item","reference_itemname":"Old Project"},{"name":"cn_outsourcing_standard_cost","label":"Outsourcing Standard Cost(USD)","label_zt":"外包標準成本(USD)","data_type":"float","reference_itemname":null},{"name":"cn_part_note","label":"Notes","label_zt":"料號備註","data_type":"string","reference_itemname":null},{"name":"cn_product_lines","label":"Product Line(s)","label_zt":"Product Line(s)","data_type":"mv_list","reference_itemname":null},{"name":"cn_revision","label":"Revision","label_zt":"Revision","data_type":"string","reference_itemname":null},{"name":"cn_standard_enviroment","label":"Standard Enviroment","label_zt":"環保標準","data_type":"list","reference_itemname":"Part_StandardEnviroment"},{"name":"cn_supplier","label":"Supplier","label_zt":"外購件供應商","data_type":"item","reference_itemname":"Vendor"},{"name":"cn_supplier_part","label":"Supplier Part Number","label_zt":"供應商料號","data_type":"string","reference_itemname":null},{"name":"cn_weight","label":"Unit Weight","label_zt":"單位重量(g)","data_type":"float","reference_itemname":null},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"has_change_pending","label":"Changes","label_zt":"變更中","data_type":"boolean","reference_itemname":null},{"name":"item_number","label":"Part Number","label_zt":"零組件料號","data_type":"string","reference_itemname":null},{"name":"jpc_bom_released_date","label":"EN/ECN First Add Change Released","label_zt":"EN/ECN 最初申請日(只有新增)","data_type":"date","reference_itemname":null},{"name":"jpc_chkbom_gc","label":"Check BOM GC-HF Error","label_zt":"檢查BOM是否GC-HF異常","data_type":"boolean","reference_itemname":null},{"name":"jpc_first_change_actual_creator","label":"EN/ECN First Actual Creator","label_zt":"EN/ECN 最初實際申請者","data_type":"item","reference_itemname":"Identity"},{"name":"jpc_first_change_date","label":"EN/ECN First Created On","label_zt":"EN/ECN 最初申請日(含變更)","data_type":"date","reference_itemname":null},{"name":"jpc_first_change_owner","label":"EN/ECN First Create Owner","label_zt":"EN/ECN 最初發起者","data_type":"item","reference_itemname":"Identity"},{"name":"jpc_last_change_date","label":"EN/ECN Last Released Date","label_zt":"EN/ECN 最後發行日","data_type":"date","reference_itemname":null},{"name":"jpc_notice_customer","label":"Change Notice","label_zt":"變更通知客戶","data_type":"item","reference_itemname":"NotiChanges"},{"name":"jpc_part_class1","label":"Category 1","label_zt":"產品大類","data_type":"list","reference_itemname":"Part_Class1"},{"name":"jpc_part_class2","label":"Category 2","label_zt":"產品中類","data_type":"list","reference_itemname":"Part_Class2"},{"name":"jpc_part_class3","label":"Category 3","label_zt":"產品小類","data_type":"list","reference_itemname":"Part_Class3"},{"name":"name","label":"Description","label_zt":"品名及規格","data_type":"string","reference_itemname":null},{"name":"name_2","label":"Customer Description","label_zt":"客戶品名描述","data_type":"string","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"擁有者","data_type":"item","reference_itemname":"Identity"},{"name":"project","label":"Project","label_zt":"專案","data_type":"item","reference_itemname":"Project"},{"name":"release_date","label":"Release Date","label_zt":"料號發行日期","data_type":"date","reference_itemname":null},{"name":"unit","label":"Unit","label_zt":"單位","data_type":"list","reference_itemname":"Units"}]},{"name":"Project","label":"Project","label_zt":"專案","properties":[{"name":"auto_create_dco","label":"自動檢查與建立文件EN","label_zt":"自動檢查與建立文件EN","data_type":"boolean","reference_itemname":null},{"name":"bcs_ref_current_state_label","label":"State","label_zt":"狀態","data_type":"foreign","reference_itemname":null},{"name":"cn_currency","label":"Currency","label_zt":"幣別","data_type":"list","reference_itemname":"cn_currency"},{"name":"cn_customer_code","label":"Customer Code","label_zt":"Customer Code","data_type":"string","reference_itemname":null},{"name":"cn_depcode","label":"Dep Code(C、T)","label_zt":"Dep Code(C、T)","data_type":"list","reference_itemname":"cn_project_dep_code"},{"name":"cn_extend_model","label":"Model","label_zt":"原生/衍生機種","data_type":"list","reference_itemname":"cn_project_model"},{"name":"cn_old_proj","label":"Old Project","label_zt":"舊專案代號","data_type":"item","reference_itemname":"Old Project"},{"name":"cn_part","label":"Product Number","label_zt":"成品料號","data_type":"item","reference_itemname":"Part"},{"name":"cn_product_type","label":"Product Type","label_zt":"產品別","data_type":"filter list","reference_itemname":null},{"name":"cn_project_number","label":"Project Number","label_zt":"專案編號","data_type":"string","reference_itemname":null},{"name":"cn_total_pm_maintain_cost","label":"Total Cost","label_zt":"預估總投資費用(原幣)","data_type":"float","reference_itemname":null},{"name":"comments","label":"Comments","label_zt":"備註","data_type":"text","reference_itemname":null},{"name":"created_by_id","label":"Created By","label_zt":"建立者","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"customer","label":"customer","label_zt":"客戶","data_type":"item","reference_itemname":"Customer"},{"name":"date_due_act","label":"Act Finish","label_zt":"實際完成日期","data_type":"date","reference_itemname":null},{"name":"date_due_sched","label":"Sched Due","label_zt":"預計完成時間","data_type":"date","reference_itemname":null},{"name":"date_start_act","label":"Act Start","label_zt":"實際開始日期","data_type":"date","reference_itemname":null},{"name":"date_start_sched","label":"Sched Start","label_zt":"預計起始時間","data_type":"date","reference_itemname":null},{"name":"from_template","label":"From Template","label_zt":"來自範本","data_type":"item","reference_itemname":"Project Template"},{"name":"is_plan_type","label":"","label_zt":"專案表別","data_type":"list","reference_itemname":"IS_PLAN_TYPE"},{"name":"jpc_buyrq_cost","label":"BuyRQ Total Cost NTD","label_zt":"EPB總費用合計NTD","data_type":"string","reference_itemname":null},{"name":"jpc_proj_buy_onreview","label":"APR Cost In Review","label_zt":"APR總費用合計(申請中)","data_type":"string","reference_itemname":null},{"name":"jpc_proj_old","label":"總費用合計2022版","label_zt":"總費用合計2022版","data_type":"string","reference_itemname":null},{"name":"name","label":"Name","label_zt":"專案名稱","data_type":"string","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"專案負責人","data_type":"item","reference_itemname":"Identity"},{"name":"project_number","label":"System Number","label_zt":"系統流水碼","data_type":"integer","reference_itemname":null},{"name":"scheduling_mode","label":"Scheduling Mode","label_zt":"排程規則","data_type":"list","reference_itemname":"PM_scheduling_modes"},{"name":"state","label":"Status","label_zt":"狀態","data_type":"string","reference_itemname":null}]},{"name":"Simple ECO","label":"CA","label_zt":"CA零件承認簽審單","properties":[{"name":"bcs_afterchange","label":"afterChange","label_zt":"變更後描述","data_type":"formatted text","reference_itemname":null},{"name":"bcs_beforechange","label":"beforeChange","label_zt":"變更前描述","data_type":"formatted text","reference_itemname":null},{"name":"bcs_isrestricted","label":"isrestricted","label_zt":"專案專屬","data_type":"boolean","reference_itemname":null},{"name":"bcs_ref_current_state_label","label":"State","label_zt":"狀態","data_type":"foreign","reference_itemname":null},{"name":"change_category","label":"Change Category","label_zt":"變更種類","data_type":"list","reference_itemname":"Change Categories"},{"name":"change_reason","label":"Note","label_zt":"備註","data_type":"text","reference_itemname":null},{"name":"classification","label":"Classification","label_zt":"分類","data_type":"string","reference_itemname":null},{"name":"cn_check","label":"Check","label_zt":"Check","data_type":"item","reference_itemname":"Identity"},{"name":"cn_dept","label":"Creator Dept","label_zt":"製表單位","data_type":"item","reference_itemname":"Identity"},{"name":"cn_error_note","label":"","label_zt":"提示訊息","data_type":"text","reference_itemname":null},{"name":"cn_factory","label":"Factory","label_zt":"廠區","data_type":"list","reference_itemname":"Part_Factory"},{"name":"cn_rd_head","label":"RD Dept. Head","label_zt":"RD Dept. Head","data_type":"item","reference_itemname":"Identity"},{"name":"created_by_id","label":"Creator","label_zt":"建立人員","data_type":"item","reference_itemname":"User"},{"name":"created_on","label":"Created On","label_zt":"建立日期","data_type":"date","reference_itemname":null},{"name":"description","label":"Description","label_zt":"名稱描述","data_type":"text","reference_itemname":null},{"name":"item_number","label":"CA Number","label_zt":"CA編號","data_type":"sequence","reference_itemname":null},{"name":"jpc_trans_finished","label":"","label_zt":"是否已拋轉","data_type":"integer","reference_itemname":null},{"name":"owned_by_id","label":"Owned By","label_zt":"發起者","data_type":"item","reference_itemname":"Identity"},{"name":"rd_dept_manager","label":"RD Dept. Manager","label_zt":"RD Dept. Manager","data_type":"item","reference_itemname":"Identity"},{"name":"release_date","label":"Release Date","label_zt":"發行日期","data_type":"date","reference_itemname":null},{"name":"state","label":"Status","label_zt":"狀態","data_type":"string","reference_itemname":null},{"name":"title","label":"","label_zt":"title","data_type":"text","reference_itemname":null}]}]}
-        """  # Truncated for readability
-        
+        # Aras ItemType/property labels are served on demand by read_resource
         resources.append(
             Resource(
             uri="mssql://schema_info",
             name="Database Schema Information",
             mimeType="application/json",
-            description="Detailed schema information for database tables:"+schema_info,
+            description="Aras ItemTypes with their properties, labels (en/zh-TW), data types and referenced ItemTypes",
             )
         )
         # Add SQL query help resources
@@ -133,44 +544,143 @@ async def list_resources() -> list[Resource]:
             )
         )
 
+        resources.append(
+            Resource(
+                uri="mssql://pool_stats",
+                name="Connection Pool Statistics",
+                mimeType="application/json",
+                description="Connection pool counters (hits, waits, creations, health check failures) and query queue counters"
+            )
+        )
+
+        resources.append(
+            Resource(
+                uri="mssql://metrics",
+                name="Query Metrics",
+                mimeType="application/json",
+                description="Per-phase latency histograms (queue, connect, execute, fetch, serialize), row/byte counters, errors by class and the slowest query shapes"
+            )
+        )
+
+        resources.append(
+            Resource(
+                uri="mssql://cache_stats",
+                name="Result Cache Statistics",
+                mimeType="application/json",
+                description="Query result cache hit/miss, eviction and size counters, and statement template cache counters"
+            )
+        )
+
         return resources
     except Exception as e:
-        logger.error(f"Failed to list resources: {str(e)}")
+        logger.error("Failed to list resources: %s", e)
         return []
 
+@app.list_resource_templates()
+async def list_resource_templates() -> list[ResourceTemplate]:
+    """Aras System List parameterized resources."""
+    return [
+        ResourceTemplate(
+            uriTemplate="mssql://{table}/schema",
+            name="Table Schema",
+            mimeType="application/json",
+            description="Columns, types, primary key and foreign keys of a table"
+        ),
+        ResourceTemplate(
+            uriTemplate="mssql://{table}/data{?columns,limit,current,after}",
+            name="Table Data",
+            mimeType="text/plain",
+            description="Rows of a table in primary key order. Options: columns (comma-separated projection), limit (page size), current=1 (only is_current=1 rows), after (continuation token from the previous page's next URI)"
+        ),
+        ResourceTemplate(
+            uriTemplate="mssql://exports/{handle}{?offset,limit,grep}",
+            name="Exported Result",
+            mimeType="text/plain",
+            description="Rows of a result written to disk by export_sql. Options: offset (first row, 0-based), limit (rows per slice), grep (regular expression; returns matching rows with their row numbers)"
+        ),
+    ]
+
 @app.read_resource()
 async def read_resource(uri: AnyUrl) -> str:
     """Aras System Read table contents."""
-    config = get_db_config()
+    new_request_id()
     uri_str = str(uri)
-    logger.info(f"Reading resource: {uri_str}")
-    
+    logger.info("Reading resource: %s", uri_str)
+    async with _client_slot():
+        return await _read_resource(uri_str)
+
+async def _read_resource(uri_str):
+    """Serve one mssql:// resource."""
     if not uri_str.startswith("mssql://"):
         raise ValueError(f"Invalid URI scheme: {uri_str}")
+
+    if uri_str == "mssql://pool_stats":
+        limiter = get_client_limiter()
+        return json.dumps({
+            "connections": get_pool().stats(),
+            "queries": get_executor().stats(),
+            "clients": limiter.stats() if limiter is not None else {"enabled": False},
+        })
+        
+    if uri_str == "mssql://metrics":
+        snapshot = get_metrics().snapshot()
+        guard = get_query_guard()
+        snapshot["guard"] = guard.stats() if guard is not None else {"enabled": False}
+        if _export_store is not None:
+            snapshot["exports"] = _export_store.stats()
+        return json.dumps(snapshot)
+
+    if uri_str == "mssql://cache_stats":
+        cache = get_result_cache()
+        stats = cache.stats() if cache is not None else {"enabled": False}
+        stats["statement_templates"] = template_cache_info()
+        stats["statistics"] = get_stats_cache().stats()
+        return json.dumps(stats)
+
+    if uri_str == "mssql://schema_info":
+        return _load_aras_itemtypes()
+
+    if uri_str.startswith("mssql://exports/"):
+        return await _read_export(uri_str)
         
     parts = uri_str[8:].split('/')
     table = parts[0]
+
+    if len(parts) > 1 and parts[1] == "schema":
+        catalog = await _fresh_catalog()
+        return json.dumps(catalog.describe(table), ensure_ascii=False)
     
     try:
-        conn = pymssql.connect(**config)
-        cursor = conn.cursor()
-        # Use TOP 100 for MSSQL (equivalent to LIMIT in MySQL)
-        cursor.execute(f"SELECT TOP 100 * FROM {table}")
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        result = [",".join(map(str, row)) for row in rows]
-        cursor.close()
-        conn.close()
-        return "\n".join([",".join(columns)] + result)
+        # Pages are read in primary key order and continued with a keyset seek
+        table, options = parse_data_uri(uri_str)
+        catalog = await _fresh_catalog()
+        settings = get_result_config()
+        limit = min(options.limit or settings["browse_page_size"], settings["max_rows"])
+        sql, params, selected, key = build_query(catalog.describe(table), options, limit)
+        columns, rows = await get_executor().run(_fetch_rows, sql, params, timeout=_statement_timeout())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        started = time.perf_counter()
+        writer = get_writer("csv", columns)
+        text = writer.render(writer.format_rows(rows))
+        get_metrics().observe("serialize", time.perf_counter() - started)
+        if has_more:
+            note = {"rows_returned": len(rows), "has_more": True}
+            if key:
+                last = rows[-1]
+                note["next"] = data_uri(table, options, encode_key(last[selected.index(c)] for c in key))
+            text += "\n\n" + json.dumps(note)
+        return text
                 
     except Exception as e:
-        logger.error(f"Database error reading resource {uri}: {str(e)}")
+        get_metrics().error(e)
+        logger.error("Database error reading resource %s: %s", uri_str, e)
         raise RuntimeError(f"Database error: {str(e)}")
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
     """Aras System List available SQL Server tools."""
-    logger.info("Listing tools...")
+    logger.debug("Listing tools...")
     return [
         Tool(
             name="execute_sql",
@@ -181,6 +691,172 @@ async def list_tools() -> list[Tool]:
                     "query": {
                         "type": "string",
                         "description": "The SQL query to execute"
+                    },
+                    "params": {
+                        "type": ["array", "object"],
+                        "description": "Values bound to '?' placeholders (array) or '@name' placeholders (object) instead of inlining literals, so SQL Server can reuse the query plan"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "Output format: csv (default), jsonl (one JSON object per row) or columnar (JSON with column names and types stated once)"
+                    },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": "Maximum rows to return in this page (capped by the server limit)"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Maximum size of this page in bytes (capped by the server limit)"
+                    },
+                    "cache": {
+                        "type": "boolean",
+                        "description": "Set to false to bypass the result cache for this call"
+                    },
+                    "cache_ttl": {
+                        "type": "number",
+                        "description": "Seconds to keep this result cached (defaults to the server setting)"
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "Cancel the query on the server after this many seconds (capped by the server limit)"
+                    }
+                },
+                "required": ["query"]
+            }
+        ),
+        Tool(
+            name="fetch_more",
+            description="Aras SQL Fetch the next page of a result returned by execute_sql without re-running the query",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cursor": {
+                        "type": "string",
+                        "description": "The cursor returned with the previous page"
+                    },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": "Maximum rows to return in this page (capped by the server limit)"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Maximum size of this page in bytes (capped by the server limit)"
+                    },
+                    "close": {
+                        "type": "boolean",
+                        "description": "Discard the remaining rows instead of fetching them"
+                    }
+                },
+                "required": ["cursor"]
+            }
+        ),
+        Tool(
+            name="execute_sql_batch",
+            description="Aras SQL Execute several independent SELECT queries in one call and return every result (or error) together",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "description": "Queries to run: SQL strings, or objects with query and optional params",
+                        "items": {
+                            "type": ["string", "object"],
+                            "properties": {
+                                "query": {"type": "string"},
+                                "params": {"type": ["array", "object"]}
+                            }
+                        }
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["parallel", "single"],
+                        "description": "parallel (default) runs queries concurrently on pooled connections; single sends them as one batch in one round trip (one statement per query, no caching or continuation cursors, and an error fails the rest of the batch)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "Output format of each result"
+                    },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": "Maximum rows per query result (capped by the server limit)"
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Maximum size of each query result in bytes (capped by the server limit)"
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "Cancel a query on the server after this many seconds (capped by the server limit)"
+                    }
+                },
+                "required": ["queries"]
+            }
+        ),
+        Tool(
+            name="table_stats",
+            description="Aras SQL Approximate row counts and sizes of tables from partition metadata, without scanning them (use instead of COUNT(*))",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tables": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Tables to report (name or schema.name); all tables when omitted"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Report only the largest tables by row count (default 50)"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="column_stats",
+            description="Aras SQL Approximate null fraction, distinct count and most frequent values of columns from the optimizer statistics histograms, without scanning the table (use instead of COUNT/DISTINCT/GROUP BY)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "table": {
+                        "type": "string",
+                        "description": "The table (name or schema.name)"
+                    },
+                    "columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Columns to report; all columns when omitted"
+                    },
+                    "top": {
+                        "type": "integer",
+                        "description": "Number of most frequent values per column (default 10, at most 200)"
+                    }
+                },
+                "required": ["table"]
+            }
+        ),
+        Tool(
+            name="export_sql",
+            description="Aras SQL Run a SELECT whose result is too large to return, write every row to a file on the server, and return a handle; read slices or search it through the mssql://exports/{handle} resource without re-running the query",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "The SQL query to export"
+                    },
+                    "params": {
+                        "type": ["array", "object"],
+                        "description": "Values bound to '?' placeholders (array) or '@name' placeholders (object)"
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(EXPORT_FORMATS),
+                        "description": "File format: csv (default) or jsonl"
+                    },
+                    "timeout": {
+                        "type": "number",
+                        "description": "Cancel the export on the server after this many seconds (capped by the server limit)"
                     }
                 },
                 "required": ["query"]
@@ -188,11 +864,396 @@ async def list_tools() -> list[Tool]:
         )
     ]
 
+async def _fetch_more(arguments):
+    """Return the next page of an open result set."""
+    token = arguments.get("cursor")
+    if not token:
+        raise ValueError("Cursor is required")
+
+    registry = get_result_registry()
+    try:
+        if arguments.get("close"):
+            closed = await get_executor().run_call(registry.close, token)
+            return [TextContent(type="text", text=json.dumps({"cursor": token, "closed": closed}))]
+
+        max_rows, max_bytes, batch_size = _page_limits(arguments)
+        page, rows_sent = await get_executor().run_call(
+            registry.fetch_page, token, max_rows, max_bytes, batch_size,
+            conn=registry.connection_for(token), timeout=_statement_timeout()
+        )
+        get_metrics().observe_page(page)
+        return _page_contents(page, token if page.has_more else None, rows_sent)
+    except Exception as e:
+        get_metrics().error(e)
+        logger.error("Error fetching more rows for cursor %s: %s", token, e)
+        return [TextContent(type="text", text=f"Error fetching rows: {str(e)}")]
+
+def _single_mode_error(query):
+    """Return why ``query`` cannot run in a single-mode batch, or None.
+
+    Result sets are matched to queries by position, so each query must be
+    one statement that returns exactly one result set.
+    """
+    code = " ".join(split_literals(query)[::2]).rstrip("; \t\r\n")
+    if ";" in code:
+        return "Single mode allows one statement per query; split it into separate queries"
+    if _NO_RESULT_SET_RE.search(code):
+        return "Single mode does not allow SELECT ... INTO or variable assignment, which return no result set"
+    return None
+
+def _execute_multi(conn, statements, fmt, max_rows, max_bytes, batch_size, guard=None):
+    """Run several queries as one batch and read one page of each result set.
+
+    ``statements`` is a list of ``(query, params)``.  Returns a list of
+    ``(page, limit)``; rows past a page are discarded since the cursor has
+    to move on to the next result set.
+    """
+    metrics = get_metrics()
+    prepared = []
+    for query, params in statements:
+        limit = None
+        if guard is not None:
+            query, limit = guard.review(conn, query, params)
+        prepared.append((prepare(query.strip().rstrip(";"), params), limit))
+    bound = any(args for (_, args), _ in prepared)
+    # With any arguments bound, pymssql %-formats the whole batch
+    sql = ";\n".join(sql if args or not bound else sql.replace("%", "%%") for (sql, args), _ in prepared)
+    args = tuple(value for (_, values), _ in prepared for value in values or ())
+
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    cursor.execute(sql, args or None)
+    metrics.observe("execute", time.perf_counter() - started)
+    pages = []
+    for i, (_, limit) in enumerate(prepared):
+        if i and not cursor.nextset():
+            raise RuntimeError(f"Query {i} returned no result set")
+        columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        page = read_page(cursor, get_writer(fmt, columns), max_rows, max_bytes, batch_size)
+        metrics.observe_page(page)
+        pages.append((page, limit))
+    if cursor.nextset():
+        # A query ran more than one statement, so the pages are misaligned
+        raise RuntimeError(f"The batch returned more result sets than its {len(prepared)} queries")
+    cursor.close()
+    return pages
+
+@functools.lru_cache(maxsize=None)
+def get_batch_config():
+    """Get execute_sql_batch limits from environment variables."""
+    return {
+        "max_queries": int(os.getenv("MSSQL_BATCH_MAX_QUERIES", "50")),
+        # 0 uses the executor's concurrency limit
+        "concurrency": int(os.getenv("MSSQL_BATCH_CONCURRENCY", "0")),
+    }
+
+def _batch_items(arguments):
+    """Validate the queries of a batch and return them as ``(query, params)``."""
+    items = arguments.get("queries")
+    if not items or not isinstance(items, list):
+        raise ValueError("queries must be a non-empty array")
+    limit = get_batch_config()["max_queries"]
+    if len(items) > limit:
+        raise ValueError(f"A batch may contain at most {limit} queries, got {len(items)}")
+    statements = []
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict) or not item.get("query"):
+            raise ValueError(f"Query {i} is missing its query text")
+        statements.append((item["query"], item.get("params")))
+    return statements
+
+async def _execute_batch(arguments):
+    """Run a list of queries concurrently (or as one batch) and return one JSON document."""
+    statements = _batch_items(arguments)
+    metrics = get_metrics()
+    results = [{"index": i} for i in range(len(statements))]
+    runnable = []
+    single = arguments.get("mode") == "single"
+    for entry, (query, params) in zip(results, statements):
+        error = None
+        if not query.strip().upper().startswith("SELECT"):
+            error = "Only SELECT queries are allowed for security reasons"
+        elif single:
+            error = _single_mode_error(query)
+        if error:
+            entry["error"] = error
+        else:
+            runnable.append((entry, query, params))
+
+    if single and runnable:
+        max_rows, max_bytes, batch_size = _page_limits(arguments)
+        fmt = arguments.get("format") or get_result_config()["format"]
+        started = time.perf_counter()
+        try:
+            pages = await get_executor().run(
+                _execute_multi, [(query, params) for _, query, params in runnable],
+                fmt, max_rows, max_bytes, batch_size, get_query_guard(),
+                timeout=_statement_timeout(arguments)
+            )
+        except Exception as e:
+            metrics.error(e)
+            logger.error("Error executing batch of %d queries: %s", len(runnable), e)
+            for entry, _, _ in runnable:
+                entry["error"] = str(e)
+        else:
+            metrics.record_query(";".join(query for _, query, _ in runnable), time.perf_counter() - started)
+            for (entry, _, _), (page, limit) in zip(runnable, pages):
+                entry["text"] = page.text
+                if page.has_more:
+                    entry.update(rows_returned=page.row_count, truncated=True)
+                if limit is not None:
+                    entry["limited_to"] = limit
+    else:
+        concurrency = get_batch_config()["concurrency"] or get_executor().max_concurrency
+        # A batch never fans out wider than its client may run at once
+        limiter = get_client_limiter()
+        if limiter is not None:
+            concurrency = min(concurrency, limiter.max_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # Cursors past the client's share of the registry would be evicted before they are used
+        cursor_budget = threading.Semaphore(get_result_registry().capacity_for(_current_session()))
+
+        async def run_one(entry, query, params):
+            async with semaphore:
+                try:
+                    contents = await _execute_sql(query, params, arguments, cursor_budget)
+                except Exception as e:
+                    metrics.error(e)
+                    logger.error("Error executing SQL '%s': %s", truncated(query), e)
+                    entry["error"] = str(e)
+                    return
+            entry["text"] = contents[0].text
+            # Continuation cursors and guard notes become fields of the entry
+            for content in contents[1:]:
+                entry.update(json.loads(content.text))
+
+        await asyncio.gather(*(run_one(*item) for item in runnable))
+
+    failed = sum(1 for entry in results if "error" in entry)
+    return [TextContent(type="text", text=json.dumps(
+        {"results": results, "succeeded": len(results) - failed, "failed": failed},
+        ensure_ascii=False,
+    ))]
+
+async def _execute_sql(query, params, arguments, cursor_budget=None):
+    """Run one SELECT and return its contents; errors are raised to the caller.
+
+    ``cursor_budget`` limits how many continuation cursors may be kept (see
+    :func:`_execute_page`); a result over it is reported as truncated.
+    """
+    metrics = get_metrics()
+    started = time.perf_counter()
+
+    # Block non-SELECT queries before they reach the (shared) connection
+    if not query.strip().upper().startswith("SELECT"):
+        raise ValueError("Only SELECT queries are allowed for security reasons")
+
+    if sampled():
+        logger.info("Executing SQL: %s params=%s", truncated(query), truncated(params))
+
+    # Special handling for table listing
+    if not params and _TABLE_LISTING_RE.match(query):
+        columns, rows = await get_executor().run(_fetch_rows, query, timeout=_statement_timeout(arguments))
+        result = ["Tables_in_" + get_db_config()["database"]]  # Header
+        result.extend([table[-1] for table in rows])
+        metrics.record_query(query, time.perf_counter() - started)
+        return [TextContent(type="text", text="\n".join(result))]
+
+    # Regular SELECT queries are streamed page by page
+    max_rows, max_bytes, batch_size = _page_limits(arguments)
+    fmt = arguments.get("format") or get_result_config()["format"]
+    cache = get_result_cache() if arguments.get("cache", True) else None
+    if cache is not None:
+        cache_key = (normalize_query(query), json.dumps(params, sort_keys=True, default=str),
+                     fmt, max_rows, max_bytes)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("Serving query from result cache")
+            metrics.count("cache_hits")
+            return [TextContent(type="text", text=text) for text in cached]
+
+    # Plan estimation and execution share one checkout and one timeout
+    page, token, limit = await get_executor().run_pinned(
+        _execute_page, query, params, fmt, max_rows, max_bytes, batch_size, get_query_guard(), cursor_budget,
+        _current_session(), timeout=_statement_timeout(arguments)
+    )
+    logger.info("Query returned %d rows (%d bytes), more: %s", page.row_count, page.byte_count, page.has_more)
+    logger.debug("Result page: %s", truncated(page.body))
+    contents = _page_contents(page, token, page.row_count)
+    if page.has_more and token is None:
+        contents.append(TextContent(type="text", text=json.dumps({"rows_returned": page.row_count, "truncated": True})))
+    if limit is not None:
+        contents.append(TextContent(type="text", text=json.dumps({
+            "limited_to": limit,
+            "note": "The estimated result was too large, so the query was limited with TOP; add filters to see other rows",
+        })))
+    # Only complete results are cached; a continuation cursor is single-use
+    if cache is not None and not page.has_more:
+        texts = [content.text for content in contents]
+        cache.put(cache_key, texts, sum(len(text.encode("utf-8")) for text in texts),
+                  tables=referenced_tables(query), ttl=arguments.get("cache_ttl"))
+    metrics.record_query(query, time.perf_counter() - started)
+    return contents
+
+async def _table_stats(arguments):
+    """Return approximate row counts and sizes, cached for the statistics TTL."""
+    cache = get_stats_cache()
+    sizes = cache.get("table_sizes")
+    if sizes is None:
+        sizes = await get_executor().run(table_sizes, timeout=_statement_timeout())
+        cache.put("table_sizes", sizes, len(json.dumps(sizes, default=str)))
+    tables = sizes["tables"]
+    if arguments.get("tables"):
+        catalog = await _fresh_catalog()
+        wanted = {f"{t['schema']}.{t['name']}".lower() for t in map(catalog.describe, arguments["tables"])}
+        tables = [table for table in tables if table["table"].lower() in wanted]
+    limit = int(arguments.get("limit") or 50)
+    return [TextContent(type="text", text=json.dumps({
+        "approximate": True,
+        "source": sizes["source"],
+        "tables": tables[:limit],
+        "total_tables": len(tables),
+    }, ensure_ascii=False))]
+
+async def _column_stats(arguments):
+    """Return statistics-histogram summaries of a table's columns, cached per table."""
+    if not arguments.get("table"):
+        raise ValueError("Table is required")
+    catalog = await _fresh_catalog()
+    table = catalog.describe(arguments["table"])
+    top = max(1, min(int(arguments.get("top") or 10), 200))
+    columns = arguments.get("columns") or None
+    cache = get_stats_cache()
+    key = ("column_stats", table["schema"].lower(), table["name"].lower(), tuple(columns or ()), top)
+    result = cache.get(key)
+    if result is None:
+        result = await get_executor().run(column_statistics, table, columns, top, timeout=_statement_timeout())
+        cache.put(key, result, len(json.dumps(result, default=str)), tables=[table["name"]])
+    return [TextContent(type="text", text=json.dumps(
+        dict(result, approximate=True), ensure_ascii=False, default=str
+    ))]
+
+def _export_rows(conn, query, params, fmt, batch_size, guard=None):
+    """Run a query and stream every row to a spill file.
+
+    Returns ``(export, keep)``.  A truncated export leaves rows unread, so
+    its statement is cancelled and the connection released here.
+    """
+    metrics = get_metrics()
+    if guard is not None:
+        started = time.perf_counter()
+        # Exports are meant for large results: only the cost limit applies
+        guard.review(conn, query, params, check_rows=False)
+        metrics.observe("estimate", time.perf_counter() - started)
+    cursor = conn.cursor()
+    started = time.perf_counter()
+    cursor.execute(*prepare(query, params))
+    metrics.observe("execute", time.perf_counter() - started)
+    export = get_export_store().write(cursor, fmt, batch_size)
+    metrics.count("exported_rows", export.rows)
+    metrics.count("exported_bytes", export.bytes)
+    if not export.truncated:
+        cursor.close()
+        return export, False
+    _discard_cursor(conn, cursor)
+    return export, True
+
+async def _export_sql(arguments):
+    """Export a SELECT to a spill file and return its summary and first rows."""
+    query = arguments.get("query")
+    if not query:
+        raise ValueError("Query is required")
+    if not query.strip().upper().startswith("SELECT"):
+        raise ValueError("Only SELECT queries are allowed for security reasons")
+    fmt = arguments.get("format") or "csv"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}. Expected one of: {', '.join(EXPORT_FORMATS)}")
+
+    logger.info("Exporting SQL: %s", truncated(query))
+    started = time.perf_counter()
+    export = await get_executor().run_pinned(
+        _export_rows, query, arguments.get("params"), fmt, get_result_config()["batch_size"], get_query_guard(),
+        timeout=_statement_timeout(arguments, get_export_config()["timeout"])
+    )
+    get_metrics().record_query(query, time.perf_counter() - started)
+    store = get_export_store()
+    preview, _ = await get_executor().run_call(store.read_rows, export.handle, 0, 5)
+    summary = export.summary()
+    summary.update(
+        uri=f"mssql://exports/{export.handle}",
+        preview=export.header() + preview,
+        note="Read rows with ?offset=N&limit=M on the uri, or search them with ?grep=<regex>",
+    )
+    if export.truncated:
+        summary["note"] = (f"The export stopped at the {get_export_config()['max_bytes']:,} byte limit; "
+                           "add filters or fewer columns to export the rest. " + summary["note"])
+    return [TextContent(type="text", text=json.dumps(summary, ensure_ascii=False))]
+
+async def _read_export(uri_str):
+    """Serve a slice of an exported result, or the rows matching ``grep``."""
+    parsed = urllib.parse.urlsplit(uri_str)
+    handle = parsed.path.strip("/")
+    options = {key: values[-1] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+    settings = get_result_config()
+    offset = max(int(options.get("offset") or 0), 0)
+    limit = min(int(options.get("limit") or settings["browse_page_size"]), settings["max_rows"])
+    store = get_export_store()
+    base = f"mssql://exports/{handle}"
+
+    if options.get("grep"):
+        matches, next_offset = await get_executor().run_call(store.search, handle, options["grep"], offset, limit)
+        result = {"matches": [{"row": row, "text": text} for row, text in matches]}
+        if next_offset is not None:
+            result["next"] = base + "?" + urllib.parse.urlencode({"grep": options["grep"], "offset": next_offset, "limit": limit})
+        return json.dumps(result, ensure_ascii=False)
+
+    text, returned = await get_executor().run_call(store.read_rows, handle, offset, limit, settings["max_bytes"])
+    export = store.get(handle)
+    note = {"offset": offset, "rows_returned": returned, "total_rows": export.rows}
+    if offset + returned < export.rows:
+        note["next"] = base + "?" + urllib.parse.urlencode({"offset": offset + returned, "limit": limit})
+    return export.header() + text[:-1] + "\n\n" + json.dumps(note)
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Aras System Execute SQL commands."""
-    config = get_db_config()
-    logger.info(f"Calling tool: {name} with arguments: {arguments}")
+    new_request_id()
+    logger.info("Calling tool: %s", name)
+    logger.debug("Tool arguments: %s", truncated(arguments))
+    try:
+        async with _client_slot():
+            return await _call_tool(name, arguments)
+    except ClientBusyError as e:
+        get_metrics().error(e)
+        logger.warning("Rejected %s: %s", name, e)
+        return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+async def _call_tool(name, arguments):
+    """Dispatch one tool call."""
+    if name == "fetch_more":
+        return await _fetch_more(arguments)
+
+    if name == "execute_sql_batch":
+        return await _execute_batch(arguments)
+
+    if name == "export_sql":
+        try:
+            return await _export_sql(arguments)
+        except Exception as e:
+            get_metrics().error(e)
+            logger.error("Error exporting SQL '%s': %s", truncated(arguments.get("query")), e)
+            return [TextContent(type="text", text=f"Error exporting query: {str(e)}")]
+
+    if name in ("table_stats", "column_stats"):
+        try:
+            return await (_table_stats if name == "table_stats" else _column_stats)(arguments)
+        except Exception as e:
+            get_metrics().error(e)
+            logger.error("Error reading statistics for %s: %s", truncated(arguments), e)
+            return [TextContent(type="text", text=f"Error reading statistics: {str(e)}")]
     
     if name != "execute_sql":
         raise ValueError(f"Unknown tool: {name}")
@@ -202,81 +1263,83 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         raise ValueError("Query is required")
     
     try:
-        conn = pymssql.connect(**config)
-        cursor = conn.cursor()
-        cursor.execute(query)
-        logger.info(f"Executing SQL: {query}")
-        # Special handling for table listing
-        if query.strip().upper().startswith("SELECT") and "INFORMATION_SCHEMA.TABLES" in query.upper():
-            tables = cursor.fetchall()
-            result = ["Tables_in_" + config["database"]]  # Header
-            result.extend([table[0] for table in tables])
-            cursor.close()
-            conn.close()
-            return [TextContent(type="text", text="\n".join(result))]
-        
-        # Regular SELECT queries
-        elif query.strip().upper().startswith("SELECT"):
-            columns = [desc[0] for desc in cursor.description]
-            rows = cursor.fetchall()
-            def safe_str(val):
-                logger.info(val)
-                return str(val).encode('utf-8', errors='ignore').decode('utf-8') if val is not None else ''
-            result = [",".join(map(safe_str, row)) for row in rows]
-            cursor.close()
-            conn.close()
-            logger.info(f"Query result: {result}")
-            return [TextContent(type="text", text="\n".join([",".join(columns)] + result))]
-        
-        # Block non-SELECT queries
-        else:
-            cursor.close()
-            conn.close()
-            raise ValueError("Only SELECT queries are allowed for security reasons")
-                
+        return await _execute_sql(query, arguments.get("params"), arguments)
     except Exception as e:
-        logger.error(f"Error executing SQL '{query}': {e}")
+        get_metrics().error(e)
+        logger.error("Error executing SQL '%s': %s", truncated(query), e)
         return [TextContent(type="text", text=f"Error executing query: {str(e)}")]
 
+async def _serve_stdio():
+    """Serve a single client over stdin/stdout."""
+    from mcp.server.stdio import stdio_server
+
+    async with stdio_server() as (read_stream, write_stream):
+        await app.run(
+            read_stream,
+            write_stream,
+            app.create_initialization_options()
+        )
+
 async def main():
     """Aras System Main entry point to run the MCP server."""
-    from mcp.server.stdio import stdio_server
-    
+    configure_logging()
     logger.info("Starting MSSQL MCP server...")
     try:
         # 驗證資料庫連線，但不要在主線程中引發異常
         config = get_db_config()
-        logger.info(f"Database config: {config['server']}/{config['database']} as {config['user']}")
+        logger.info("Database config: %s/%s as %s", config["server"], config["database"], config["user"])
         
-        # 測試資料庫連線
+        # 測試資料庫連線，同時預先建立連線池的最小連線數
         try:
-            conn = pymssql.connect(**config)
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            conn.close()
+            pool = get_pool()
+            with pool.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+                cursor.close()
+            pool.prefill()
             logger.info("成功連線到資料庫")
         except Exception as db_e:
-            logger.error(f"資料庫連線測試失敗: {str(db_e)}")
+            logger.error("資料庫連線測試失敗: %s", db_e)
             logger.error("伺服器將繼續執行，但資料庫操作可能會失敗")
             # 記錄詳細錯誤信息在標準錯誤輸出
             print(f"資料庫連線測試失敗: {str(db_e)}", file=sys.stderr)
             print(f"請確認資料庫連線設定是否正確", file=sys.stderr)
         
-        async with stdio_server() as (read_stream, write_stream):
-            try:
-                await app.run(
-                    read_stream,
-                    write_stream,
-                    app.create_initialization_options()
-                )
-            except Exception as e:
-                logger.error(f"Server error: {str(e)}", exc_info=True)
-                # 記錄詳細錯誤信息在標準錯誤輸出
-                print(f"MCP 伺服器執行時發生錯誤: {str(e)}", file=sys.stderr)
-                # 不重新拋出異常，讓程式繼續運行
-                # 等待一段時間，以便錯誤訊息被讀取
-                await asyncio.sleep(1)
+        metrics_settings = get_metrics_config()
+        metrics_writer = None
+        if metrics_settings["prometheus_file"]:
+            metrics_writer = asyncio.ensure_future(_write_metrics_periodically(
+                metrics_settings["prometheus_file"], metrics_settings["prometheus_interval"]
+            ))
+
+        idle_timeout = get_result_config()["cursor_idle_timeout"]
+        sweeper = asyncio.ensure_future(_expire_idle_periodically(max(1.0, idle_timeout / 4)))
+
+        # Over HTTP every connected client shares this process's pool and caches
+        transport = get_transport_config()
+        try:
+            if transport["transport"] == "stdio":
+                await _serve_stdio()
+            else:
+                await serve_http(app, transport["transport"], transport["host"], transport["port"])
+        except Exception as e:
+            logger.error("Server error: %s", e, exc_info=True)
+            # 記錄詳細錯誤信息在標準錯誤輸出
+            print(f"MCP 伺服器執行時發生錯誤: {str(e)}", file=sys.stderr)
+            # 不重新拋出異常，讓程式繼續運行
+            # 等待一段時間，以便錯誤訊息被讀取
+            await asyncio.sleep(1)
+        finally:
+            sweeper.cancel()
+            if metrics_writer is not None:
+                metrics_writer.cancel()
+                get_metrics().write_prometheus(metrics_settings["prometheus_file"])
+            get_result_registry().close_all()
+            if _export_store is not None:
+                _export_store.close_all()
+            get_executor().shutdown()
+            get_pool().close()
     except Exception as main_e:
         # 捕獲所有主函數可能遇到的異常
         error_msg = f"主函數執行發生錯誤: {str(main_e)}"
@@ -284,6 +1347,8 @@ async def main():
         print(error_msg, file=sys.stderr)
         # 等待一段時間，以便錯誤訊息被讀取
         await asyncio.sleep(1)
+    finally:
+        shutdown_logging()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Parameterized statements executed through ``sp_executesql``.
+
+pymssql substitutes parameters on the client, so a plain
+``cursor.execute(query, params)`` still sends a fresh ad-hoc batch for every
+distinct value.  Wrapping the statement in ``sp_executesql`` with typed
+parameter declarations lets SQL Server compile one plan per statement shape
+and reuse it.  Rewritten statement templates are cached per shape on the
+client as well.
+"""
+import datetime
+import decimal
+import functools
+import re
+import uuid
+
+# String literals, quoted names and comments: text that is not SQL code
+_LITERAL = r"'(?:[^']|'')*'|\[[^\]]*\]|\"[^\"]*\"|--[^\n]*|/\*.*?\*/"
+_LITERAL_RE = re.compile(f"({_LITERAL})", re.DOTALL)
+_TOKEN_RE = re.compile(f"({_LITERAL}|\\?)", re.DOTALL)
+_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def split_literals(query):
+    """Split ``query`` into alternating code and non-code parts.
+
+    Even indexes are SQL code; odd indexes are string literals, quoted
+    names and comments, kept verbatim.
+    """
+    return _LITERAL_RE.split(query)
+
+
+def sql_type(value):
+    """Return the T-SQL parameter type used to declare ``value``."""
+    # bool must be checked before int
+    if isinstance(value, bool):
+        return "bit"
+    if isinstance(value, int):
+        return "bigint" if -2**63 <= value < 2**63 else "decimal(38,0)"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, decimal.Decimal):
+        exponent = value.as_tuple().exponent
+        scale = -exponent if isinstance(exponent, int) and exponent < 0 else 0
+        # A fixed scale keeps the declaration (and so the plan) stable
+        return f"decimal(38,{max(scale, 10)})" if scale <= 38 else "float"
+    if isinstance(value, datetime.datetime):
+        return "datetime2"
+    if isinstance(value, datetime.date):
+        return "date"
+    if isinstance(value, uuid.UUID):
+        return "uniqueidentifier"
+    if isinstance(value, (bytes, bytearray)):
+        return "varbinary(max)"
+    if isinstance(value, str):
+        return "nvarchar(4000)" if len(value) <= 4000 else "nvarchar(max)"
+    if value is None:
+        return "nvarchar(4000)"
+    raise ValueError(f"Unsupported parameter type: {type(value).__name__}")
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(query, signature, positional):
+    """Build the ``sp_executesql`` call for one statement shape.
+
+    ``signature`` is a tuple of ``(name, sql_type)`` pairs.  Returns the SQL
+    with one ``%s`` placeholder per parameter, in signature order.
+    """
+    statement = query
+    if positional:
+        parts = _TOKEN_RE.split(query)
+        index = 0
+        for i, part in enumerate(parts):
+            if part == "?":
+                index += 1
+                parts[i] = f"@p{index}"
+        if index != len(signature):
+            raise ValueError(f"Query has {index} '?' placeholders but {len(signature)} params were given")
+        statement = "".join(parts)
+    declarations = ", ".join(f"@{name} {type_}" for name, type_ in signature)
+    assignments = ", ".join(f"@{name}=%s" for name, _ in signature)
+    # pymssql %-formats the whole string, so literal percent signs are doubled
+    statement = statement.replace("'", "''").replace("%", "%%")
+    return f"EXEC sp_executesql N'{statement}', N'{declarations}', {assignments}"
+
+
+def prepare(query, params=None):
+    """Return ``(sql, args)`` to pass to ``cursor.execute``.
+
+    ``params`` may be a list bound to ``?`` placeholders or a dict bound to
+    ``@name`` placeholders.  Without params the query is returned unchanged.
+    """
+    if not params:
+        return query, None
+    if isinstance(params, dict):
+        for name in params:
+            if not _NAME_RE.match(name.lstrip("@")):
+                raise ValueError(f"Invalid parameter name: {name}")
+        items = [(name.lstrip("@"), value) for name, value in params.items()]
+        positional = False
+    elif isinstance(params, (list, tuple)):
+        items = [(f"p{i}", value) for i, value in enumerate(params, 1)]
+        positional = True
+    else:
+        raise ValueError("params must be a list or an object")
+    signature = tuple((name, sql_type(value)) for name, value in items)
+    sql = _compile(query, signature, positional)
+    return sql, tuple(value for _, value in items)
+
+
+def template_cache_info():
+    """Return hit/miss counters of the statement template cache."""
+    info = _compile.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
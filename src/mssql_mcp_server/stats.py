@@ -0,0 +1,167 @@
+"""Approximate table and column statistics from SQL Server metadata.
+
+Row counts and sizes come from ``sys.dm_db_partition_stats`` (or
+``sys.partitions`` without VIEW DATABASE STATE), and column distributions
+from the optimizer's statistics histograms via ``sys.dm_db_stats_histogram``
+(or ``DBCC SHOW_STATISTICS`` on servers that lack it).  None of these touch
+the table data, so they answer in milliseconds where ``COUNT(*)`` or
+``SELECT DISTINCT`` would scan; the numbers are as fresh as the last
+statistics update.
+"""
+import logging
+
+from .browse import _quote
+from .statements import prepare
+
+logger = logging.getLogger("mssql_mcp_server.stats")
+
+TABLE_SIZES_QUERY = """
+    SELECT s.name, t.name,
+           SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.row_count ELSE 0 END),
+           SUM(ps.reserved_page_count) * 8,
+           SUM(CASE WHEN ps.index_id IN (0, 1)
+                    THEN ps.in_row_data_page_count + ps.lob_used_page_count + ps.row_overflow_used_page_count
+                    ELSE 0 END) * 8,
+           SUM(CASE WHEN ps.index_id > 1 THEN ps.used_page_count ELSE 0 END) * 8
+    FROM sys.dm_db_partition_stats ps
+    JOIN sys.tables t ON t.object_id = ps.object_id
+    JOIN sys.schemas s ON s.schema_id = t.schema_id
+    GROUP BY s.name, t.name
+"""
+
+# Needs no VIEW DATABASE STATE, but has no sizes
+PARTITION_ROWS_QUERY = """
+    SELECT s.name, t.name, SUM(p.rows), NULL, NULL, NULL
+    FROM sys.partitions p
+    JOIN sys.tables t ON t.object_id = p.object_id
+    JOIN sys.schemas s ON s.schema_id = t.schema_id
+    WHERE p.index_id IN (0, 1)
+    GROUP BY s.name, t.name
+"""
+
+# One row per statistics object led by a column, best-sampled first
+COLUMN_STATS_QUERY = """
+    SELECT c.name, st.stats_id, st.name, sp.rows, sp.rows_sampled, sp.last_updated, sp.modification_counter
+    FROM sys.stats st
+    JOIN sys.stats_columns sc
+      ON sc.object_id = st.object_id AND sc.stats_id = st.stats_id AND sc.stats_column_id = 1
+    JOIN sys.columns c ON c.object_id = sc.object_id AND c.column_id = sc.column_id
+    CROSS APPLY sys.dm_db_stats_properties(st.object_id, st.stats_id) sp
+    WHERE st.object_id = OBJECT_ID(?)
+    ORDER BY c.column_id, sp.rows_sampled DESC
+"""
+
+HISTOGRAM_QUERY = """
+    SELECT range_high_key, equal_rows, range_rows, distinct_range_rows
+    FROM sys.dm_db_stats_histogram(OBJECT_ID(?), ?)
+    ORDER BY step_number
+"""
+
+
+def _rows(conn, query, params=None):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(*prepare(query, params))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _literal(text):
+    return "N'" + text.replace("'", "''") + "'"
+
+
+def table_sizes(conn):
+    """Return approximate row counts and sizes (KB) of every user table."""
+    try:
+        rows = _rows(conn, TABLE_SIZES_QUERY)
+        source = "sys.dm_db_partition_stats"
+    except Exception as e:
+        logger.info("sys.dm_db_partition_stats unavailable (%s), using sys.partitions", e)
+        rows = _rows(conn, PARTITION_ROWS_QUERY)
+        source = "sys.partitions"
+    tables = [
+        {
+            "table": f"{schema}.{name}",
+            "rows": int(row_count or 0),
+            "reserved_kb": reserved,
+            "data_kb": data,
+            "index_kb": index,
+        }
+        for schema, name, row_count, reserved, data, index in rows
+    ]
+    tables.sort(key=lambda table: table["rows"], reverse=True)
+    return {"source": source, "tables": tables}
+
+
+def histogram(conn, qualified_name, stats_id, stats_name):
+    """Return the histogram steps of one statistics object.
+
+    ``qualified_name`` is the bracket-quoted ``[schema].[table]``.  Steps are
+    ``(range_high_key, equal_rows, range_rows, distinct_range_rows)``.
+    """
+    try:
+        return [tuple(row) for row in _rows(conn, HISTOGRAM_QUERY, [qualified_name, stats_id])]
+    except Exception as e:
+        # sys.dm_db_stats_histogram needs SQL Server 2016 SP1 CU2 or later
+        logger.info("sys.dm_db_stats_histogram unavailable (%s), using DBCC SHOW_STATISTICS", e)
+    rows = _rows(conn, f"DBCC SHOW_STATISTICS ({_literal(qualified_name)}, {_literal(stats_name)}) WITH HISTOGRAM")
+    # RANGE_HI_KEY, RANGE_ROWS, EQ_ROWS, DISTINCT_RANGE_ROWS, AVG_RANGE_ROWS
+    return [(key, equal, range_rows, distinct) for key, range_rows, equal, distinct, _ in rows]
+
+
+def summarize_histogram(steps, rows, top=10):
+    """Derive null fraction, distinct count and most frequent values from a histogram."""
+    nulls = sum(step[1] for step in steps if step[0] is None)
+    values = [step for step in steps if step[0] is not None]
+    distinct = len(values) + sum(step[3] for step in values) + (1 if nulls else 0)
+    frequent = sorted(values, key=lambda step: step[1], reverse=True)[:top]
+    return {
+        "null_fraction": round(nulls / rows, 4) if rows else None,
+        "distinct_estimate": int(round(distinct)),
+        "top_values": [
+            {"value": value if isinstance(value, (int, float, str)) else str(value), "rows": int(round(equal))}
+            for value, equal, _, _ in frequent
+            if equal > 0
+        ],
+    }
+
+
+def column_statistics(conn, table, columns=None, top=10):
+    """Return statistics-based summaries for the columns of ``table``.
+
+    ``table`` is catalog metadata.  Columns without a statistics object are
+    reported with ``statistics: null``; none are created.
+    """
+    display_name = f"{table['schema']}.{table['name']}"
+    # Quoted so OBJECT_ID and DBCC resolve names with spaces, dots or brackets
+    qualified_name = f"{_quote(table['schema'])}.{_quote(table['name'])}"
+    wanted = [column["name"] for column in table["columns"]]
+    if columns:
+        by_name = {name.lower(): name for name in wanted}
+        unknown = [name for name in columns if name.lower() not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown column(s) in {display_name}: {', '.join(unknown)}")
+        wanted = [by_name[name.lower()] for name in columns]
+
+    best = {}
+    for column, stats_id, stats_name, rows, sampled, updated, modified in _rows(conn, COLUMN_STATS_QUERY, [qualified_name]):
+        best.setdefault(column, (stats_id, stats_name, rows, sampled, updated, modified))
+
+    result = {}
+    for column in wanted:
+        found = best.get(column)
+        if found is None:
+            result[column] = {"statistics": None}
+            continue
+        stats_id, stats_name, rows, sampled, updated, modified = found
+        summary = {
+            "statistics": stats_name,
+            "rows": rows,
+            "rows_sampled": sampled,
+            "last_updated": updated.isoformat() if hasattr(updated, "isoformat") else updated,
+            "modifications_since_update": modified,
+        }
+        summary.update(summarize_histogram(histogram(conn, qualified_name, stats_id, stats_name), rows, top))
+        result[column] = summary
+    return {"table": display_name, "columns": result}
@@ -0,0 +1,148 @@
+"""Network transports and per-client limits.
+
+Over stdio every MCP client starts its own server process.  The HTTP
+transports (streamable HTTP at ``/mcp``, or SSE at ``/sse`` plus
+``/messages/``) let many clients share one long-lived process, and with it
+one connection pool, schema catalog and result cache.  Each MCP session is
+a client: :class:`ClientLimiter` caps how many of its requests run at once
+so one busy client cannot take every query worker.
+"""
+import asyncio
+import contextlib
+import logging
+import weakref
+
+logger = logging.getLogger("mssql_mcp_server.transport")
+
+TRANSPORTS = ("stdio", "http", "sse")
+
+_LOOPBACK = ("127.0.0.1", "localhost", "::1")
+
+
+class ClientBusyError(RuntimeError):
+    """Raised when a client already has its maximum of requests waiting."""
+
+
+class _ClientState:
+    __slots__ = ("semaphore", "waiting")
+
+    def __init__(self, max_concurrency):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+
+
+class ClientLimiter:
+    """Per-client cap on concurrent requests with a bounded wait queue.
+
+    Clients are keyed by their MCP session object and forgotten when the
+    session is garbage collected.  A ``None`` client (a call made outside
+    any MCP request) is never limited.
+    """
+
+    def __init__(self, max_concurrency=2, max_queue=8):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._clients = weakref.WeakKeyDictionary()
+        self._stats = {"admitted": 0, "waited": 0, "rejected": 0}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, client):
+        """Hold one of ``client``'s request slots for the duration of the block."""
+        if client is None:
+            yield
+            return
+        state = self._clients.get(client)
+        if state is None:
+            state = self._clients[client] = _ClientState(self.max_concurrency)
+        if state.semaphore.locked():
+            if state.waiting >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise ClientBusyError(
+                    f"Too many concurrent requests from this client "
+                    f"({self.max_concurrency} running, {state.waiting} waiting); retry when some have finished"
+                )
+            self._stats["waited"] += 1
+        state.waiting += 1
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.waiting -= 1
+        self._stats["admitted"] += 1
+        try:
+            yield
+        finally:
+            state.semaphore.release()
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats.update(
+            clients=len(self._clients),
+            max_concurrency=self.max_concurrency,
+            max_queue=self.max_queue,
+        )
+        return stats
+
+
+def _security_settings(host):
+    """DNS rebinding protection for loopback binds, as the MCP SDK does by default."""
+    from mcp.server.transport_security import TransportSecuritySettings
+
+    if host not in _LOOPBACK:
+        return None
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=["127.0.0.1:*", "localhost:*", "[::1]:*"],
+        allowed_origins=["http://127.0.0.1:*", "http://localhost:*", "http://[::1]:*"],
+    )
+
+
+def build_http_app(server_app, transport="http", host="127.0.0.1"):
+    """Return a Starlette app serving ``server_app`` over ``http`` or ``sse``."""
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+
+    security = _security_settings(host)
+    if transport == "http":
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+        manager = StreamableHTTPSessionManager(server_app, security_settings=security)
+
+        class _Endpoint:
+            async def __call__(self, scope, receive, send):
+                await manager.handle_request(scope, receive, send)
+
+        return Starlette(
+            routes=[Route("/mcp", endpoint=_Endpoint())],
+            lifespan=lambda _: manager.run(),
+        )
+    if transport == "sse":
+        from mcp.server.sse import SseServerTransport
+
+        sse = SseServerTransport("/messages/", security_settings=security)
+
+        async def handle_sse(request):
+            async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+                await server_app.run(read_stream, write_stream, server_app.create_initialization_options())
+            return Response()
+
+        return Starlette(routes=[
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ])
+    raise ValueError(f"Unknown transport: {transport} (expected one of {', '.join(TRANSPORTS)})")
+
+
+async def serve_http(server_app, transport="http", host="127.0.0.1", port=8000):
+    """Serve ``server_app`` over HTTP until the process is stopped."""
+    import uvicorn
+
+    if host not in _LOOPBACK:
+        logger.warning("Listening on %s: the MCP endpoint has no authentication, keep it off untrusted networks", host)
+    starlette_app = build_http_app(server_app, transport, host)
+    # log_config=None keeps uvicorn from replacing our logging setup
+    config = uvicorn.Config(starlette_app, host=host, port=port, log_config=None, lifespan="on")
+    logger.info("Serving MCP over %s on %s:%d", transport, host, port)
+    await uvicorn.Server(config).serve()
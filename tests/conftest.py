@@ -1,6 +1,7 @@
 # tests/conftest.py
 import pytest
 import os
+import threading
 import pymssql
 
 @pytest.fixture(scope="session")
@@ -42,4 +43,170 @@ def mssql_cursor(mssql_connection):
     """Create a test cursor."""
     cursor = mssql_connection.cursor()
     yield cursor
-    cursor.close()
\ No newline at end of file
+    cursor.close()
+
+class FakeOperationalError(Exception):
+    """Error raised by the fake driver for broken sessions."""
+
+
+class FakeCursor:
+    """Minimal DB-API cursor backed by canned results from FakeDriver."""
+
+    def __init__(self, conn):
+        self.connection = conn
+        self.description = None
+        self._rows = []
+        self._pos = 0
+        self._sets = []
+
+    def execute(self, query, params=None):
+        driver = self.connection.driver
+        if self.connection.broken or self.connection.closed:
+            raise FakeOperationalError("connection is broken")
+        driver.executed.append((query, params))
+        if query.startswith("SET SHOWPLAN_XML"):
+            self.connection.showplan = query.endswith("ON")
+            self.description = None
+            self._rows = []
+            return
+        if self.connection.showplan:
+            columns, rows = ["plan"], [(driver.plan_for(query),)]
+        else:
+            if driver.latency and self.connection.cancel_event.wait(driver.latency):
+                self.connection.cancel_event.clear()
+                raise FakeOperationalError("statement cancelled")
+            # Statements joined with ";\n" produce one result set each
+            self._sets = [driver.respond(part, params) for part in query.split(";\n")]
+            columns, rows = self._sets.pop(0)
+        self._load(columns, rows)
+
+    def _load(self, columns, rows):
+        self.description = [(name, 1, None, None, None, None, None) for name in columns] if columns else None
+        self._rows = list(rows)
+        self._pos = 0
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def fetchmany(self, size=1):
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self):
+        return self.fetchmany(len(self._rows) - self._pos)
+
+    def nextset(self):
+        if not self._sets:
+            return None
+        self._load(*self._sets.pop(0))
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, driver, kwargs):
+        self.driver = driver
+        self.kwargs = kwargs
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+        self.showplan = False
+        self.cancels = 0
+        self.cancel_event = threading.Event()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if self.broken:
+            raise FakeOperationalError("connection is broken")
+        self.rollbacks += 1
+
+    def cancel(self):
+        self.cancels += 1
+        self.cancel_event.set()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    """In-process stand-in for ``pymssql``: ``connect`` and canned results.
+
+    ``results`` maps a substring of the query text to ``(columns, rows)``;
+    the first matching entry wins.  ``plans`` does the same for the XML
+    returned under ``SET SHOWPLAN_XML ON``.  ``latency`` delays every
+    statement; ``cancel()`` on the connection interrupts it.
+    """
+
+    def __init__(self):
+        self.connections = []
+        self.executed = []
+        self.results = {}
+        self.plans = {}
+        self.latency = 0.0
+
+    def connect(self, **kwargs):
+        conn = FakeConnection(self, kwargs)
+        self.connections.append(conn)
+        return conn
+
+    def respond(self, query, params):
+        for fragment, result in self.results.items():
+            if fragment in query:
+                return result
+        return (["value"], [(1,)])
+
+    def plan_for(self, query):
+        for fragment, plan in self.plans.items():
+            if fragment in query:
+                return plan
+        return showplan_xml(rows=1, cost=0.01)
+
+
+def showplan_xml(rows, cost):
+    """A minimal estimated plan document as returned by SHOWPLAN_XML."""
+    return (
+        '<ShowPlanXML xmlns="http://schemas.microsoft.com/sqlserver/2004/07/showplan" Version="1.539">'
+        '<BatchSequence><Batch><Statements>'
+        f'<StmtSimple StatementText="SELECT" StatementType="SELECT" StatementEstRows="{rows}" '
+        f'StatementSubTreeCost="{cost}"><QueryPlan><RelOp NodeId="0" PhysicalOp="Nested Loops" '
+        f'EstimateRows="{rows}" EstimatedTotalSubtreeCost="{cost}"/></QueryPlan></StmtSimple>'
+        '</Statements></Batch></BatchSequence></ShowPlanXML>'
+    )
+
+
+@pytest.fixture
+def fake_driver():
+    """A fresh fake DB-API driver."""
+    return FakeDriver()
+
+
+@pytest.fixture
+def fake_pool(fake_driver, monkeypatch):
+    """Install a connection pool and query executor backed by the fake driver."""
+    from mssql_mcp_server import server
+    from mssql_mcp_server.executor import QueryExecutor
+    from mssql_mcp_server.metrics import Metrics
+    from mssql_mcp_server.pool import ConnectionPool
+    from mssql_mcp_server.results import ResultCursorRegistry
+
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=4)
+    metrics = Metrics()
+    executor = QueryExecutor(pool, max_concurrency=4, max_queue=8, metrics=metrics)
+    registry = ResultCursorRegistry(pool, max_open=2)
+    monkeypatch.setattr(server, "_metrics", metrics)
+    monkeypatch.setattr(server, "_pool", pool)
+    monkeypatch.setattr(server, "_executor", executor)
+    monkeypatch.setattr(server, "_result_registry", registry)
+    yield pool
+    registry.close_all()
+    executor.shutdown()
+    pool.close()
@@ -0,0 +1,117 @@
+import json
+import time
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.server import call_tool
+
+def _results(contents):
+    assert len(contents) == 1
+    return json.loads(contents[0].text)
+
+@pytest.mark.asyncio
+async def test_batch_returns_results_and_errors(fake_pool, fake_driver):
+    """Test that each query gets its own result or error in one response."""
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,)])
+    fake_driver.results["FROM CAD"] = (["name"], [("c",)])
+    result = _results(await call_tool("execute_sql_batch", {"queries": [
+        "SELECT id FROM PART",
+        {"query": "SELECT name FROM CAD WHERE id = ?", "params": ["x"]},
+        "DELETE FROM PART",
+    ]}))
+    entries = result["results"]
+    assert entries[0] == {"index": 0, "text": "id\n1\n2"}
+    assert entries[1] == {"index": 1, "text": "name\nc"}
+    assert "Only SELECT" in entries[2]["error"]
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+
+@pytest.mark.asyncio
+async def test_batch_runs_concurrently(fake_pool, fake_driver):
+    """Test that queries overlap across pooled connections."""
+    fake_driver.latency = 0.1
+    start = time.monotonic()
+    result = _results(await call_tool("execute_sql_batch", {"queries": ["SELECT 1"] * 4}))
+    assert time.monotonic() - start < 0.3
+    assert result["succeeded"] == 4
+    assert len(fake_driver.connections) == 4
+
+@pytest.mark.asyncio
+async def test_batch_keeps_continuation_cursors(fake_pool, fake_driver):
+    """Test that a large result in parallel mode carries a cursor for fetch_more."""
+    fake_driver.results["FROM PART"] = (["id"], [(i,) for i in range(5)])
+    entry = _results(await call_tool("execute_sql_batch", {"queries": ["SELECT id FROM PART"], "max_rows": 2}))["results"][0]
+    assert entry["has_more"] and entry["cursor"]
+    page = await call_tool("fetch_more", {"cursor": entry["cursor"]})
+    assert page[0].text == "id\n2\n3\n4"
+
+@pytest.mark.asyncio
+async def test_batch_cursors_stay_within_registry_capacity(fake_pool, fake_driver):
+    """Test that results past the open cursor limit are truncated rather than given dead cursors."""
+    fake_driver.results["FROM PART"] = (["id"], [(i,) for i in range(5)])
+    result = _results(await call_tool("execute_sql_batch", {"queries": ["SELECT id FROM PART"] * 4, "max_rows": 1}))
+    entries = result["results"]
+    with_cursor = [entry for entry in entries if "cursor" in entry]
+    assert len(with_cursor) == 2
+    for entry in entries:
+        if "cursor" not in entry:
+            assert entry == {"index": entry["index"], "text": "id\n0", "rows_returned": 1, "truncated": True}
+    for entry in with_cursor:
+        page = await call_tool("fetch_more", {"cursor": entry["cursor"]})
+        assert page[0].text == "id\n1\n2\n3\n4"
+    assert fake_pool.stats()["in_use"] == 0
+
+@pytest.mark.asyncio
+async def test_single_round_trip_mode(fake_pool, fake_driver):
+    """Test that single mode sends one batch and reads each result set in turn."""
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,), (3,)])
+    fake_driver.results["FROM CAD"] = (["name"], [("c",)])
+    result = _results(await call_tool("execute_sql_batch", {
+        "mode": "single",
+        "max_rows": 2,
+        "queries": ["SELECT id FROM PART;", {"query": "SELECT name FROM CAD WHERE name LIKE '%c' AND id = ?", "params": [7]}],
+    }))
+    assert len(fake_driver.executed) == 1
+    sql, args = fake_driver.executed[0]
+    assert sql.startswith("SELECT id FROM PART;\nEXEC sp_executesql")
+    assert "%%c" in sql
+    assert args == (7,)
+    first, second = result["results"]
+    assert first == {"index": 0, "text": "id\n1\n2", "rows_returned": 2, "truncated": True}
+    assert second == {"index": 1, "text": "name\nc"}
+
+@pytest.mark.asyncio
+async def test_single_mode_keeps_results_aligned(fake_pool, fake_driver):
+    """Test that queries returning other than one result set cannot shift later answers."""
+    fake_driver.results["FROM PART"] = (["part"], [("p",)])
+    fake_driver.results["FROM DOC"] = (["doc"], [("d",)])
+    fake_driver.results["FROM CAD"] = (["cad"], [("c",)])
+    result = _results(await call_tool("execute_sql_batch", {
+        "mode": "single",
+        "queries": [
+            "SELECT part FROM PART;\nSELECT doc FROM DOC",
+            "SELECT * INTO #parts FROM PART",
+            "SELECT @count = COUNT(*) FROM PART",
+            "SELECT cad FROM CAD WHERE note = 'a; b' -- into;",
+        ],
+    }))
+    assert "one statement" in result["results"][0]["error"]
+    assert "INTO" in result["results"][1]["error"]
+    assert "variable assignment" in result["results"][2]["error"]
+    assert result["results"][3] == {"index": 3, "text": "cad\nc"}
+    assert [query for query, _ in fake_driver.executed] == ["SELECT cad FROM CAD WHERE note = 'a; b' -- into"]
+
+    # Two statements without a separating semicolon are only found by their extra result set
+    fake_driver.executed.clear()
+    result = _results(await call_tool("execute_sql_batch", {
+        "mode": "single",
+        "queries": ["SELECT part FROM PART -- first;\nSELECT doc FROM DOC", "SELECT cad FROM CAD"],
+    }))
+    assert [entry["error"] for entry in result["results"]] == ["The batch returned more result sets than its 2 queries"] * 2
+    assert result["succeeded"] == 0
+
+@pytest.mark.asyncio
+async def test_batch_size_limit(fake_pool, monkeypatch):
+    """Test that oversized batches are refused up front."""
+    monkeypatch.setattr(server, "get_batch_config", lambda: {"max_queries": 2, "concurrency": 0})
+    with pytest.raises(ValueError, match="at most 2"):
+        await call_tool("execute_sql_batch", {"queries": ["SELECT 1"] * 3})
@@ -0,0 +1,121 @@
+import datetime
+import json
+import time
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.browse import BrowseOptions, build_query, decode_key, encode_key, parse_data_uri
+from mssql_mcp_server.catalog import SchemaCatalog
+from mssql_mcp_server.server import read_resource
+
+PART = {
+    "schema": "innovator",
+    "name": "PART",
+    "columns": [
+        {"name": "id", "type": "char(32)", "nullable": False},
+        {"name": "item_number", "type": "nvarchar(64)", "nullable": True},
+        {"name": "is_current", "type": "char(1)", "nullable": True},
+    ],
+    "primary_key": ["id"],
+    "foreign_keys": [],
+}
+
+LINE = {
+    "schema": "innovator",
+    "name": "LINE",
+    "columns": [
+        {"name": "order_id", "type": "int", "nullable": False},
+        {"name": "line_no", "type": "int", "nullable": False},
+        {"name": "qty", "type": "int", "nullable": True},
+    ],
+    "primary_key": ["order_id", "line_no"],
+    "foreign_keys": [],
+}
+
+def test_parse_data_uri():
+    """Test that projection, page size, filter and token are read from the URI."""
+    table, options = parse_data_uri("mssql://PART/data?columns=id,%20item_number&limit=20&current=1&after=abc")
+    assert table == "PART"
+    assert options.columns == ["id", "item_number"]
+    assert options.limit == 20
+    assert options.current
+    assert options.after == "abc"
+    table, options = parse_data_uri("mssql://innovator.PART/data")
+    assert table == "innovator.PART"
+    assert options.columns is None and options.limit is None and not options.current
+    with pytest.raises(ValueError):
+        parse_data_uri("mssql://PART/data?limit=0")
+
+def test_first_page_query():
+    """Test that the first page is projected, filtered and ordered by the key."""
+    sql, params, selected, key = build_query(PART, BrowseOptions(columns=["ITEM_NUMBER"], current=True), 50)
+    assert sql == ("SELECT TOP 51 [item_number], [id] FROM [innovator].[PART]"
+                   " WHERE [is_current] = 1 ORDER BY [id]")
+    assert params == []
+    assert selected == ["item_number", "id"]
+    assert key == ["id"]
+
+def test_keyset_continuation_query():
+    """Test that a continuation seeks past the last key instead of using OFFSET."""
+    token = encode_key(["ABC"])
+    sql, params, _, _ = build_query(PART, BrowseOptions(after=token), 10)
+    assert "WHERE [id] > CAST(? AS char(32)) ORDER BY [id]" in sql
+    assert "OFFSET" not in sql
+    assert params == ["ABC"]
+
+    sql, params, _, _ = build_query(LINE, BrowseOptions(after=encode_key([7, 3])), 10)
+    assert ("WHERE (([order_id] > CAST(? AS int)) OR "
+            "([order_id] = CAST(? AS int) AND [line_no] > CAST(? AS int)))") in sql
+    assert params == [7, 7, 3]
+
+def test_datetime_key_continuation():
+    """Test that datetime keys keep their fraction and bind through datetime2."""
+    events = {
+        "schema": "innovator",
+        "name": "EVENT",
+        "columns": [{"name": "logged_on", "type": "datetime", "nullable": False}],
+        "primary_key": ["logged_on"],
+        "foreign_keys": [],
+    }
+    token = encode_key([datetime.datetime(2024, 5, 1, 8, 30, 0, 123000)])
+    sql, params, _, _ = build_query(events, BrowseOptions(after=token), 10)
+    assert "WHERE [logged_on] > CAST(CAST(? AS datetime2) AS datetime)" in sql
+    assert params == ["2024-05-01T08:30:00.123000"]
+
+def test_invalid_options():
+    """Test that unknown columns, missing is_current and bad tokens are rejected."""
+    with pytest.raises(ValueError, match="Unknown column"):
+        build_query(PART, BrowseOptions(columns=["nope"]), 10)
+    with pytest.raises(ValueError, match="is_current"):
+        build_query(LINE, BrowseOptions(current=True), 10)
+    with pytest.raises(ValueError, match="continuation token"):
+        decode_key(encode_key([1]), 2)
+    with pytest.raises(ValueError, match="continuation token"):
+        decode_key("!!!", 1)
+
+@pytest.mark.asyncio
+async def test_read_resource_walks_pages(fake_pool, fake_driver, monkeypatch):
+    """Test that following the next URI returns the following page."""
+    catalog = SchemaCatalog(ttl=3600)
+    catalog._install({"innovator.PART": PART}, None)
+    catalog._checked_at = time.monotonic()
+    monkeypatch.setattr(server, "_catalog", catalog)
+    fake_driver.results["[id] > CAST"] = (["item_number", "id"], [("P-3", "c")])
+    fake_driver.results["FROM [innovator].[PART]"] = (
+        ["item_number", "id"], [("P-1", "a"), ("P-2", "b"), ("P-3", "c")]
+    )
+
+    text = await read_resource("mssql://PART/data?columns=item_number&limit=2")
+    body, note = text.split("\n\n")
+    assert body == "item_number,id\nP-1,a\nP-2,b"
+    note = json.loads(note)
+    assert note["rows_returned"] == 2
+    table, options = parse_data_uri(note["next"])
+    assert options.columns == ["item_number"] and options.limit == 2
+    assert decode_key(options.after, 1) == ["b"]
+
+    text = await read_resource(note["next"])
+    assert text == "item_number,id\nP-3,c"
+    query, params = fake_driver.executed[-1]
+    assert "sp_executesql" in query
+    assert params == ("b",)
@@ -0,0 +1,86 @@
+import json
+import time
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.cache import ResultCache, normalize_query, referenced_tables
+from mssql_mcp_server.server import call_tool, read_resource
+
+def test_normalize_query_keeps_literals():
+    """Test that whitespace and case are folded outside string literals only."""
+    a = normalize_query("select  *\n from innovator.PART where item_number = 'ab  C';")
+    b = normalize_query("SELECT * FROM innovator.part WHERE item_number = 'ab  C'")
+    assert a == b
+    assert normalize_query("SELECT 1 WHERE x = 'abc'") != normalize_query("SELECT 1 WHERE x = 'ABC'")
+
+def test_normalize_query_skips_comments():
+    """Test that an apostrophe in a comment does not expose literals to case folding."""
+    a = normalize_query("SELECT 1 -- don't\nFROM t WHERE name='abc'")
+    b = normalize_query("SELECT 1 -- don't\nFROM t WHERE name='ABC'")
+    assert a != b
+    assert a.endswith("FROM T WHERE NAME='abc'")
+    assert normalize_query("SELECT 1 /* it's */ FROM t WHERE name='abc'").endswith("NAME='abc'")
+
+def test_referenced_tables():
+    """Test that tables are extracted from FROM and JOIN clauses."""
+    query = "SELECT * FROM innovator.[PART] p JOIN innovator.CAD c ON c.part = p.id"
+    assert referenced_tables(query) == {"part", "cad"}
+
+def test_lru_eviction_by_bytes():
+    """Test that the least recently used entries are evicted to stay in budget."""
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", "A", 4)
+    cache.put("b", "B", 4)
+    assert cache.get("a") == "A"
+    cache.put("c", "C", 4)
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.stats()["evictions"] == 1
+    assert not cache.put("huge", "H", 11)
+
+def test_entry_ttl():
+    """Test that entries expire after their own TTL."""
+    cache = ResultCache(max_bytes=100, ttl=60)
+    cache.put("short", 1, 1, ttl=0.01)
+    cache.put("long", 2, 1)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.stats()["expirations"] == 1
+
+def test_invalidate_tables():
+    """Test that invalidating a table drops only entries reading it."""
+    cache = ResultCache(max_bytes=100)
+    cache.put("q1", 1, 1, tables={"part"})
+    cache.put("q2", 2, 1, tables={"part", "cad"})
+    cache.put("q3", 3, 1, tables={"document"})
+    assert cache.invalidate_tables(["PART"]) == 2
+    assert cache.get("q3") == 3
+    assert cache.stats()["entries"] == 1
+
+@pytest.mark.asyncio
+async def test_call_tool_uses_cache(fake_pool, fake_driver, monkeypatch):
+    """Test that repeated SELECTs are served from the cache unless bypassed."""
+    monkeypatch.setattr(server, "_result_cache", ResultCache(max_bytes=10_000))
+    fake_driver.results["FROM innovator.PART"] = (["item_number"], [("P-1",)])
+    query = "SELECT item_number FROM innovator.PART WHERE is_current=1"
+    first = await call_tool("execute_sql", {"query": query})
+    second = await call_tool("execute_sql", {"query": query.lower().replace("part", "PART")})
+    assert first[0].text == second[0].text
+    assert len(fake_driver.executed) == 1
+
+    await call_tool("execute_sql", {"query": query, "cache": False})
+    assert len(fake_driver.executed) == 2
+
+    stats = json.loads(await read_resource("mssql://cache_stats"))
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+@pytest.mark.asyncio
+async def test_cache_stats_when_disabled(monkeypatch):
+    """Test that the stats resource reports a disabled cache."""
+    monkeypatch.setattr(server, "_result_cache", None)
+    monkeypatch.delenv("MSSQL_RESULT_CACHE_BYTES", raising=False)
+    stats = json.loads(await read_resource("mssql://cache_stats"))
+    assert stats["enabled"] is False
+    assert "statement_templates" in stats
@@ -0,0 +1,99 @@
+import datetime
+import json
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.catalog import SchemaCatalog, UnknownTableError
+from mssql_mcp_server.server import list_resources, read_resource
+
+def _install_schema(fake_driver, modified=datetime.datetime(2024, 1, 1)):
+    fake_driver.results.update({
+        "sys.objects": (["count", "modified"], [(3, modified)]),
+        "c.COLUMN_NAME": ([], [
+            ("innovator", "PART", "id", "char", 32, None, None, "NO"),
+            ("innovator", "PART", "cost", "decimal", None, 18, 4, "YES"),
+            ("innovator", "CAD", "id", "char", 32, None, None, "NO"),
+            ("innovator", "CAD", "part_id", "char", 32, None, None, "YES"),
+        ]),
+        "'PRIMARY KEY'": ([], [("innovator", "PART", "id"), ("innovator", "CAD", "id")]),
+        "sys.foreign_key_columns": ([], [
+            ("innovator", "CAD", "part_id", "innovator", "PART", "id", "FK_CAD_PART"),
+        ]),
+        "SELECT TABLE_SCHEMA, TABLE_NAME": ([], [("innovator", "CAD"), ("innovator", "PART")]),
+    })
+
+def _introspections(fake_driver):
+    return sum(1 for query, _ in fake_driver.executed if "c.COLUMN_NAME" in query)
+
+def test_catalog_introspects_tables(fake_driver):
+    """Test that columns, keys and foreign keys are collected per table."""
+    _install_schema(fake_driver)
+    catalog = SchemaCatalog()
+    catalog.refresh(fake_driver.connect())
+    part = catalog.describe("PART")
+    assert part["schema"] == "innovator"
+    assert part["columns"] == [
+        {"name": "id", "type": "char(32)", "nullable": False},
+        {"name": "cost", "type": "decimal(18,4)", "nullable": True},
+    ]
+    assert part["primary_key"] == ["id"]
+    cad = catalog.describe("innovator.cad")
+    assert cad["foreign_keys"][0]["references"] == "innovator.PART"
+    with pytest.raises(UnknownTableError):
+        catalog.describe("DOCUMENT")
+
+def test_catalog_reloads_only_after_ddl(fake_driver):
+    """Test that an expired TTL only re-introspects when the DDL stamp moved."""
+    _install_schema(fake_driver)
+    catalog = SchemaCatalog(ttl=0)
+    conn = fake_driver.connect()
+    catalog.refresh(conn)
+    catalog.refresh(conn)
+    assert _introspections(fake_driver) == 1
+    _install_schema(fake_driver, modified=datetime.datetime(2024, 2, 1))
+    catalog.refresh(conn)
+    assert _introspections(fake_driver) == 2
+
+def test_catalog_snapshot_skips_introspection(fake_driver, tmp_path):
+    """Test that a fresh catalog starts from the on-disk snapshot."""
+    _install_schema(fake_driver)
+    path = str(tmp_path / "schema.json")
+    SchemaCatalog(snapshot_path=path).refresh(fake_driver.connect())
+    assert _introspections(fake_driver) == 1
+
+    catalog = SchemaCatalog(snapshot_path=path)
+    catalog.refresh(fake_driver.connect())
+    assert _introspections(fake_driver) == 1
+    assert catalog.stats()["snapshot_loads"] == 1
+    assert catalog.describe("PART")["primary_key"] == ["id"]
+
+@pytest.mark.asyncio
+async def test_resources_served_from_catalog(fake_pool, fake_driver, monkeypatch):
+    """Test that listing is cached and per-table schema is read on demand."""
+    _install_schema(fake_driver)
+    monkeypatch.setattr(server, "_catalog", SchemaCatalog())
+    resources = await list_resources()
+    await list_resources()
+    uris = [str(resource.uri) for resource in resources]
+    assert "mssql://PART/data" in uris
+    assert "mssql://CAD/data" in uris
+    assert all(len(resource.description or "") < 200 for resource in resources)
+    assert _introspections(fake_driver) == 1
+
+    schema = json.loads(await read_resource("mssql://PART/schema"))
+    assert schema["primary_key"] == ["id"]
+    itemtypes = json.loads(await read_resource("mssql://schema_info"))
+    assert itemtypes["itemtypes"][0]["name"] == "CAD"
+
+def test_catalog_notifies_changed_tables(fake_driver):
+    """Test that a reload reports only the tables whose definition changed."""
+    _install_schema(fake_driver)
+    catalog = SchemaCatalog(ttl=0)
+    changes = []
+    catalog.add_listener(changes.append)
+    conn = fake_driver.connect()
+    catalog.refresh(conn)
+    fake_driver.results["c.COLUMN_NAME"][1].append(("innovator", "CAD", "name", "nvarchar", 128, None, None, "YES"))
+    fake_driver.results["sys.objects"] = (["count", "modified"], [(3, datetime.datetime(2024, 3, 1))])
+    catalog.refresh(conn)
+    assert changes == [{"cad"}]
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from mssql_mcp_server.executor import QueryExecutor, QueryQueueFullError
+from mssql_mcp_server.pool import ConnectionPool
+
+@pytest.fixture
+def pool(fake_driver):
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=4)
+    yield pool
+    pool.close()
+
+@pytest.mark.asyncio
+async def test_run_uses_worker_thread(pool):
+    """Test that work runs off the event loop thread on a pooled connection."""
+    executor = QueryExecutor(pool, max_concurrency=2)
+    loop_thread = threading.get_ident()
+    thread, conn = await executor.run(lambda conn: (threading.get_ident(), conn))
+    assert thread != loop_thread
+    assert conn.rollbacks == 1
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_slow_queries_overlap(pool):
+    """Test that concurrent requests overlap instead of adding up."""
+    executor = QueryExecutor(pool, max_concurrency=4)
+    start = time.monotonic()
+    await asyncio.gather(*(executor.run(lambda conn: time.sleep(0.1)) for _ in range(4)))
+    assert time.monotonic() - start < 0.3
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive(pool):
+    """Test that other coroutines keep running while a query blocks."""
+    executor = QueryExecutor(pool, max_concurrency=1)
+    task = asyncio.ensure_future(executor.run(lambda conn: time.sleep(0.2)))
+    start = time.monotonic()
+    await asyncio.sleep(0.01)
+    assert time.monotonic() - start < 0.1
+    await task
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_queue_full_rejects(pool):
+    """Test that submissions beyond concurrency plus queue are rejected."""
+    executor = QueryExecutor(pool, max_concurrency=1, max_queue=1)
+    release = threading.Event()
+    tasks = [asyncio.ensure_future(executor.run(lambda conn: release.wait(2))) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    with pytest.raises(QueryQueueFullError):
+        await executor.run(lambda conn: None)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_cancel_running_query(pool):
+    """Test that cancelling the awaiting task cancels the running statement."""
+    executor = QueryExecutor(pool, max_concurrency=1)
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def work(conn):
+        conn.cancel = cancelled.set
+        started.set()
+        cancelled.wait(2)
+        raise RuntimeError("statement cancelled")
+
+    task = asyncio.ensure_future(executor.run(work))
+    await asyncio.get_running_loop().run_in_executor(None, started.wait, 2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert cancelled.wait(1)
+    # Wait for the worker to finish so the stats are settled
+    await executor.run(lambda conn: None)
+    assert executor.stats()["cancelled"] == 1
+    executor.shutdown()
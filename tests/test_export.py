@@ -0,0 +1,126 @@
+import json
+import os
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.export import ExportStore, UnknownExportError
+from mssql_mcp_server.server import call_tool, read_resource
+
+def _cursor(fake_driver, rows, columns=("id", "name")):
+    fake_driver.results["FROM PART"] = (list(columns), rows)
+    cursor = fake_driver.connect().cursor()
+    cursor.execute("SELECT id, name FROM PART")
+    return cursor
+
+def _parts(count):
+    return [(i, f"part {i}") for i in range(count)]
+
+def test_export_slices_rows(fake_driver, tmp_path):
+    """Test that any slice is read back exactly from the spill file."""
+    store = ExportStore(str(tmp_path), index_step=3)
+    export = store.write(_cursor(fake_driver, _parts(10)), batch_size=4)
+    assert (export.rows, export.multiline, export.truncated) == (10, False, False)
+    assert list(export.index) == [8, 35, 62, 89]
+    assert store.read_rows(export.handle, 4, 3) == ("4,part 4\n5,part 5\n6,part 6\n", 3)
+    assert store.read_rows(export.handle, 8, 100) == ("8,part 8\n9,part 9\n", 2)
+    assert store.read_rows(export.handle, 10, 5) == ("", 0)
+    # The byte limit ends a slice early but never returns nothing
+    assert store.read_rows(export.handle, 0, 5, max_bytes=12) == ("0,part 0\n", 1)
+
+def test_export_search(fake_driver, tmp_path):
+    """Test that matching rows are found with their row numbers and can be continued."""
+    store = ExportStore(str(tmp_path), index_step=4)
+    export = store.write(_cursor(fake_driver, _parts(30)), fmt="jsonl")
+    matches, next_offset = store.search(export.handle, r'"part 1\d"', limit=3)
+    assert [row for row, _ in matches] == [10, 11, 12]
+    assert matches[0][1] == '{"id":10,"name":"part 10"}'
+    assert next_offset == 13
+    matches, next_offset = store.search(export.handle, r'"part 1\d"', offset=next_offset)
+    assert [row for row, _ in matches] == list(range(13, 20))
+    assert next_offset is None
+    with pytest.raises(ValueError, match="Invalid search pattern"):
+        store.search(export.handle, "(")
+
+def test_export_multiline_csv(fake_driver, tmp_path):
+    """Test that quoted line breaks do not shift row numbers."""
+    rows = [(i, f"line {i}\nmore" if i % 2 else f"part {i}") for i in range(7)]
+    store = ExportStore(str(tmp_path), index_step=2)
+    export = store.write(_cursor(fake_driver, rows))
+    assert export.multiline
+    assert store.read_rows(export.handle, 3, 2) == ('3,"line 3\nmore"\n4,part 4\n', 2)
+    matches, _ = store.search(export.handle, "line 5")
+    assert matches == [(5, '5,"line 5\nmore"')]
+
+def test_export_truncates_at_byte_limit(fake_driver, tmp_path):
+    """Test that an export stops at its size limit with whole rows."""
+    store = ExportStore(str(tmp_path), max_bytes=40, index_step=2)
+    export = store.write(_cursor(fake_driver, _parts(10)), batch_size=10)
+    assert export.truncated
+    assert export.rows == 2
+    assert os.path.getsize(export.path) == export.bytes <= 40
+
+def test_export_files_are_evicted(fake_driver, tmp_path):
+    """Test that old exports are deleted beyond max_files and on close."""
+    store = ExportStore(max_files=1)
+    first = store.write(_cursor(fake_driver, _parts(3)))
+    second = store.write(_cursor(fake_driver, _parts(3)))
+    assert not os.path.exists(first.path)
+    with pytest.raises(UnknownExportError):
+        store.get(first.handle)
+    store.close_all()
+    assert not os.path.exists(second.path)
+    assert not os.path.exists(store.directory)
+
+def test_expired_exports_are_deleted_without_a_read(fake_driver, tmp_path):
+    """Test that writing a new export deletes the files of expired ones."""
+    store = ExportStore(str(tmp_path), ttl=60)
+    old = store.write(_cursor(fake_driver, _parts(3)))
+    old.created_at -= 61
+    new = store.write(_cursor(fake_driver, _parts(3)))
+    assert not os.path.exists(old.path)
+    assert os.path.exists(new.path)
+    assert store.stats()["expired"] == 1
+    new.created_at -= 61
+    assert store.expire() == 1
+    assert not os.path.exists(new.path)
+
+@pytest.mark.asyncio
+async def test_export_tool_and_resource(fake_pool, fake_driver, monkeypatch, tmp_path):
+    """Test that export_sql returns a handle whose rows are served by the resource."""
+    store = ExportStore(str(tmp_path))
+    monkeypatch.setattr(server, "_export_store", store)
+    fake_driver.results["FROM PART"] = (["id", "name"], _parts(250))
+
+    summary = json.loads((await call_tool("export_sql", {"query": "SELECT id, name FROM PART"}))[0].text)
+    assert summary["rows"] == 250
+    assert summary["preview"] == "id,name\n0,part 0\n1,part 1\n2,part 2\n3,part 3\n4,part 4\n"
+    # The connection went back to the pool
+    assert fake_pool.stats()["in_use"] == 0
+
+    text = await read_resource(summary["uri"] + "?offset=240&limit=5")
+    body, note = text.split("\n\n")
+    assert body == "id,name\n240,part 240\n241,part 241\n242,part 242\n243,part 243\n244,part 244"
+    note = json.loads(note)
+    assert note["total_rows"] == 250
+    assert note["next"] == summary["uri"] + "?offset=245&limit=5"
+
+    found = json.loads(await read_resource(summary["uri"] + "?grep=part%2024%5Cd&limit=3"))
+    assert [match["row"] for match in found["matches"]] == [240, 241, 242]
+    assert "offset=243" in found["next"]
+
+@pytest.mark.asyncio
+async def test_export_rejects_non_select(fake_pool):
+    """Test that only SELECT statements can be exported."""
+    result = await call_tool("export_sql", {"query": "DELETE FROM PART"})
+    assert result[0].text == "Error exporting query: Only SELECT queries are allowed for security reasons"
+
+@pytest.mark.asyncio
+async def test_truncated_export_releases_connection(fake_pool, fake_driver, monkeypatch, tmp_path):
+    """Test that an export over the size limit cancels its statement and frees the connection."""
+    monkeypatch.setattr(server, "_export_store", ExportStore(str(tmp_path), max_bytes=100))
+    fake_driver.results["FROM PART"] = (["id", "name"], _parts(250))
+    summary = json.loads((await call_tool("export_sql", {"query": "SELECT id, name FROM PART"}))[0].text)
+    assert summary["truncated"]
+    assert "byte limit" in summary["note"]
+    assert fake_driver.connections[0].cancels == 1
+    assert fake_pool.stats()["in_use"] == 0
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+
+import pytest
+from conftest import showplan_xml
+from mssql_mcp_server import server
+from mssql_mcp_server.executor import QueryExecutor, QueryTimeoutError
+from mssql_mcp_server.guard import QueryGuard, QueryRejectedError, estimate, parse_plan, with_top
+from mssql_mcp_server.pool import ConnectionPool
+from mssql_mcp_server.server import call_tool
+
+CROSS_JOIN = "SELECT p.id, d.id FROM innovator.PART p, innovator.DOCUMENT d"
+
+def test_parse_plan():
+    """Test that rows and cost are read from the statement of a canned plan."""
+    plan = parse_plan(showplan_xml(rows=1.5e9, cost=48211.7))
+    assert plan.rows == 1.5e9
+    assert plan.cost == 48211.7
+
+def test_estimate_toggles_showplan(fake_driver):
+    """Test that the plan is fetched under SHOWPLAN_XML and the session is restored."""
+    fake_driver.plans["DOCUMENT"] = showplan_xml(rows=1000, cost=3.2)
+    conn = fake_driver.connect()
+    plan = estimate(conn, CROSS_JOIN)
+    assert (plan.rows, plan.cost) == (1000, 3.2)
+    assert [q for q, _ in fake_driver.executed] == ["SET SHOWPLAN_XML ON", CROSS_JOIN, "SET SHOWPLAN_XML OFF"]
+    assert not conn.showplan
+
+def test_with_top():
+    """Test that TOP is only added where it limits the whole result."""
+    assert with_top("SELECT id FROM PART", 100) == "SELECT TOP (100) id FROM PART"
+    assert with_top("select distinct id from PART", 5) == "select distinct TOP (5) id from PART"
+    assert with_top("SELECT TOP 10 id FROM PART", 5) is None
+    assert with_top("SELECT id FROM PART UNION SELECT id FROM CAD", 5) is None
+    assert with_top("SELECT id FROM PART ORDER BY id OFFSET 10 ROWS", 5) is None
+    assert with_top("SELECT 'top' AS [union] FROM PART", 5) == "SELECT TOP (5) 'top' AS [union] FROM PART"
+
+def test_guard_limits_large_results(fake_driver):
+    """Test that a query over the row threshold is rewritten with TOP."""
+    fake_driver.plans["TOP (1000)"] = showplan_xml(rows=1000, cost=5)
+    fake_driver.plans["DOCUMENT"] = showplan_xml(rows=1.5e9, cost=48211.7)
+    guard = QueryGuard(max_rows=1000, max_cost=100)
+    query, limit = guard.review(fake_driver.connect(), CROSS_JOIN)
+    assert query == CROSS_JOIN.replace("SELECT", "SELECT TOP (1000)", 1)
+    assert limit == 1000
+    assert guard.stats()["limited"] == 1
+
+def test_guard_rejects_expensive_queries(fake_driver):
+    """Test that queries over the cost threshold are rejected."""
+    fake_driver.plans["DOCUMENT"] = showplan_xml(rows=1.5e9, cost=48211.7)
+    with pytest.raises(QueryRejectedError, match="estimated cost 48,211.7"):
+        QueryGuard(max_cost=100).review(fake_driver.connect(), CROSS_JOIN)
+    with pytest.raises(QueryRejectedError, match="rows exceeds the limit"):
+        QueryGuard(max_rows=1000, add_top=False).review(fake_driver.connect(), CROSS_JOIN)
+
+@pytest.mark.asyncio
+async def test_call_tool_reports_rejection(fake_pool, fake_driver, monkeypatch):
+    """Test that a rejected query never executes and the reason is returned."""
+    monkeypatch.setattr(server, "_query_guard", QueryGuard(max_cost=100))
+    fake_driver.plans["DOCUMENT"] = showplan_xml(rows=1.5e9, cost=48211.7)
+    result = await call_tool("execute_sql", {"query": CROSS_JOIN})
+    assert "Query rejected" in result[0].text
+    assert [q for q, _ in fake_driver.executed] == ["SET SHOWPLAN_XML ON", CROSS_JOIN, "SET SHOWPLAN_XML OFF"]
+
+@pytest.mark.asyncio
+async def test_call_tool_notes_added_top(fake_pool, fake_driver, monkeypatch):
+    """Test that a limited query says so in its result."""
+    monkeypatch.setattr(server, "_query_guard", QueryGuard(max_rows=2))
+    fake_driver.plans["TOP (2)"] = showplan_xml(rows=2, cost=0.1)
+    fake_driver.plans["FROM PART"] = showplan_xml(rows=500, cost=1)
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,)])
+    result = await call_tool("execute_sql", {"query": "SELECT id FROM PART"})
+    assert result[0].text == "id\n1\n2"
+    assert json.loads(result[1].text)["limited_to"] == 2
+    assert fake_driver.executed[-1][0] == "SELECT TOP (2) id FROM PART"
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_on_server(fake_driver):
+    """Test that a statement over its timeout is cancelled and frees its connection."""
+    fake_driver.latency = 5.0
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=1)
+    executor = QueryExecutor(pool, max_concurrency=1)
+
+    def work(conn):
+        cursor = conn.cursor()
+        cursor.execute("SELECT slow")
+        return cursor.fetchall()
+
+    start = time.monotonic()
+    with pytest.raises(QueryTimeoutError):
+        await executor.run(work, timeout=0.1)
+    assert time.monotonic() - start < 1
+    assert fake_driver.connections[0].cancels == 1
+    # The worker gives the connection back as soon as the cancel lands
+    fake_driver.latency = 0.0
+    await asyncio.sleep(0.05)
+    assert await executor.run(work) == [(1,)]
+    assert executor.stats()["timed_out"] == 1
+    executor.shutdown()
+    pool.close()
+
+@pytest.mark.asyncio
+async def test_information_schema_queries_are_guarded(fake_pool, fake_driver, monkeypatch):
+    """Test that only a plain table listing bypasses paging and the cost guard."""
+    monkeypatch.setattr(server, "_query_guard", QueryGuard(max_cost=100))
+    fake_driver.results["INFORMATION_SCHEMA.TABLES"] = (["TABLE_SCHEMA", "TABLE_NAME"], [("innovator", "CAD"), ("innovator", "PART")])
+    listing = await call_tool("execute_sql", {"query": "SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES"})
+    assert listing[0].text.split("\n")[1:] == ["CAD", "PART"]
+    assert not any(q.startswith("SET SHOWPLAN_XML") for q, _ in fake_driver.executed)
+
+    fake_driver.plans["CROSS JOIN"] = showplan_xml(rows=1.5e9, cost=48211.7)
+    query = CROSS_JOIN + " CROSS JOIN innovator.CAD c WHERE EXISTS (SELECT 1 FROM INFORMATION_SCHEMA.TABLES)"
+    result = await call_tool("execute_sql", {"query": query})
+    assert "Query rejected" in result[0].text
@@ -0,0 +1,76 @@
+import asyncio
+import io
+import logging
+
+import pytest
+from mssql_mcp_server import log
+from mssql_mcp_server.executor import QueryExecutor
+from mssql_mcp_server.log import current_request_id, new_request_id, sampled, truncated
+from mssql_mcp_server.pool import ConnectionPool
+
+@pytest.fixture
+def log_settings(monkeypatch):
+    monkeypatch.setitem(log._settings, "sample_rate", 1.0)
+    monkeypatch.setitem(log._settings, "max_chars", 10)
+    return log._settings
+
+def test_truncated_is_lazy_and_bounded(log_settings):
+    """Test that long values are cut to the configured limit only when formatted."""
+    calls = []
+
+    class Value:
+        def __str__(self):
+            calls.append(1)
+            return "x" * 25
+
+    value = truncated(Value())
+    assert calls == []
+    assert str(value) == "x" * 10 + "... (15 more chars)"
+    assert str(truncated("short")) == "short"
+    assert str(truncated("abcdef", limit=3)) == "abc... (3 more chars)"
+
+def test_sampling(log_settings):
+    """Test that the sample rate bounds how many calls are logged."""
+    log_settings["sample_rate"] = 0.0
+    assert not any(sampled() for _ in range(100))
+    log_settings["sample_rate"] = 1.0
+    assert all(sampled() for _ in range(100))
+    log_settings["sample_rate"] = 0.5
+    assert 0 < sum(sampled() for _ in range(1000)) < 1000
+
+@pytest.mark.asyncio
+async def test_request_id_reaches_worker_threads(fake_driver):
+    """Test that the correlation id set in a handler is visible inside executor work."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=2)
+    executor = QueryExecutor(pool, max_concurrency=2)
+
+    async def handler():
+        request_id = new_request_id()
+        seen = await executor.run(lambda conn: current_request_id())
+        return request_id, seen
+
+    results = await asyncio.gather(handler(), handler())
+    for request_id, seen in results:
+        assert request_id == seen
+    assert results[0][0] != results[1][0]
+    executor.shutdown()
+    pool.close()
+
+def test_queued_handler_adds_request_id(monkeypatch):
+    """Test that records written through the queue carry the request id."""
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    monkeypatch.setattr(root, "level", root.level)
+    stream = io.StringIO()
+    monkeypatch.setattr(log.sys, "stderr", stream)
+
+    log.configure_logging({"level": "INFO", "sample_rate": 1.0, "max_chars": 500})
+    try:
+        request_id = new_request_id()
+        logging.getLogger("mssql_mcp_server").info("hello %s", "world")
+        logging.getLogger("mssql_mcp_server").debug("not emitted")
+    finally:
+        log.shutdown_logging()
+    output = stream.getvalue()
+    assert f"[{request_id}] hello world" in output
+    assert "not emitted" not in output
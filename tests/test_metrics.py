@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.metrics import Histogram, Metrics, query_shape
+from mssql_mcp_server.server import call_tool, read_resource
+
+def test_histogram_quantiles():
+    """Test that quantiles resolve to bucket bounds capped by the maximum."""
+    histogram = Histogram()
+    for _ in range(98):
+        histogram.observe(0.002)
+    histogram.observe(0.3)
+    histogram.observe(0.7)
+    assert histogram.quantile(0.5) == 0.0025
+    assert histogram.quantile(0.99) == 0.5
+    assert histogram.quantile(1.0) == 0.7
+    assert Histogram().quantile(0.5) is None
+
+def test_slowest_queries_are_bounded():
+    """Test that only the top-N slowest normalized queries are reported."""
+    metrics = Metrics(top_queries=2)
+    for i in range(20):
+        metrics.record_query(f"select * from t{i}", i / 100)
+    metrics.record_query("SELECT  *  FROM t19", 0.01)
+    slowest = metrics.snapshot()["slowest_queries"]
+    assert [q["query"] for q in slowest] == ["SELECT * FROM T19", "SELECT * FROM T18"]
+    assert slowest[0]["count"] == 2
+    assert slowest[0]["max_seconds"] == 0.19
+    assert metrics.snapshot()["counters"]["queries"] == 21
+
+def test_query_shape_replaces_literals():
+    """Test that string and number literals become placeholders, names and parameters stay."""
+    shape = query_shape("select [id 1], t2.x from t2 -- it's\nwhere item_number = N'P-1' and cost > 1.5e3 and id = ?;")
+    assert shape == "SELECT [id 1], T2.X FROM T2 WHERE ITEM_NUMBER = ? AND COST > ? AND ID = ?"
+    assert query_shape("SELECT 'it''s', 0x1F, @p1") == "SELECT ?, ?, @P1"
+
+def test_slowest_queries_grouped_by_shape():
+    """Test that one statement run with many values is one slow-query entry."""
+    metrics = Metrics(top_queries=3)
+    for i in range(20):
+        metrics.record_query(f"SELECT * FROM PART WHERE item_number = 'P-{i}'", 0.5)
+    metrics.record_query("SELECT * FROM CAD WHERE id = 7", 0.1)
+    slowest = metrics.snapshot()["slowest_queries"]
+    assert [(q["query"], q["count"]) for q in slowest] == [
+        ("SELECT * FROM PART WHERE ITEM_NUMBER = ?", 20),
+        ("SELECT * FROM CAD WHERE ID = ?", 1),
+    ]
+
+def test_prometheus_output(tmp_path):
+    """Test that the Prometheus file has cumulative buckets and labelled errors."""
+    metrics = Metrics()
+    metrics.observe("execute", 0.004)
+    metrics.observe("execute", 2.0)
+    metrics.error(ValueError("bad"))
+    path = tmp_path / "metrics.prom"
+    metrics.write_prometheus(str(path))
+    text = path.read_text()
+    assert 'mssql_mcp_phase_seconds_bucket{phase="execute",le="0.005"} 1' in text
+    assert 'mssql_mcp_phase_seconds_bucket{phase="execute",le="+Inf"} 2' in text
+    assert 'mssql_mcp_phase_seconds_count{phase="execute"} 2' in text
+    assert 'mssql_mcp_errors_total{class="ValueError"} 1' in text
+
+@pytest.mark.asyncio
+async def test_call_tool_records_phases(fake_pool, fake_driver):
+    """Test that execute_sql feeds phase timings, counters and errors."""
+    fake_driver.results["FROM PART"] = (["id"], [(i,) for i in range(5)])
+    await call_tool("execute_sql", {"query": "SELECT id FROM PART"})
+    await call_tool("execute_sql", {"query": "DELETE FROM PART"})
+
+    snapshot = json.loads(await read_resource("mssql://metrics"))
+    for phase in ("queue", "connect", "execute", "fetch", "serialize", "total"):
+        assert snapshot["phases"][phase]["count"] == 1, phase
+    assert snapshot["counters"]["rows"] == 5
+    assert snapshot["counters"]["bytes"] > 0
+    assert snapshot["errors"] == {"ValueError": 1}
+    assert snapshot["slowest_queries"][0]["query"] == "SELECT ID FROM PART"
+    assert server.get_metrics() is server._metrics
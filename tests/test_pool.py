@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.catalog import SchemaCatalog
+from mssql_mcp_server.pool import ConnectionPool, PoolTimeoutError
+from mssql_mcp_server.server import call_tool, read_resource
+
+def test_connection_is_reused(fake_driver):
+    """Test that a released connection is handed out again."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    stats = pool.stats()
+    assert stats["creations"] == 1
+    assert stats["hits"] == 1
+    assert first.rollbacks == 2
+
+def test_server_pool_uses_autocommit(fake_driver, monkeypatch):
+    """Test that pooled sessions skip the implicit transaction, so release costs no round trips."""
+    monkeypatch.setattr(server.pymssql, "connect", fake_driver.connect)
+    monkeypatch.setattr(server, "_pool", None)
+    pool = server.get_pool()
+    try:
+        pool.release(pool.acquire())
+    finally:
+        pool.close()
+    assert fake_driver.connections[0].kwargs["autocommit"] is True
+
+def test_prefill_opens_min_size(fake_driver):
+    """Test that prefill opens min_size connections up front."""
+    pool = ConnectionPool(fake_driver.connect, min_size=3, max_size=5)
+    pool.prefill()
+    assert len(fake_driver.connections) == 3
+    assert pool.stats()["idle"] == 3
+
+def test_acquire_waits_then_times_out(fake_driver):
+    """Test that acquire blocks at max_size and raises after the timeout."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=1)
+    conn = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.05)
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+
+    # A waiter is woken up by a release from another thread
+    threading.Timer(0.05, pool.release, args=(conn,)).start()
+    assert pool.acquire(timeout=2) is conn
+
+def test_broken_connection_is_replaced(fake_driver):
+    """Test that a connection failing its health check is reconnected."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=2, health_check_interval=0)
+    with pool.connection() as first:
+        pass
+    first.broken = True
+    with pool.connection() as second:
+        pass
+    assert second is not first
+    assert first.closed
+    stats = pool.stats()
+    assert stats["health_check_failures"] == 1
+    assert stats["creations"] == 2
+    assert stats["size"] == 1
+
+def test_error_marks_connection_suspect(fake_driver):
+    """Test that a connection is pinged again after its user raised."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=2)
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            raise RuntimeError("boom")
+    fake_driver.executed.clear()
+    with pool.connection() as again:
+        pass
+    assert again is conn
+    assert fake_driver.executed == [("SELECT 1", None)]
+
+def test_idle_connections_expire(fake_driver):
+    """Test that idle connections above min_size are closed."""
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=2, idle_timeout=0.01)
+    with pool.connection() as conn:
+        pass
+    time.sleep(0.02)
+    with pool.connection() as fresh:
+        pass
+    assert conn.closed
+    assert fresh is not conn
+    assert pool.stats()["idle_closed"] == 1
+
+@pytest.mark.asyncio
+async def test_entry_points_share_pool(fake_pool, fake_driver, monkeypatch):
+    """Test that call_tool and read_resource reuse pooled connections."""
+    catalog = SchemaCatalog(ttl=3600)
+    catalog._install({"dbo.PART": {
+        "schema": "dbo", "name": "PART", "primary_key": ["id"], "foreign_keys": [],
+        "columns": [{"name": "id", "type": "int", "nullable": False},
+                    {"name": "name", "type": "nvarchar(32)", "nullable": True}],
+    }}, None)
+    catalog._checked_at = time.monotonic()
+    monkeypatch.setattr(server, "_catalog", catalog)
+    fake_driver.results["PART"] = (["id", "name"], [(1, "a"), (2, "b")])
+    result = await call_tool("execute_sql", {"query": "SELECT id, name FROM PART"})
+    assert result[0].text == "id,name\n1,a\n2,b"
+    text = await read_resource("mssql://PART/data")
+    assert text.startswith("id,name")
+    assert len(fake_driver.connections) == 1
+    assert fake_pool.stats()["hits"] == 1
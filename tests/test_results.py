@@ -0,0 +1,176 @@
+import asyncio
+import collections
+import json
+import threading
+
+import pytest
+from mssql_mcp_server.results import ResultCursorRegistry, UnknownCursorError, read_page
+from mssql_mcp_server.serialization import CsvWriter
+from mssql_mcp_server import server
+from mssql_mcp_server.pool import ConnectionPool
+from mssql_mcp_server.server import call_tool
+
+def _cursor(fake_driver, rows):
+    fake_driver.results["FROM PART"] = (["id", "name"], rows)
+    cursor = fake_driver.connect().cursor()
+    cursor.execute("SELECT id, name FROM PART")
+    return cursor
+
+def test_read_page_stops_at_row_limit(fake_driver):
+    """Test that a page holds at most max_rows rows and reports more."""
+    cursor = _cursor(fake_driver, [(i, f"p{i}") for i in range(10)])
+    page = read_page(cursor, CsvWriter(["id", "name"]), max_rows=4, max_bytes=10_000, batch_size=3)
+    assert page.columns == ["id", "name"]
+    assert page.text == "id,name\n0,p0\n1,p1\n2,p2\n3,p3"
+    assert page.has_more
+
+def test_read_page_stops_at_byte_limit(fake_driver):
+    """Test that the byte limit ends a page without losing rows."""
+    cursor = _cursor(fake_driver, [(i, "x" * 10) for i in range(5)])
+    pending = collections.deque()
+    writer = CsvWriter(["id", "name"])
+    first = read_page(cursor, writer, max_rows=100, max_bytes=30, pending=pending)
+    second = read_page(cursor, writer, max_rows=100, max_bytes=1000, pending=pending)
+    assert first.row_count == 2
+    assert first.byte_count <= 30
+    lines = (first.body + second.body).splitlines()
+    assert [line.split(",")[0] for line in lines] == ["0", "1", "2", "3", "4"]
+    assert not second.has_more
+
+def test_read_page_exact_fit_is_exhausted(fake_driver):
+    """Test that a result that exactly fills the page has no more rows."""
+    cursor = _cursor(fake_driver, [(1, "a"), (2, "b")])
+    page = read_page(cursor, CsvWriter(["id", "name"]), max_rows=2, max_bytes=1000)
+    assert page.row_count == 2
+    assert not page.has_more
+
+def test_registry_releases_connection_when_exhausted(fake_pool, fake_driver):
+    """Test that the pinned connection returns to the pool after the last page."""
+    registry = ResultCursorRegistry(fake_pool)
+    conn = fake_pool.acquire()
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,), (3,)])
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM PART")
+    token = registry.register(conn, cursor, CsvWriter(["id"]), collections.deque(), 0)
+    assert fake_pool.stats()["in_use"] == 1
+    page, rows_sent = registry.fetch_page(token, max_rows=10, max_bytes=1000)
+    assert page.text == "id\n1\n2\n3"
+    assert rows_sent == 3
+    assert fake_pool.stats()["in_use"] == 0
+    with pytest.raises(UnknownCursorError):
+        registry.fetch_page(token, max_rows=10, max_bytes=1000)
+
+def test_eviction_waits_for_running_fetch(fake_pool, fake_driver):
+    """Test that a result evicted mid-fetch is closed once, after the fetch."""
+    registry = ResultCursorRegistry(fake_pool, max_open=1)
+    conn = fake_pool.acquire()
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,)])
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM PART")
+    reading, resume = threading.Event(), threading.Event()
+    fetchmany = cursor.fetchmany
+
+    def slow_fetchmany(size=1):
+        reading.set()
+        resume.wait(5)
+        return fetchmany(size)
+    cursor.fetchmany = slow_fetchmany
+    token = registry.register(conn, cursor, CsvWriter(["id"]), collections.deque(), 0)
+    releases = []
+    release = fake_pool.release
+    fake_pool.release = lambda c, **kwargs: (releases.append(c), release(c, **kwargs))
+
+    fetch = threading.Thread(target=registry.fetch_page, args=(token, 10, 1000))
+    fetch.start()
+    reading.wait(5)
+    other = fake_pool.acquire()
+    evict = threading.Thread(target=registry.register,
+                             args=(other, other.cursor(), CsvWriter(["id"]), collections.deque(), 0))
+    evict.start()
+    evict.join(0.1)
+    # The eviction is blocked behind the fetch instead of releasing a connection in use
+    assert evict.is_alive() and releases == []
+    resume.set()
+    fetch.join(5)
+    evict.join(5)
+    assert releases == [conn]
+    assert conn.cancels == 0
+
+def test_clients_do_not_evict_each_others_cursors(fake_driver):
+    """Test that a full registry closes cursors of the client holding the most."""
+    # One connection to spare: a new result is registered before one is evicted
+    pool = ConnectionPool(fake_driver.connect, min_size=0, max_size=5)
+    registry = ResultCursorRegistry(pool, max_open=4)
+    fake_driver.results["FROM PART"] = (["id"], [(1,), (2,), (3,)])
+    alice, bob = object(), object()
+
+    def open_result(owner):
+        conn = pool.acquire()
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM PART")
+        return registry.register(conn, cursor, CsvWriter(["id"]), collections.deque(), 0, owner)
+
+    alice_tokens = [open_result(alice) for _ in range(4)]
+    assert registry.capacity_for(bob) == 2
+    bob_tokens = [open_result(bob) for _ in range(5)]
+    # Bob took Alice's oldest cursors down to a fair share, then only replaced his own
+    assert registry.open_count() == 4
+    assert [registry.connection_for(t) is not None for t in alice_tokens] == [False] * 2 + [True] * 2
+    assert [registry.connection_for(t) is not None for t in bob_tokens] == [False] * 3 + [True] * 2
+    for token in alice_tokens[:2]:
+        with pytest.raises(UnknownCursorError):
+            registry.fetch_page(token, max_rows=10, max_bytes=1000)
+    page, _ = registry.fetch_page(alice_tokens[3], max_rows=10, max_bytes=1000)
+    assert page.text == "id\n1\n2\n3"
+    registry.close_all()
+    assert pool.stats()["in_use"] == 0
+
+@pytest.mark.asyncio
+async def test_execute_sql_pages_with_fetch_more(fake_pool, fake_driver):
+    """Test that execute_sql returns a cursor and fetch_more continues it."""
+    fake_driver.results["FROM PART"] = (["id", "name"], [(i, f"p{i}") for i in range(5)])
+    first = await call_tool("execute_sql", {"query": "SELECT id, name FROM PART", "max_rows": 2})
+    assert first[0].text == "id,name\n0,p0\n1,p1"
+    status = json.loads(first[1].text)
+    assert status["has_more"]
+
+    second = await call_tool("fetch_more", {"cursor": status["cursor"], "max_rows": 2})
+    assert second[0].text == "id,name\n2,p2\n3,p3"
+    third = await call_tool("fetch_more", {"cursor": status["cursor"]})
+    assert third[0].text == "id,name\n4,p4"
+    assert len(third) == 1
+    assert len(fake_driver.executed) == 1
+    assert fake_pool.stats()["in_use"] == 0
+
+@pytest.mark.asyncio
+async def test_fetch_more_close_releases_connection(fake_pool, fake_driver):
+    """Test that closing a cursor gives its connection back to the pool."""
+    fake_driver.results["FROM PART"] = (["id"], [(i,) for i in range(5)])
+    first = await call_tool("execute_sql", {"query": "SELECT id FROM PART", "max_rows": 1})
+    token = json.loads(first[1].text)["cursor"]
+    closed = await call_tool("fetch_more", {"cursor": token, "close": True})
+    assert json.loads(closed[0].text)["closed"]
+    assert fake_pool.stats()["in_use"] == 0
+    missing = await call_tool("fetch_more", {"cursor": token})
+    assert "Unknown or expired cursor" in missing[0].text
+
+@pytest.mark.asyncio
+async def test_idle_cursor_is_closed_without_further_calls(fake_pool, fake_driver):
+    """Test that the periodic sweep returns an abandoned cursor's connection to the pool."""
+    fake_driver.results["FROM PART"] = (["id"], [(i,) for i in range(5)])
+    first = await call_tool("execute_sql", {"query": "SELECT id FROM PART", "max_rows": 1})
+    token = json.loads(first[1].text)["cursor"]
+    assert fake_pool.stats()["in_use"] == 1
+    server.get_result_registry().idle_timeout = 0.05
+    sweeper = asyncio.ensure_future(server._expire_idle_periodically(0.02))
+    try:
+        for _ in range(100):
+            if not fake_pool.stats()["in_use"]:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        sweeper.cancel()
+    assert fake_pool.stats()["in_use"] == 0
+    assert server.get_result_registry().open_count() == 0
+    missing = await call_tool("fetch_more", {"cursor": token})
+    assert "Unknown or expired cursor" in missing[0].text
@@ -0,0 +1,79 @@
+import csv
+import datetime
+import io
+import decimal
+import json
+import uuid
+
+import pytest
+from mssql_mcp_server.serialization import get_writer
+from mssql_mcp_server.server import call_tool
+
+ROWS = [
+    (1, "plain", None, datetime.datetime(2024, 5, 1, 8, 30), decimal.Decimal("12.50"),
+     uuid.UUID("12345678-1234-5678-1234-567812345678"), b"\x01\xff", True),
+    (2, 'has, comma "and" quote\nand newline', 1.5, None, None, None, None, False),
+]
+COLUMNS = ["id", "text", "ratio", "created_on", "cost", "config_id", "blob", "is_current"]
+
+def _render(fmt, batches):
+    writer = get_writer(fmt, COLUMNS)
+    return writer.render("".join(writer.format_rows(batch) for batch in batches))
+
+def test_csv_quotes_special_values():
+    """Test that CSV output quotes commas, quotes and newlines per RFC 4180."""
+    text = _render("csv", [ROWS])
+    assert text.splitlines()[0] == ",".join(COLUMNS)
+    assert '"has, comma ""and"" quote\nand newline"' in text
+    assert "0x01ff" in text
+    assert "2024-05-01 08:30:00" in text
+    parsed = list(csv.reader(io.StringIO(text)))
+    assert parsed[2][1] == ROWS[1][1]
+    assert parsed[1][2] == ""
+
+def test_jsonl_one_object_per_row():
+    """Test that JSON lines output converts special types."""
+    lines = _render("jsonl", [ROWS[:1], ROWS[1:]]).split("\n")
+    first = json.loads(lines[0])
+    assert first["created_on"] == "2024-05-01T08:30:00"
+    assert first["cost"] == "12.50"
+    assert first["config_id"] == "12345678-1234-5678-1234-567812345678"
+    assert first["blob"] == "0x01ff"
+    assert json.loads(lines[1])["text"] == ROWS[1][1]
+
+def test_jsonl_keeps_repeated_and_unnamed_columns():
+    """Test that duplicate and empty column names do not drop values."""
+    writer = get_writer("jsonl", ["id", "id", "", "col4", ""])
+    line = writer.render(writer.format_rows([(1, 2, 3, 4, 5)]))
+    assert json.loads(line) == {"id": 1, "id_2": 2, "col3": 3, "col4": 4, "col5": 5}
+    writer = get_writer("jsonl", ["col1", ""])
+    assert json.loads(writer.render(writer.format_rows([(1, 2)]))) == {"col1": 1, "col2": 2}
+    writer = get_writer("jsonl", ["", "col1"])
+    assert json.loads(writer.render(writer.format_rows([(1, 2)]))) == {"col1_2": 1, "col1": 2}
+
+def test_columnar_states_types_once():
+    """Test that columnar output lists column types once followed by row arrays."""
+    document = json.loads(_render("columnar", [ROWS[:1], ROWS[1:]]))
+    types = {column["name"]: column["type"] for column in document["columns"]}
+    assert types["id"] == "integer"
+    assert types["created_on"] == "datetime"
+    assert types["is_current"] == "boolean"
+    assert document["rows"][1][:3] == [2, ROWS[1][1], 1.5]
+
+def test_columnar_empty_result():
+    """Test that an empty result is still a valid document."""
+    writer = get_writer("columnar", ["id"])
+    assert json.loads(writer.render("")) == {"columns": [{"name": "id", "type": None}], "rows": []}
+
+def test_unknown_format():
+    with pytest.raises(ValueError, match="Unknown output format"):
+        get_writer("xml", COLUMNS)
+
+@pytest.mark.asyncio
+async def test_call_tool_format(fake_pool, fake_driver):
+    """Test that execute_sql honours the requested format."""
+    fake_driver.results["FROM PART"] = (["id", "name"], [(1, "a,b")])
+    result = await call_tool("execute_sql", {"query": "SELECT id, name FROM PART", "format": "jsonl"})
+    assert json.loads(result[0].text) == {"id": 1, "name": "a,b"}
+    result = await call_tool("execute_sql", {"query": "SELECT id, name FROM PART"})
+    assert result[0].text == 'id,name\n1,"a,b"'
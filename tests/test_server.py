@@ -10,9 +10,9 @@ def test_server_initialization():
 async def test_list_tools():
     """Test that list_tools returns expected tools."""
     tools = await list_tools()
-    assert len(tools) == 1
-    assert tools[0].name == "execute_sql"
+    assert [tool.name for tool in tools] == ["execute_sql", "fetch_more", "execute_sql_batch", "table_stats", "column_stats", "export_sql"]
     assert "query" in tools[0].inputSchema["properties"]
+    assert "cursor" in tools[1].inputSchema["properties"]
 
 @pytest.mark.asyncio
 async def test_call_tool_invalid_name():
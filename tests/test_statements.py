@@ -0,0 +1,54 @@
+import datetime
+import decimal
+
+import pytest
+from mssql_mcp_server.statements import prepare, sql_type, template_cache_info
+from mssql_mcp_server.server import call_tool
+
+def test_prepare_without_params_is_passthrough():
+    """Test that a query without params is sent unchanged."""
+    assert prepare("SELECT 1", None) == ("SELECT 1", None)
+
+def test_prepare_positional_params():
+    """Test that '?' placeholders outside literals become sp_executesql params."""
+    sql, args = prepare("SELECT * FROM PART WHERE item_number = ? AND name <> '?' AND id > ?", ["P-1", 5])
+    assert sql == (
+        "EXEC sp_executesql N'SELECT * FROM PART WHERE item_number = @p1 AND name <> ''?'' AND id > @p2', "
+        "N'@p1 nvarchar(4000), @p2 bigint', @p1=%s, @p2=%s"
+    )
+    assert args == ("P-1", 5)
+
+def test_prepare_named_params_escapes_percent():
+    """Test that named params are declared and literal percent signs survive formatting."""
+    sql, args = prepare("SELECT * FROM PART WHERE name LIKE 'A%' AND is_current = @current", {"current": True})
+    assert "LIKE ''A%%''" in sql
+    assert "N'@current bit', @current=%s" in sql
+    assert args == (True,)
+
+def test_prepare_placeholder_count_mismatch():
+    """Test that a wrong number of positional params is rejected."""
+    with pytest.raises(ValueError, match="placeholders"):
+        prepare("SELECT * FROM PART WHERE id = ?", [1, 2])
+
+def test_sql_types_are_stable_per_shape():
+    """Test that values of the same kind map to the same declaration."""
+    assert sql_type("a") == sql_type("b" * 100)
+    assert sql_type(decimal.Decimal("1.5")) == sql_type(decimal.Decimal("12.25"))
+    assert sql_type(datetime.datetime(2024, 1, 1)) == "datetime2"
+    with pytest.raises(ValueError):
+        sql_type([1])
+
+def test_template_cache_reuses_shapes():
+    """Test that repeated statement shapes hit the template cache."""
+    before = template_cache_info()["hits"]
+    for value in ("P-1", "P-2", "P-3"):
+        prepare("SELECT name FROM PART WHERE item_number = ? /* shape */", [value])
+    assert template_cache_info()["hits"] - before == 2
+
+@pytest.mark.asyncio
+async def test_call_tool_binds_params(fake_pool, fake_driver):
+    """Test that execute_sql sends params to the driver via sp_executesql."""
+    await call_tool("execute_sql", {"query": "SELECT * FROM PART WHERE id = ?", "params": [7]})
+    sql, args = fake_driver.executed[-1]
+    assert sql.startswith("EXEC sp_executesql")
+    assert args == (7,)
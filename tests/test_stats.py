@@ -0,0 +1,160 @@
+import datetime
+import json
+
+import pytest
+from mssql_mcp_server import server
+from mssql_mcp_server.cache import ResultCache
+from mssql_mcp_server.catalog import SchemaCatalog
+from mssql_mcp_server.server import call_tool
+from mssql_mcp_server.stats import column_statistics, summarize_histogram, table_sizes
+
+UPDATED = datetime.datetime(2024, 3, 1, 12, 0)
+
+PART = {
+    "schema": "innovator",
+    "name": "PART",
+    "columns": [
+        {"name": "id", "type": "char(32)", "nullable": False},
+        {"name": "state", "type": "nvarchar(32)", "nullable": True},
+        {"name": "cost", "type": "decimal(18,4)", "nullable": True},
+    ],
+    "primary_key": ["id"],
+    "foreign_keys": [],
+}
+
+# range_high_key, equal_rows, range_rows, distinct_range_rows
+STATE_HISTOGRAM = [
+    (None, 100.0, 0.0, 0.0),
+    ("In Review", 150.0, 0.0, 0.0),
+    ("Preliminary", 250.0, 0.0, 0.0),
+    ("Released", 500.0, 0.0, 0.0),
+]
+
+def _install_stats(fake_driver):
+    fake_driver.results.update({
+        "sys.dm_db_partition_stats": ([], [
+            ("innovator", "CAD", 120, 64, 48, 16),
+            ("innovator", "PART", 1000, 512, 384, 96),
+        ]),
+        "sys.stats_columns": ([], [
+            ("id", 1, "PK_PART", 1000, 1000, UPDATED, 3),
+            ("state", 2, "_WA_Sys_state", 1000, 1000, UPDATED, 0),
+            ("state", 3, "IX_PART_state", 1000, 200, UPDATED, 0),
+        ]),
+        "sys.dm_db_stats_histogram": ([], STATE_HISTOGRAM),
+    })
+
+def test_summarize_histogram():
+    """Test that nulls, distinct values and frequent values come from the steps."""
+    steps = STATE_HISTOGRAM + [("Obsolete", 0.0, 40.0, 2.0)]
+    summary = summarize_histogram(steps, rows=1040, top=2)
+    assert summary["null_fraction"] == round(100 / 1040, 4)
+    assert summary["distinct_estimate"] == 4 + 2 + 1
+    assert summary["top_values"] == [{"value": "Released", "rows": 500}, {"value": "Preliminary", "rows": 250}]
+
+def test_table_sizes_sorted_by_rows(fake_driver):
+    """Test that partition stats are reported largest first."""
+    _install_stats(fake_driver)
+    sizes = table_sizes(fake_driver.connect())
+    assert sizes["source"] == "sys.dm_db_partition_stats"
+    assert [t["table"] for t in sizes["tables"]] == ["innovator.PART", "innovator.CAD"]
+    assert sizes["tables"][0] == {"table": "innovator.PART", "rows": 1000, "reserved_kb": 512, "data_kb": 384, "index_kb": 96}
+
+def test_table_sizes_falls_back_to_partitions(fake_driver):
+    """Test that row counts still work without VIEW DATABASE STATE."""
+    conn = fake_driver.connect()
+    fake_driver.results["sys.partitions"] = ([], [("innovator", "PART", 1000, None, None, None)])
+    original = conn.cursor
+
+    def cursor():
+        cur = original()
+        execute = cur.execute
+
+        def guarded(query, params=None):
+            if "dm_db_partition_stats" in query:
+                raise Exception("VIEW DATABASE STATE permission denied")
+            return execute(query, params)
+        cur.execute = guarded
+        return cur
+    conn.cursor = cursor
+    sizes = table_sizes(conn)
+    assert sizes["source"] == "sys.partitions"
+    assert sizes["tables"][0]["rows"] == 1000
+
+def test_column_statistics_uses_best_sampled(fake_driver):
+    """Test that each column reads the histogram of its best-sampled statistics."""
+    _install_stats(fake_driver)
+    result = column_statistics(fake_driver.connect(), PART, ["STATE", "cost"], top=1)
+    state = result["columns"]["state"]
+    assert state["statistics"] == "_WA_Sys_state"
+    assert state["null_fraction"] == 0.1
+    assert state["top_values"] == [{"value": "Released", "rows": 500}]
+    assert state["last_updated"] == UPDATED.isoformat()
+    assert result["columns"]["cost"] == {"statistics": None}
+    histograms = [params for query, params in fake_driver.executed if "dm_db_stats_histogram" in query]
+    assert histograms == [("[innovator].[PART]", 2)]
+
+def test_column_statistics_quotes_table_names(fake_driver):
+    """Test that names needing brackets reach OBJECT_ID and DBCC quoted."""
+    table = dict(PART, schema="sales data", name="Order]Lines")
+    fake_driver.results["sys.stats_columns"] = ([], [("state", 2, "_WA_Sys_state", 1000, 1000, UPDATED, 0)])
+    fake_driver.results["DBCC SHOW_STATISTICS"] = ([], [("Released", 0.0, 500.0, 0.0, 0.0)])
+    conn = fake_driver.connect()
+    original = conn.cursor
+
+    def cursor():
+        cur = original()
+        execute = cur.execute
+
+        def no_histogram_function(query, params=None):
+            if "dm_db_stats_histogram" in query:
+                raise Exception("Invalid object name 'sys.dm_db_stats_histogram'")
+            return execute(query, params)
+        cur.execute = no_histogram_function
+        return cur
+    conn.cursor = cursor
+    result = column_statistics(conn, table, ["state"])
+    assert result["table"] == "sales data.Order]Lines"
+    assert result["columns"]["state"]["top_values"] == [{"value": "Released", "rows": 500}]
+    executed = dict(fake_driver.executed)
+    assert any(params == ("[sales data].[Order]]Lines]",) for query, params in fake_driver.executed if "sys.stats_columns" in query)
+    assert "DBCC SHOW_STATISTICS (N'[sales data].[Order]]Lines]', N'_WA_Sys_state') WITH HISTOGRAM" in executed
+
+def test_column_statistics_rejects_unknown_columns(fake_driver):
+    """Test that misspelled columns are reported instead of silently skipped."""
+    _install_stats(fake_driver)
+    with pytest.raises(ValueError, match="Unknown column"):
+        column_statistics(fake_driver.connect(), PART, ["colour"])
+
+@pytest.mark.asyncio
+async def test_stats_tools_are_cached_and_invalidated(fake_pool, fake_driver, monkeypatch):
+    """Test that repeated calls are answered from the cache until the table changes."""
+    _install_stats(fake_driver)
+    catalog = SchemaCatalog()
+    catalog._install({"innovator.PART": PART}, ["1", "2024-01-01"])
+    catalog._checked_at = float("inf")
+    monkeypatch.setattr(server, "_catalog", catalog)
+    monkeypatch.setattr(server, "_stats_cache", ResultCache(max_bytes=1 << 20, ttl=60))
+
+    for _ in range(2):
+        result = json.loads((await call_tool("column_stats", {"table": "part", "columns": ["state"]}))[0].text)
+        assert result["approximate"] is True
+        assert result["columns"]["state"]["distinct_estimate"] == 4
+    assert sum(1 for query, _ in fake_driver.executed if "sys.stats_columns" in query) == 1
+
+    sizes = json.loads((await call_tool("table_stats", {"tables": ["PART"]}))[0].text)
+    assert [t["table"] for t in sizes["tables"]] == ["innovator.PART"]
+
+    server._invalidate_cached_tables({"part"})
+    await call_tool("column_stats", {"table": "part", "columns": ["state"]})
+    assert sum(1 for query, _ in fake_driver.executed if "sys.stats_columns" in query) == 2
+
+@pytest.mark.asyncio
+async def test_stats_tool_reports_errors(fake_pool, fake_driver, monkeypatch):
+    """Test that an unknown table is returned as an error message."""
+    catalog = SchemaCatalog()
+    catalog._install({"innovator.PART": PART}, ["1", "2024-01-01"])
+    catalog._checked_at = float("inf")
+    monkeypatch.setattr(server, "_catalog", catalog)
+    result = await call_tool("column_stats", {"table": "DOCUMENT"})
+    assert result[0].text.startswith("Error reading statistics: Unknown table")
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+from mssql_mcp_server import server
+from mssql_mcp_server.transport import ClientBusyError, ClientLimiter, build_http_app
+
+class _Session:
+    """Stands in for an MCP session object (weakly referenced by the limiter)."""
+
+@pytest.mark.asyncio
+async def test_limiter_is_per_client():
+    """Test that a busy client is queued, then rejected, without blocking others."""
+    limiter = ClientLimiter(max_concurrency=1, max_queue=1)
+    alice, bob = _Session(), _Session()
+    release = asyncio.Event()
+
+    async def hold(client):
+        async with limiter.slot(client):
+            await release.wait()
+
+    first = asyncio.ensure_future(hold(alice))
+    queued = asyncio.ensure_future(hold(alice))
+    await asyncio.sleep(0)
+    with pytest.raises(ClientBusyError):
+        async with limiter.slot(alice):
+            pass
+    async with limiter.slot(bob):
+        pass
+    release.set()
+    await asyncio.gather(first, queued)
+    stats = limiter.stats()
+    assert (stats["admitted"], stats["waited"], stats["rejected"]) == (3, 1, 1)
+    assert stats["clients"] == 2
+    del alice, bob
+    assert limiter.stats()["clients"] == 0
+
+@pytest.mark.asyncio
+async def test_limiter_ignores_calls_outside_a_session():
+    """Test that in-process calls without a client are not limited."""
+    limiter = ClientLimiter(max_concurrency=1, max_queue=0)
+    async with limiter.slot(None):
+        async with limiter.slot(None):
+            pass
+    assert limiter.stats()["admitted"] == 0
+
+@pytest.mark.asyncio
+async def test_http_clients_share_one_process(fake_pool, fake_driver, monkeypatch):
+    """Test that two HTTP clients are served by one pool and limited separately."""
+    monkeypatch.setattr(server, "_client_limiter", ClientLimiter(max_concurrency=1, max_queue=1))
+    fake_driver.latency = 0.2
+    config = uvicorn.Config(build_http_app(server.app, "http"), host="127.0.0.1", port=0, log_config=None)
+    http = uvicorn.Server(config)
+    serving = asyncio.ensure_future(http.serve())
+    while not http.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{http.servers[0].sockets[0].getsockname()[1]}/mcp"
+
+    async def client(calls):
+        async with streamable_http_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                results = await asyncio.gather(*(
+                    session.call_tool("execute_sql", {"query": "SELECT 1"}) for _ in range(calls)
+                ))
+                return sorted(result.content[0].text for result in results)
+
+    try:
+        busy, calm = await asyncio.gather(client(3), client(1))
+    finally:
+        http.should_exit = True
+        await serving
+    assert busy[0].startswith("Error: Too many concurrent requests")
+    assert busy[1:] == ["value\n1", "value\n1"]
+    assert calm == ["value\n1"]
+    # Both sessions ran on the one shared pool
+    assert [query for query, _ in fake_driver.executed] == ["SELECT 1"] * 3
+    assert fake_pool.stats()["size"] <= 2